@@ -1,6 +1,10 @@
 #!/usr/bin/env bash
 set -euo pipefail
 
+# One-off fetch for cron. For a long-running service, `poetry run scheduler`
+# fetches on the cadences in finance_daily_config/schedule.yaml in-process,
+# without re-bootstrapping tooling before every run.
+
 REPO_DIR="${REPO_DIR:-$HOME/finance-daily}"
 cd "$REPO_DIR"
 
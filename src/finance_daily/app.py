@@ -5,8 +5,15 @@ from finance_daily.constants import (
     SENTIMENT_SCT,
     FUNDAMENTALS_SCT,
 )
+from finance_daily.state import get_app_config
+from finance_daily import tracing
+from finance_daily.components.ticker_series_chart import configure_series_cache
 
 
+tracing.begin_rerun()
+cfg = get_app_config()
+configure_series_cache(cfg.series_cache_max_entries, cfg.series_cache_max_mb)
+
 overview_page = st.Page(OVERVIEW_SCT, title="Overview")
 detail_page = st.Page(SERIES_SCT, title="Series")
 sentiment_page = st.Page(SENTIMENT_SCT, title="Sentiment")
@@ -14,4 +21,17 @@ fundamentals_page = st.Page(FUNDAMENTALS_SCT, title="Fundamentals")
 
 pg = st.navigation([overview_page, detail_page, sentiment_page, fundamentals_page])
 st.set_page_config(page_title="Finance Assistant", page_icon=":material/edit:")
-pg.run()
+with tracing.span("page"):
+    pg.run()
+
+if cfg.prewarm_on_start:
+    # after the first render, so its loaders are not computed twice
+    from finance_daily.services.prewarm import start_background_prewarm
+
+    start_background_prewarm(cfg)
+if cfg.debug_panel:
+    from finance_daily.components.debug_panel import render_debug_panel
+
+    render_debug_panel()
+if cfg.trace_export_path is not None:
+    tracing.export(cfg.trace_export_path)
@@ -24,6 +24,28 @@ def dev():
 def prod():
     env = os.environ.copy()
 
+    if int(env.get("APP_WORKERS", "1")) > 1:
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "finance_daily.services.prod_server",
+            ],
+            check=True,
+            env=env,
+        )
+        return
+
+    # parse datasets into the shared store before the first visitor arrives
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "finance_daily.services.prewarm",
+        ],
+        check=True,
+        env=env,
+    )
     subprocess.run(
         [
             sys.executable,
@@ -63,3 +85,100 @@ def nightly_fetch():
         check=True,
         env=env,
     )
+
+
+def scheduler():
+    env = os.environ.copy()
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "finance_daily.services.scheduler",
+        ],
+        check=True,
+        env=env,
+    )
+
+
+def profile_startup():
+    env = os.environ.copy()
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "finance_daily.scripts.startup_profile",
+            *sys.argv[1:],
+        ],
+        env=env,
+    )
+    sys.exit(result.returncode)
+
+
+def bench():
+    env = os.environ.copy()
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "finance_daily.scripts.bench",
+            *sys.argv[1:],
+        ],
+        env=env,
+    )
+    sys.exit(result.returncode)
+
+
+def load_test():
+    env = os.environ.copy()
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "finance_daily.scripts.load_test",
+            *sys.argv[1:],
+        ],
+        env=env,
+    )
+    sys.exit(result.returncode)
+
+
+def mock_source():
+    env = os.environ.copy()
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "finance_daily.scripts.mock_source",
+            *sys.argv[1:],
+        ],
+        env=env,
+    )
+    sys.exit(result.returncode)
+
+
+def fetch_report():
+    env = os.environ.copy()
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "finance_daily.services.fetch_report",
+            *sys.argv[1:],
+        ],
+        check=True,
+        env=env,
+    )
+
+
+def api():
+    env = os.environ.copy()
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "finance_daily.services.api_server",
+            *sys.argv[1:],
+        ],
+        check=True,
+        env=env,
+    )
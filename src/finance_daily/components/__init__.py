@@ -1,16 +1,52 @@
-from .news_feed import NewsFeedSpec, NewsItem, df_to_news_items, render_news_feed
-from .snapshot_table import (
-    SnapshotTableSpec,
-    render_snapshot_grid,
-    render_snapshot_table,
-)
+from importlib import import_module
+from typing import TYPE_CHECKING
 
-__all__ = [
-    "render_snapshot_grid",
-    "render_snapshot_table",
-    "SnapshotTableSpec",
-    "render_news_feed",
-    "df_to_news_items",
-    "NewsFeedSpec",
-    "NewsItem",
-]
+if TYPE_CHECKING:
+    from .news_feed import (
+        NEWS_FEED_COLUMNS,
+        NewsCollection,
+        NewsFeedSpec,
+        NewsItem,
+        NewsRow,
+        df_to_news_items,
+        load_news_items,
+        render_news_feed,
+    )
+    from .snapshot_table import (
+        SnapshotFilter,
+        SnapshotTableSpec,
+        SnapshotView,
+        load_snapshot_view,
+        render_snapshot_grid,
+        render_snapshot_table,
+    )
+
+# Submodules are imported on first attribute access so that pages which only
+# need one component (e.g. the series chart) don't pay for streamlit_elements.
+_LAZY_ATTRS = {
+    "render_snapshot_grid": ".snapshot_table",
+    "render_snapshot_table": ".snapshot_table",
+    "SnapshotTableSpec": ".snapshot_table",
+    "SnapshotView": ".snapshot_table",
+    "SnapshotFilter": ".snapshot_table",
+    "load_snapshot_view": ".snapshot_table",
+    "render_news_feed": ".news_feed",
+    "df_to_news_items": ".news_feed",
+    "load_news_items": ".news_feed",
+    "NewsFeedSpec": ".news_feed",
+    "NewsItem": ".news_feed",
+    "NewsCollection": ".news_feed",
+    "NewsRow": ".news_feed",
+    "NEWS_FEED_COLUMNS": ".news_feed",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from finance_daily.returns_engine import CorrelationBlock
+from finance_daily.tracing import traced
+
+if TYPE_CHECKING:
+    from plotly.graph_objects import Figure
+
+
+@dataclass(frozen=True)
+class CorrelationSpec:
+    height: int = 520
+    template: str = "plotly_dark"
+    colorscale: str = "RdBu"
+    # annotate cells with values only while the matrix stays readable
+    max_annotated: int = 20
+
+
+_MARGIN = dict(l=10, r=10, t=50, b=10)
+
+
+@traced("build_correlation_heatmap")
+def build_correlation_heatmap(
+    block: CorrelationBlock, *, title: str, spec: CorrelationSpec = CorrelationSpec()
+) -> Figure:
+    """Symmetric heatmap of pairwise return correlations."""
+    import plotly.graph_objects as go
+
+    corr = block.corr_frame()
+    annotate = len(block.symbols) <= spec.max_annotated
+    fig = go.Figure(
+        go.Heatmap(
+            z=corr.to_numpy(),
+            x=list(corr.columns),
+            y=list(corr.index),
+            zmin=-1,
+            zmax=1,
+            colorscale=spec.colorscale,
+            texttemplate="%{z:.2f}" if annotate else None,
+            hovertemplate="%{y} / %{x}: %{z:.2f}<extra></extra>",
+        )
+    )
+    fig.update_layout(
+        title=title,
+        template=spec.template,
+        height=spec.height,
+        margin=_MARGIN,
+        yaxis_autorange="reversed",
+    )
+    return fig
+
+
+@traced("build_beta_figure")
+def build_beta_figure(
+    betas: pd.Series, *, benchmark: str, spec: CorrelationSpec = CorrelationSpec()
+) -> Figure:
+    import plotly.express as px
+
+    df = betas.drop(labels=[benchmark], errors="ignore").dropna()
+    fig = px.bar(
+        x=df.index,
+        y=df.to_numpy(),
+        template=spec.template,
+        height=max(260, spec.height // 2),
+        title=f"Beta vs {benchmark}",
+    )
+    fig.update_layout(xaxis_title=None, yaxis_title="Beta", margin=_MARGIN)
+    return fig
+
+
+@traced("build_rolling_correlation_figure")
+def build_rolling_correlation_figure(
+    rolling: pd.DataFrame,
+    *,
+    benchmark: str,
+    window: int,
+    spec: CorrelationSpec = CorrelationSpec(),
+) -> Figure:
+    import plotly.express as px
+
+    df = rolling.drop(columns=[benchmark], errors="ignore")
+    plot_df = df.reset_index(names="date").melt(
+        id_vars="date", var_name="ticker", value_name="corr"
+    )
+    fig = px.line(
+        plot_df.dropna(),
+        x="date",
+        y="corr",
+        color="ticker",
+        template=spec.template,
+        height=spec.height,
+        title=f"{window}-day rolling correlation with {benchmark}",
+    )
+    fig.update_layout(
+        xaxis_title=None, yaxis_title="Correlation", margin=_MARGIN, legend_title_text=""
+    )
+    fig.update_yaxes(range=[-1, 1])
+    return fig
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import functools
+import time
+from typing import Callable, TypeVar
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from finance_daily import tracing
+from finance_daily.memory import cache_usage, process_rss_bytes, session_usage
+from finance_daily.state import get_app_config
+from finance_daily.tracing import cache_hit_ratios, rerun_counters, rerun_spans
+
+F = TypeVar("F", bound=Callable)
+
+
+def _mb(n: int | None) -> float | None:
+    return round(n / 2**20, 2) if n is not None else None
+
+
+def _render_timings(spans: list[tracing.SpanRecord], counters: dict[str, int]) -> None:
+    if not spans:
+        st.caption("No instrumented spans ran in this rerun.")
+    else:
+        total_ms = sum(s.duration_s for s in spans if s.depth == 0) * 1e3
+        st.caption(f"{len(spans)} spans, {total_ms:.1f} ms at top level")
+        st.dataframe(
+            pd.DataFrame(
+                {
+                    "span": ["· " * s.depth + s.name for s in spans],
+                    "ms": [round(s.duration_s * 1e3, 2) for s in spans],
+                }
+            ),
+            hide_index=True,
+            width="stretch",
+        )
+
+    ratios = cache_hit_ratios(counters)
+    if ratios:
+        st.caption("Cache hit ratios")
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "cache": name,
+                        "calls": calls,
+                        "misses": misses,
+                        "hit ratio": f"{ratio:.0%}",
+                    }
+                    for name, (calls, misses, ratio) in sorted(ratios.items())
+                ]
+            ),
+            hide_index=True,
+            width="stretch",
+        )
+
+
+def _fragment_only_rerun() -> bool:
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx is not None and bool(ctx.fragment_ids_this_run)
+
+
+def traced_fragment(fn: F) -> F:
+    """Apply under `st.fragment`: time each fragment-only rerun on its own.
+
+    A fragment rerun does not run the app script, so it neither resets the
+    rerun buffer nor re-renders the sidebar panel (fragments cannot write to
+    the sidebar). Here it starts a fresh buffer, and with the debug panel on
+    its timings are shown below the fragment and exported like a full rerun.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _fragment_only_rerun():
+            return fn(*args, **kwargs)
+        tracing.begin_rerun()
+        with tracing.span(f"fragment:{fn.__name__}"):
+            result = fn(*args, **kwargs)
+        cfg = get_app_config()
+        if cfg.debug_panel:
+            with st.expander("Debug: fragment rerun timings", expanded=False):
+                _render_timings(rerun_spans(), rerun_counters())
+        if cfg.trace_export_path is not None:
+            tracing.export(cfg.trace_export_path)
+        return result
+
+    return wrapper  # type: ignore[return-value]
+
+
+def render_debug_panel() -> None:
+    """Sidebar panels with this rerun's span timings and cache hit ratios, and
+    the memory held by caches and sessions.
+
+    Only full reruns update them; fragments decorated with `traced_fragment`
+    report their own reruns below themselves.
+    """
+    with st.sidebar.expander("Debug: rerun timings", expanded=False):
+        st.caption(
+            f"Full rerun at {time.strftime('%H:%M:%S')}; fragment reruns are "
+            "shown below each fragment."
+        )
+        _render_timings(rerun_spans(), rerun_counters())
+
+    with st.sidebar.expander("Debug: memory", expanded=False):
+        rss = process_rss_bytes()
+        if rss is not None:
+            st.caption(f"Process RSS {_mb(rss):,.0f} MB")
+        caches = cache_usage()
+        if caches:
+            st.caption("Caches (st.cache_data: pickled copies)")
+            st.dataframe(
+                pd.DataFrame(
+                    [
+                        {
+                            "cache": u.name,
+                            "kind": u.kind,
+                            "entries": u.entries,
+                            "MB": _mb(u.bytes),
+                            "max entries": u.max_entries,
+                            "max MB": _mb(u.max_bytes),
+                            "evictions": u.evictions,
+                        }
+                        for u in caches
+                    ]
+                ),
+                hide_index=True,
+                width="stretch",
+            )
+        sessions = session_usage()
+        st.caption(
+            f"{len(sessions)} session(s), "
+            f"{_mb(sum(u.bytes for u in sessions))} MB of session state"
+        )
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "session": u.session_id[:8],
+                        "keys": u.keys,
+                        "MB": _mb(u.bytes),
+                        "largest": ", ".join(
+                            f"{k} ({b / 1024:.0f} KB)" for k, b in u.largest
+                        ),
+                    }
+                    for u in sessions
+                ]
+            ),
+            hide_index=True,
+            width="stretch",
+        )
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from finance_daily.tracing import traced
+
+if TYPE_CHECKING:
+    from plotly.graph_objects import Figure
+
+
+@dataclass(frozen=True)
+class FundamentalsChartSpec:
+    height: int = 380
+    template: str = "plotly_dark"
+
+
+@traced("build_fundamentals_trend_figure")
+def build_fundamentals_trend_figure(
+    values: pd.DataFrame,
+    *,
+    label: str,
+    percent: bool = False,
+    spec: FundamentalsChartSpec = FundamentalsChartSpec(),
+) -> Figure:
+    """Bars per fiscal period, one colour per symbol column of `values`."""
+    import plotly.express as px
+
+    plot_df = (
+        values.rename_axis("period")
+        .reset_index()
+        .melt(id_vars="period", var_name="symbol", value_name="value")
+        .dropna()
+    )
+    fig = px.bar(
+        plot_df,
+        x="period",
+        y="value",
+        color="symbol",
+        barmode="group",
+        template=spec.template,
+        height=spec.height,
+        title=label,
+    )
+    fig.update_layout(
+        xaxis_title=None,
+        yaxis_title=None,
+        legend_title_text="",
+        margin=dict(l=10, r=10, t=50, b=10),
+    )
+    if percent:
+        fig.update_yaxes(tickformat=".0%")
+    return fig
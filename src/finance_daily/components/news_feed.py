@@ -1,14 +1,22 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime
-from typing import Iterable
+import sys
+import threading
+from dataclasses import dataclass, fields, replace
+from datetime import date as Date, datetime
+from typing import Iterable, Iterator, overload
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from streamlit_elements import elements, mui
+from streamlit_elements.core.element import Element
 
-from finance_daily.constants import NewsFields
+from finance_daily.config import AppConfig
+from finance_daily.constants import DatasetName, NewsFields
+from finance_daily.serving_db import DatasetQuery, read_dataset
+from finance_daily.generation import dataset_id
+from finance_daily.tracing import count, record_miss, register_cache, traced
 
 
 @dataclass(frozen=True)
@@ -27,7 +35,21 @@ class NewsFeedSpec:
     max_items: int = 5
     show_summaries: bool = True
     summary_char_limit: int = 220
-
+    # cards per "Load more" step; None renders all `max_items` at once
+    page_size: int | None = None
+
+
+# the only news columns `df_to_news_items` reads; the projection for news loads
+NEWS_FEED_COLUMNS: tuple[str, ...] = (
+    NewsFields.TITLE.value,
+    NewsFields.URL.value,
+    NewsFields.TIME_PUBLISHED.value,
+    NewsFields.SUMMARY.value,
+    NewsFields.ICON.value,
+    NewsFields.BANNER_IMAGE.value,
+    NewsFields.OVERALL_SENTIMENT_SCORE.value,
+    NewsFields.OVERALL_SENTIMENT_LABEL.value,
+)
 
 CARD_SX = {"borderRadius": 3, "backgroundColor": "rgba(255,255,255,0.02)"}
 CONTENT_SX = {"padding": "12px !important"}
@@ -68,38 +90,6 @@ THUMB_IMG_SX = {
 }
 
 
-def _parse_dt(value: str | None) -> datetime | None:
-    if not value or not isinstance(value, str):
-        return None
-    try:
-        # Example: "2026-01-03 13:08:33+00:00"
-        return datetime.fromisoformat(value.replace("Z", "+00:00"))
-    except Exception:
-        return None
-
-
-def _clean_str(value) -> str | None:
-    if value is None:
-        return None
-    if isinstance(value, float) and pd.isna(value):
-        return None
-    s = str(value).strip()
-    if not s or s.upper() == "NULL" or s.lower() == "nan":
-        return None
-    return s
-
-
-def _clean_float(value) -> float | None:
-    if value is None:
-        return None
-    try:
-        if isinstance(value, float) and pd.isna(value):
-            return None
-        return float(value)
-    except Exception:
-        return None
-
-
 def _truncate(text: str | None, *, limit: int) -> str | None:
     if not text:
         return None
@@ -218,6 +208,202 @@ def _news_card(it: NewsItem, *, spec: NewsFeedSpec, key: str) -> object:
     )
 
 
+class NewsRow:
+    """Read-only view of one article in a `NewsCollection`.
+
+    Exposes the same attributes as `NewsItem` without copying any field.
+    """
+
+    __slots__ = ("_news", "_i")
+
+    def __init__(self, news: NewsCollection, i: int) -> None:
+        self._news = news
+        self._i = i
+
+    @property
+    def title(self) -> str:
+        return self._news.titles[self._i]
+
+    @property
+    def url(self) -> str:
+        return self._news.urls[self._i]
+
+    @property
+    def time_published(self) -> str | None:
+        return self._news.published_text[self._i]
+
+    @property
+    def summary(self) -> str | None:
+        return self._news.summaries[self._i]
+
+    @property
+    def icon_url(self) -> str | None:
+        return self._news.icon_urls[self._i]
+
+    @property
+    def sentiment_score(self) -> float | None:
+        score = self._news.scores[self._i]
+        return None if np.isnan(score) else float(score)
+
+    @property
+    def sentiment_label(self) -> str | None:
+        code = self._news.label_codes[self._i]
+        return None if code < 0 else self._news.labels[code]
+
+    def to_item(self) -> NewsItem:
+        return NewsItem(
+            title=self.title,
+            url=self.url,
+            time_published=self.time_published,
+            summary=self.summary,
+            icon_url=self.icon_url,
+            sentiment_score=self.sentiment_score,
+            sentiment_label=self.sentiment_label,
+        )
+
+
+# summaries are stored cut to the default display length; a spec asking for
+# longer summaries still gets at most this many characters
+SUMMARY_STORE_CHARS = NewsFeedSpec.summary_char_limit
+
+
+@dataclass(frozen=True, eq=False)
+class NewsCollection:
+    """Articles newest first, stored as one array per field.
+
+    Slicing returns views over the same arrays, so filtered or truncated
+    collections cost no copies. Rows become `NewsItem`s only via `to_items`.
+    """
+
+    titles: np.ndarray  # object (str)
+    urls: np.ndarray  # object (str)
+    published: np.ndarray  # datetime64[ns] UTC, NaT when missing
+    published_text: np.ndarray  # object (str | None), as in the dataset
+    summaries: np.ndarray  # object (str | None), pre-truncated
+    icon_urls: np.ndarray  # object (str | None)
+    scores: np.ndarray  # float64, NaN when unscored
+    label_codes: np.ndarray  # int8 into `labels`, -1 when unlabeled
+    labels: tuple[str, ...]  # interned
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def __iter__(self) -> Iterator[NewsRow]:
+        return (NewsRow(self, i) for i in range(len(self)))
+
+    @overload
+    def __getitem__(self, key: int) -> NewsRow: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> NewsCollection: ...
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return replace(
+                self,
+                **{
+                    f.name: getattr(self, f.name)[key]
+                    for f in fields(self)
+                    if f.name != "labels"
+                },
+            )
+        i = range(len(self))[key]  # normalizes negatives, raises IndexError
+        return NewsRow(self, i)
+
+    def published_since(self, since: Date) -> NewsCollection:
+        """Articles published on or after `since` (UTC day); a prefix slice."""
+        start = np.datetime64(datetime(since.year, since.month, since.day), "ns")
+        # newest first with NaT last, so the matches are exactly a prefix
+        return self[: int(np.count_nonzero(self.published >= start))]
+
+    def to_items(self) -> list[NewsItem]:
+        return [row.to_item() for row in self]
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame | None, *, summary_chars: int | None = SUMMARY_STORE_CHARS
+    ) -> NewsCollection:
+        """Clean and sort the raw news dataset, column by column.
+
+        Rows without a title or url are dropped, and a URL listed more than
+        once keeps only its newest row (the URL keys the rendered card).
+        Summaries longer than `summary_chars` are truncated up front (kept
+        whole if None).
+        """
+        cols = set(df.columns) if df is not None else set()
+        if (
+            df is None
+            or NewsFields.TITLE.value not in cols
+            or NewsFields.URL.value not in cols
+        ):
+            df = pd.DataFrame(columns=[NewsFields.TITLE.value, NewsFields.URL.value])
+
+        def text(name: str) -> pd.Series:
+            if name not in df.columns:
+                return pd.Series(pd.NA, index=df.index, dtype="string")
+            return _clean_strings(df[name])
+
+        title = text(NewsFields.TITLE.value)
+        url = text(NewsFields.URL.value)
+        keep = (title.notna() & url.notna()).to_numpy(dtype=bool)
+
+        time_text = text(NewsFields.TIME_PUBLISHED.value)
+        published = pd.to_datetime(
+            time_text.str.replace("Z", "+00:00", regex=False),
+            errors="coerce",
+            utc=True,
+            format="ISO8601",
+        )
+        # stable, so equal timestamps keep their dataset order
+        order = np.argsort(
+            np.where(published.isna(), np.iinfo(np.int64).max, -published.astype("int64")),
+            kind="stable",
+        )
+        order = order[keep[order]]
+        order = order[~pd.Series(url.to_numpy(dtype=object)[order]).duplicated()]
+
+        summary = text(NewsFields.SUMMARY.value)
+        if summary_chars is not None:
+            long = (summary.str.len() > summary_chars).fillna(False)
+            summary = summary.mask(
+                long, summary.str.slice(0, summary_chars).str.rstrip() + "…"
+            )
+
+        # prefer the explicit icon, fall back to the banner image
+        icon = text(NewsFields.ICON.value)
+        icon = icon.fillna(text(NewsFields.BANNER_IMAGE.value))
+
+        score = (
+            pd.to_numeric(df[NewsFields.OVERALL_SENTIMENT_SCORE.value], errors="coerce")
+            if NewsFields.OVERALL_SENTIMENT_SCORE.value in df.columns
+            else pd.Series(np.nan, index=df.index)
+        )
+        label = pd.Categorical(text(NewsFields.OVERALL_SENTIMENT_LABEL.value))
+
+        def objects(values: pd.Series) -> np.ndarray:
+            return values.to_numpy(dtype=object, na_value=None)[order]
+
+        return cls(
+            titles=objects(title),
+            urls=objects(url),
+            published=published.dt.tz_convert(None).to_numpy(dtype="datetime64[ns]")[order],
+            published_text=objects(time_text),
+            summaries=objects(summary),
+            icon_urls=objects(icon),
+            scores=score.to_numpy(dtype=np.float64, na_value=np.nan)[order],
+            label_codes=label.codes.astype(np.int8)[order],
+            labels=tuple(sys.intern(str(c)) for c in label.categories),
+        )
+
+
+def _clean_strings(values: pd.Series) -> pd.Series:
+    # blanks and NULL / nan placeholders become NA
+    s = values.astype("string").str.strip()
+    blank = (s == "") | (s.str.upper() == "NULL") | (s.str.lower() == "nan")
+    return s.mask(blank.fillna(False))
+
+
+@traced("df_to_news_items")
 def df_to_news_items(
     df: pd.DataFrame,
 ) -> list[NewsItem]:
@@ -228,87 +414,125 @@ def df_to_news_items(
     """
     if df is None or df.empty:
         return []
+    return NewsCollection.from_frame(df, summary_chars=None).to_items()
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _news_collection(config: AppConfig, generation: str) -> NewsCollection | None:
+    # one read-only instance per worker and data generation, shared by all
+    # sessions; `generation` only keys the cache
+    record_miss("load_news_items")
+    df = read_dataset(
+        DatasetName.FACT_NEWS_RAW,
+        config=config,
+        query=DatasetQuery(
+            columns=NEWS_FEED_COLUMNS,
+            order_by=NewsFields.TIME_PUBLISHED.value,
+            descending=True,
+        ),
+    )
+    return None if df is None else NewsCollection.from_frame(df)
 
-    cols = set(df.columns)
 
-    def col(name: str) -> str:
-        return name if name in cols else ""
+@traced("load_news_items", cached=True)
+def load_news_items(
+    config: AppConfig, since: Date | None = None, limit: int | None = None
+) -> NewsCollection | None:
+    """The news collection, newest first; None if there is no local file.
 
-    title_col = col(NewsFields.TITLE.value)
-    url_col = col(NewsFields.URL.value)
-    time_col = col(NewsFields.TIME_PUBLISHED.value)
-    summary_col = col(NewsFields.SUMMARY.value)
+    `since` keeps items published on or after that day and `limit` keeps the
+    newest ones. Both are slices of the shared collection, not copies.
+    """
+    news = _news_collection(
+        config, dataset_id(config.data_dir, DatasetName.FACT_NEWS_RAW)
+    )
+    if news is None:
+        return None
+    if since is not None:
+        news = news.published_since(since)
+    return news[:limit] if limit is not None else news
 
-    # Optional icon fields: prefer explicit icon, fall back to banner_image.
-    icon_col = col(NewsFields.ICON.value)
-    banner_col = col(NewsFields.BANNER_IMAGE.value)
-    sent_score_col = col(NewsFields.OVERALL_SENTIMENT_SCORE.value)
-    sent_label_col = col(NewsFields.OVERALL_SENTIMENT_LABEL.value)
 
-    if not title_col or not url_col:
-        return []
+class _Prerendered(Element):
+    """A card subtree serialized on an earlier rerun, sent again verbatim.
 
-    df_view = df.copy()
-    if time_col:
-        df_view["_time_dt"] = df_view[time_col].map(_parse_dt)
-        df_view = df_view.sort_values("_time_dt", ascending=False, na_position="last")
-
-    items: list[NewsItem] = []
-    for _, row in df_view.iterrows():
-        title = _clean_str(row.get(title_col))
-        url = _clean_str(row.get(url_col))
-        if not title or not url:
-            continue
-
-        time_published = _clean_str(row.get(time_col)) if time_col else None
-        summary = _clean_str(row.get(summary_col)) if summary_col else None
-
-        icon_url = None
-        if icon_col:
-            icon_url = _clean_str(row.get(icon_col))
-        if not icon_url and banner_col:
-            icon_url = _clean_str(row.get(banner_col))
-
-        sentiment_score = (
-            _clean_float(row.get(sent_score_col)) if sent_score_col else None
-        )
-        sentiment_label = (
-            _clean_str(row.get(sent_label_col)) if sent_label_col else None
-        )
+    The elements frame serializes children with `repr`, so this stands in
+    for the rebuilt tree (streamlit-elements 0.1.x).
+    """
 
-        items.append(
-            NewsItem(
-                title=title,
-                url=url,
-                time_published=time_published,
-                summary=summary,
-                icon_url=icon_url,
-                sentiment_score=sentiment_score,
-                sentiment_label=sentiment_label,
-            )
-        )
+    __slots__ = ("_js",)
+
+    def __init__(self, js: str) -> None:
+        self._js = js
+
+    def __repr__(self) -> str:
+        return self._js
+
+
+# serialized cards shared by all sessions, oldest evicted first
+CARD_CACHE_SIZE = 2048
+_card_cache: dict[tuple, str] = {}
+_card_cache_lock = threading.Lock()
+register_cache("news_card")
+
+
+def _cached_card(it: NewsItem, *, spec: NewsFeedSpec) -> object:
+    # keyed by the whole item, so an article whose content changes under the
+    # same URL is rebuilt, plus the spec fields the card depends on
+    cache_key = (it, spec.show_summaries, spec.summary_char_limit)
+    count("news_card.calls")
+    js = _card_cache.get(cache_key)
+    if js is not None:
+        return _Prerendered(js)
 
-    return items
+    record_miss("news_card")
+    card = _news_card(it, spec=spec, key=f"news_card_{it.url}")
+    with _card_cache_lock:
+        _card_cache[cache_key] = repr(card)
+        while len(_card_cache) > CARD_CACHE_SIZE:
+            _card_cache.pop(next(iter(_card_cache)))
+    return card
 
 
+def _show_more(state_key: str, step: int) -> None:
+    st.session_state[state_key] = st.session_state.get(state_key, step) + step
+
+
+@traced("render_news_feed")
 def render_news_feed(
-    items: Iterable[NewsItem],
+    items: NewsCollection | Iterable[NewsItem],
     *,
     spec: NewsFeedSpec = NewsFeedSpec(),
     key: str = "news_feed",
     columns: int = 1,
 ) -> None:
-    """Render a clean, scalable news feed UI (no dataframes)."""
-    items = list(items)
-    if not items:
+    """Render a clean, scalable news feed UI (no dataframes).
+
+    With `spec.page_size` set, the first page is rendered and a "Load more"
+    button adds a page at a time, up to `spec.max_items`.
+    """
+    if not isinstance(items, NewsCollection):
+        # the URL keys each card, so a repeated one keeps its first item only
+        unique: dict[str, NewsItem] = {}
+        for it in items:
+            unique.setdefault(it.url, it)
+        items = list(unique.values())
+    total = min(len(items), spec.max_items)
+    if total == 0:
         st.info("No news items available yet.")
         return
 
+    shown_key = f"{key}_shown"
+    shown = total
+    if spec.page_size:
+        shown = min(total, st.session_state.get(shown_key, spec.page_size))
+    items = items[:shown]
+    if isinstance(items, NewsCollection):
+        # only the cards on screen are materialized as NewsItem objects
+        items = items.to_items()
+
     with elements(key):
-        feed_children = [
-            _news_card(it, spec=spec, key=f"{key}_card_{i}")
-            for i, it in enumerate(items[: spec.max_items])
-        ]
+        feed_children = [_cached_card(it, spec=spec) for it in items]
 
         if columns <= 1:
             mui.Stack(spacing=1.25, children=feed_children)
@@ -327,3 +551,11 @@ def render_news_feed(
                     for i, card in enumerate(feed_children)
                 ],
             )
+
+    if shown < total:
+        st.button(
+            f"Load more ({total - shown} left)",
+            key=f"{key}_load_more",
+            on_click=_show_more,
+            args=(shown_key, spec.page_size),
+        )
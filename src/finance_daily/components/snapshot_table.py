@@ -1,12 +1,18 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from enum import Enum
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 from streamlit_elements import elements, mui
 
-from finance_daily.constants import SnapshotFields
+from finance_daily.config import AppConfig
+from finance_daily.constants import DatasetName, SnapshotFields
+from finance_daily.generation import dataset_id
+from finance_daily.serving_db import DatasetQuery, read_dataset
+from finance_daily.tracing import record_miss, traced
 
 
 @dataclass(frozen=True)
@@ -30,50 +36,218 @@ HEAD_CELL_SX = {
     "opacity": 0.9,
     "whiteSpace": "nowrap",
 }
+ROW_SX = {"&:last-child td, &:last-child th": {"borderBottom": 0}}
 
 
-def _fmt_price(x) -> str:
-    try:
-        return f"{float(x):,.2f}"
-    except Exception:
-        return "—"
+MISSING = "—"
 
 
-def _fmt_pct(x, *, percent_is_fraction: bool) -> tuple[str, str]:
-    """Return (label, chip_color) for a percentage value."""
-    try:
-        v = float(x)
-    except Exception:
-        return ("—", "default")
+class SnapshotFilter(str, Enum):
+    ALL = "All"
+    MOVERS = "Biggest movers"  # by absolute 1D change
+    GAINERS = "Gainers"  # 1D change > 0, largest first
+    LOSERS = "Losers"  # 1D change < 0, largest drop first
 
-    if percent_is_fraction:
-        v *= 100.0
 
-    label = f"{v:+.2f}%"
-    if v > 0:
-        return (label, "success")
-    if v < 0:
-        return (label, "error")
-    return (label, "default")
+SORTABLE_FIELDS = tuple(f.value for f in SnapshotFields)
+_PCT_FIELDS = (SnapshotFields.PCT_1_DAY.value, SnapshotFields.PCT_1_WEEK.value)
 
 
+def _numeric(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name not in df.columns:
+        return np.full(len(df), np.nan)
+    return pd.to_numeric(df[name], errors="coerce").to_numpy(
+        dtype=np.float64, na_value=np.nan
+    )
+
+
+def _price_labels(values: np.ndarray) -> np.ndarray:
+    out = np.full(len(values), MISSING, dtype=object)
+    ok = np.isfinite(values)
+    out[ok] = [f"{v:,.2f}" for v in values[ok].tolist()]
+    return out
+
+
+def _pct_labels(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(label, chip color) arrays for percentages already scaled to 100."""
+    out = np.full(len(values), MISSING, dtype=object)
+    ok = np.isfinite(values)
+    out[ok] = np.char.mod("%+.2f%%", values[ok]).astype(object)
+    colors = np.select(
+        [ok & (values > 0), ok & (values < 0)], ["success", "error"], "default"
+    ).astype(object)
+    return out, colors
+
+
+def _ascending_order(values: np.ndarray) -> tuple[np.ndarray, int]:
+    """Stable ascending permutation with missing values last, and how many
+    values are present."""
+    if values.dtype == object:
+        # tickers: a missing one is stored as ""
+        missing = values == ""
+    else:
+        missing = ~np.isfinite(values)
+    # lexsort's last key is the primary one
+    return np.lexsort((values, missing)), int(np.count_nonzero(~missing))
+
+
+@dataclass(frozen=True)
+class SnapshotView:
+    """Snapshot rows formatted once, with every sort order precomputed.
+
+    Labels and chip colors are built column by column when the view is
+    created (`from_frame`); sorting and the top-N filters then pick an index
+    slice (`rows`) and never re-sort or re-format. Read-only and shared by
+    every session of a worker (`load_snapshot_view`).
+    """
+
+    tickers: np.ndarray  # object (str)
+    prices: np.ndarray  # object (str), MISSING when absent
+    pct_labels: dict[str, np.ndarray]  # pct field -> object (str)
+    pct_colors: dict[str, np.ndarray]  # pct field -> object (chip color)
+    # (field, ascending) -> row permutation, missing values last either way
+    orders: dict[tuple[str, bool], np.ndarray]
+    movers: np.ndarray  # rows with a 1D change, largest absolute first
+    n_gainers: int
+    n_losers: int
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def rows(
+        self,
+        *,
+        sort_by: str = SnapshotFields.TICKER.value,
+        ascending: bool = True,
+        show: SnapshotFilter = SnapshotFilter.ALL,
+        limit: int | None = None,
+    ) -> np.ndarray:
+        """Row indices to show, in order; filters rank by their own key."""
+        pct_1d = SnapshotFields.PCT_1_DAY.value
+        if show is SnapshotFilter.MOVERS:
+            rows = self.movers
+        elif show is SnapshotFilter.GAINERS:
+            rows = self.orders[(pct_1d, False)][: self.n_gainers]
+        elif show is SnapshotFilter.LOSERS:
+            rows = self.orders[(pct_1d, True)][: self.n_losers]
+        else:
+            rows = self.orders.get(
+                (sort_by, ascending), self.orders[(SnapshotFields.TICKER.value, True)]
+            )
+        return rows[:limit] if limit is not None else rows
+
+    @classmethod
+    def from_frame(
+        cls, df: pd.DataFrame | None, *, percent_is_fraction: bool = True
+    ) -> SnapshotView:
+        if df is None:
+            df = pd.DataFrame(columns=list(SORTABLE_FIELDS))
+        ticker_col = SnapshotFields.TICKER.value
+        tickers = (
+            df[ticker_col].astype("string").fillna("").to_numpy(dtype=object)
+            if ticker_col in df.columns
+            else np.full(len(df), "", dtype=object)
+        )
+        values = {name: _numeric(df, name) for name in SORTABLE_FIELDS[1:]}
+        if percent_is_fraction:
+            for name in _PCT_FIELDS:
+                values[name] = values[name] * 100.0
+
+        pct_labels, pct_colors = {}, {}
+        for name in _PCT_FIELDS:
+            pct_labels[name], pct_colors[name] = _pct_labels(values[name])
+
+        orders: dict[tuple[str, bool], np.ndarray] = {}
+        for name, column in [(ticker_col, tickers), *values.items()]:
+            ascending, present = _ascending_order(column)
+            orders[(name, True)] = ascending
+            orders[(name, False)] = np.concatenate(
+                [ascending[:present][::-1], ascending[present:]]
+            )
+
+        pct_1d = values[SnapshotFields.PCT_1_DAY.value]
+        by_size, present = _ascending_order(np.abs(pct_1d))
+        return cls(
+            tickers=tickers,
+            prices=_price_labels(values[SnapshotFields.CLOSE.value]),
+            pct_labels=pct_labels,
+            pct_colors=pct_colors,
+            orders=orders,
+            movers=by_size[:present][::-1].copy(),
+            n_gainers=int(np.count_nonzero(pct_1d > 0)),
+            n_losers=int(np.count_nonzero(pct_1d < 0)),
+        )
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _snapshot_view(config: AppConfig, generation: str) -> SnapshotView | None:
+    # one read-only instance per worker and data generation, shared by all
+    # sessions; `generation` only keys the cache
+    record_miss("load_snapshot_view")
+    df = read_dataset(
+        DatasetName.FACT_LATEST,
+        config=config,
+        query=DatasetQuery(columns=SORTABLE_FIELDS),
+    )
+    return None if df is None else SnapshotView.from_frame(df)
+
+
+@traced("load_snapshot_view", cached=True)
+def load_snapshot_view(config: AppConfig) -> SnapshotView | None:
+    """The formatted latest snapshot; None if there is no local file."""
+    return _snapshot_view(
+        config, dataset_id(config.data_dir, DatasetName.FACT_LATEST)
+    )
+
+
+def _chip(label: str, color: str):
+    return mui.Chip(label=label, color=color, size="small", variant="outlined")
+
+
+@traced("render_snapshot_table")
 def render_snapshot_table(
-    df: pd.DataFrame, *, spec: SnapshotTableSpec = SnapshotTableSpec()
+    data: pd.DataFrame | SnapshotView | None,
+    *,
+    spec: SnapshotTableSpec = SnapshotTableSpec(),
+    show: SnapshotFilter = SnapshotFilter.ALL,
 ) -> None:
-    """Render a compact snapshot table using Material UI (no dataframes)."""
-    if df is None or df.empty:
+    """Render a compact snapshot table using Material UI (no dataframes).
+
+    `data` is a prebuilt `SnapshotView` or a snapshot-shaped frame, which is
+    formatted on the spot.
+    """
+    view = (
+        data
+        if isinstance(data, SnapshotView) or data is None
+        else SnapshotView.from_frame(
+            data, percent_is_fraction=spec.percent_is_fraction
+        )
+    )
+    if view is None or not len(view):
         st.info("No data to display.")
         return
 
-    df_view = df.copy()
-    if spec.sort_by in df_view.columns:
-        df_view = df_view.sort_values(spec.sort_by, ascending=spec.ascending)
-    df_view = df_view.head(spec.max_rows).reset_index(drop=True)
+    rows = view.rows(
+        sort_by=spec.sort_by,
+        ascending=spec.ascending,
+        show=show,
+        limit=spec.max_rows,
+    )
+    if not len(rows):
+        st.info("No rows match.")
+        return
 
-    ticker_col = SnapshotFields.TICKER.value
-    close_col = SnapshotFields.CLOSE.value
     pct_1d_col = SnapshotFields.PCT_1_DAY.value
     pct_1w_col = SnapshotFields.PCT_1_WEEK.value
+    # gathered once, so the loop below only zips precomputed strings
+    cells = zip(
+        view.tickers[rows],
+        view.prices[rows],
+        view.pct_labels[pct_1d_col][rows],
+        view.pct_colors[pct_1d_col][rows],
+        view.pct_labels[pct_1w_col][rows],
+        view.pct_colors[pct_1w_col][rows],
+    )
 
     with elements(spec.key):
         mui.Card(
@@ -110,58 +284,27 @@ def render_snapshot_table(
                                     mui.TableRow(
                                         key=f"{spec.key}_row_{i}",
                                         hover=True,
-                                        sx={
-                                            "&:last-child td, &:last-child th": {
-                                                "borderBottom": 0
-                                            }
-                                        },
+                                        sx=ROW_SX,
                                         children=[
+                                            mui.TableCell(ticker, sx=CELL_SX),
                                             mui.TableCell(
-                                                str(row.get(ticker_col, "")),
-                                                sx=CELL_SX,
+                                                price, align="right", sx=CELL_SX
                                             ),
                                             mui.TableCell(
-                                                _fmt_price(row.get(close_col)),
                                                 align="right",
                                                 sx=CELL_SX,
+                                                children=_chip(l1d, c1d),
                                             ),
                                             mui.TableCell(
                                                 align="right",
                                                 sx=CELL_SX,
-                                                children=(
-                                                    lambda t: mui.Chip(
-                                                        label=t[0],
-                                                        color=t[1],
-                                                        size="small",
-                                                        variant="outlined",
-                                                    )
-                                                )(
-                                                    _fmt_pct(
-                                                        row.get(pct_1d_col),
-                                                        percent_is_fraction=spec.percent_is_fraction,
-                                                    )
-                                                ),
-                                            ),
-                                            mui.TableCell(
-                                                align="right",
-                                                sx=CELL_SX,
-                                                children=(
-                                                    lambda t: mui.Chip(
-                                                        label=t[0],
-                                                        color=t[1],
-                                                        size="small",
-                                                        variant="outlined",
-                                                    )
-                                                )(
-                                                    _fmt_pct(
-                                                        row.get(pct_1w_col),
-                                                        percent_is_fraction=spec.percent_is_fraction,
-                                                    )
-                                                ),
+                                                children=_chip(l1w, c1w),
                                             ),
                                         ],
                                     )
-                                    for i, (_, row) in enumerate(df_view.iterrows())
+                                    for i, (ticker, price, l1d, c1d, l1w, c1w) in (
+                                        enumerate(cells)
+                                    )
                                 ]
                             ),
                         ],
@@ -3,11 +3,25 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date as Date
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pandas as pd
-import plotly.express as px
 import streamlit as st
 
+from finance_daily.constants import (
+    SERIES_CACHE_MAX_ENTRIES,
+    SERIES_CACHE_MAX_MB,
+    DailyRawFields,
+)
+from finance_daily.generation import series_id
+from finance_daily.memory import LruCache
+from finance_daily.shared_store import shared_close_frame
+from finance_daily.tracing import record_miss, traced
+from finance_daily.utils import read_table
+
+if TYPE_CHECKING:
+    from plotly.graph_objects import Figure
+
 
 @dataclass(frozen=True)
 class TickerSeriesSpec:
@@ -19,14 +33,49 @@ def _daily_raw_path(data_dir: Path, symbol: str) -> Path:
     return data_dir / f"fact_all_daily_raw_{symbol.upper()}.csv"
 
 
-@st.cache_data(show_spinner=False)
+# the cached loaders take the ID of their symbols' series files
+# (`finance_daily.generation.series_id`), which only keys the cache
+
+# one entry per (data_dir, symbol, series file version); the app applies the
+# configured limits on start (`configure_series_cache`)
+SERIES_CACHE: LruCache[pd.DataFrame | None] = LruCache(
+    "load_close_series",
+    max_entries=SERIES_CACHE_MAX_ENTRIES,
+    max_bytes=SERIES_CACHE_MAX_MB * 2**20,
+)
+
+
+def configure_series_cache(max_entries: int, max_mb: float) -> None:
+    SERIES_CACHE.resize(max_entries=max_entries, max_bytes=int(max_mb * 2**20))
+
+
+@traced("load_close_series", cached=True)
 def load_close_series(data_dir: Path, symbol: str) -> pd.DataFrame | None:
     """Load a single ticker close series from the local raw CSV."""
+    return _close_series(data_dir, symbol)
+
+
+def _close_series(data_dir: Path, symbol: str) -> pd.DataFrame | None:
+    # shared, not copied per hit like st.cache_data: callers must not mutate it
+    return SERIES_CACHE.get_or_compute(
+        (data_dir, symbol.upper(), series_id(data_dir, [symbol.upper()])),
+        lambda: _read_close_series(data_dir, symbol),
+    )
+
+
+def _read_close_series(data_dir: Path, symbol: str) -> pd.DataFrame | None:
+    record_miss("load_close_series")
     path = _daily_raw_path(data_dir, symbol)
     if not path.exists():
         return None
 
-    df = pd.read_csv(path)
+    shared = shared_close_frame(data_dir, symbol.upper())
+    if shared is not None:
+        return shared
+
+    df = read_table(
+        path, columns=(DailyRawFields.DATE.value, DailyRawFields.CLOSE.value)
+    )
     if df.empty or "date" not in df.columns or "close" not in df.columns:
         return None
 
@@ -54,16 +103,25 @@ def _common_date_range(
     return common_start, common_end
 
 
+@traced("get_all_tickers_common_range", cached=True)
 def get_all_tickers_common_range(
     *,
     data_dir: Path,
     symbols: list[str],
 ) -> tuple[tuple[Date, Date] | None, list[str]]:
     """Return (common_date_range, missing_symbols) for locally available tickers."""
+    return _common_range(data_dir, symbols, series_id(data_dir, symbols))
+
+
+@st.cache_data(show_spinner=False)
+def _common_range(
+    data_dir: Path, symbols: list[str], generation: str
+) -> tuple[tuple[Date, Date] | None, list[str]]:
+    record_miss("get_all_tickers_common_range")
     series_by_symbol: dict[str, pd.DataFrame] = {}
     missing: list[str] = []
     for sym in symbols:
-        s = load_close_series(data_dir, sym)
+        s = _close_series(data_dir, sym)
         if s is None or s.empty:
             missing.append(sym)
             continue
@@ -76,21 +134,32 @@ def get_all_tickers_common_range(
     return (common_start.date(), common_end.date()), missing
 
 
-def build_all_tickers_normalized_figure(
+@traced("normalized_frame", cached=True)
+def normalized_frame(
     *,
     data_dir: Path,
-    symbols: list[str],
+    symbols: tuple[str, ...],
     start: Date,
-    spec: TickerSeriesSpec = TickerSeriesSpec(),
-) -> tuple[px.line, tuple[Date, Date] | None, list[str]]:
-    """Build a % change chart for all tickers, normalized to the selected start date.
+) -> tuple[pd.DataFrame | None, tuple[Date, Date] | None, list[str]]:
+    """Long-format (date, ticker, pct_from_start) frame rebased to `start`.
 
-    Returns (fig, (min_date, max_date), missing_symbols).
+    Returns (plot_df, (min_date, max_date), missing_symbols); plot_df is None
+    when the tickers share no common date range.
     """
+    return _normalized_frame(data_dir, symbols, start, series_id(data_dir, symbols))
+
+
+# keyed by the user-chosen start date, so bounded: each distinct date a
+# session picks would otherwise stay cached until the data changes
+@st.cache_data(show_spinner=False, max_entries=32)
+def _normalized_frame(
+    data_dir: Path, symbols: tuple[str, ...], start: Date, generation: str
+) -> tuple[pd.DataFrame | None, tuple[Date, Date] | None, list[str]]:
+    record_miss("normalized_frame")
     series_by_symbol: dict[str, pd.DataFrame] = {}
     missing: list[str] = []
     for sym in symbols:
-        s = load_close_series(data_dir, sym)
+        s = _close_series(data_dir, sym)
         if s is None or s.empty:
             missing.append(sym)
             continue
@@ -98,14 +167,7 @@ def build_all_tickers_normalized_figure(
 
     common = _common_date_range(series_by_symbol)
     if common is None:
-        fig = px.line(template=spec.template, height=spec.height)
-        fig.update_layout(
-            title="No data available",
-            xaxis_title=None,
-            yaxis_title=None,
-            margin=dict(l=10, r=10, t=50, b=10),
-        )
-        return fig, None, missing
+        return None, None, missing
 
     common_start, common_end = common
     min_date, max_date = common_start.date(), common_end.date()
@@ -130,6 +192,37 @@ def build_all_tickers_normalized_figure(
         rows.append(dfv.loc[:, ["date", "ticker", "pct_from_start"]])
 
     plot_df = pd.concat(rows, ignore_index=True) if rows else pd.DataFrame()
+    return plot_df, (min_date, max_date), missing
+
+
+@traced("build_all_tickers_normalized_figure")
+def build_all_tickers_normalized_figure(
+    *,
+    data_dir: Path,
+    symbols: list[str],
+    start: Date,
+    spec: TickerSeriesSpec = TickerSeriesSpec(),
+) -> tuple[Figure, tuple[Date, Date] | None, list[str]]:
+    """Build a % change chart for all tickers, normalized to the selected start date.
+
+    Returns (fig, (min_date, max_date), missing_symbols).
+    """
+    # plotly is heavy to import; only pay for it when a chart is actually built
+    import plotly.express as px
+
+    plot_df, date_range, missing = normalized_frame(
+        data_dir=data_dir, symbols=tuple(symbols), start=start
+    )
+    if plot_df is None:
+        fig = px.line(template=spec.template, height=spec.height)
+        fig.update_layout(
+            title="No data available",
+            xaxis_title=None,
+            yaxis_title=None,
+            margin=dict(l=10, r=10, t=50, b=10),
+        )
+        return fig, None, missing
+
     fig = px.line(
         plot_df,
         x="date",
@@ -147,17 +240,52 @@ def build_all_tickers_normalized_figure(
         legend_title_text="",
     )
     fig.update_yaxes(ticksuffix="%")
-    return fig, (min_date, max_date), missing
+    return fig, date_range, missing
+
 
+@traced("default_all_tickers_figure", cached=True)
+def default_all_tickers_figure(
+    *,
+    data_dir: Path,
+    symbols: list[str],
+    spec: TickerSeriesSpec = TickerSeriesSpec(),
+) -> tuple[Figure, tuple[Date, Date] | None, list[str]]:
+    """`build_all_tickers_normalized_figure` from the first common date, the
+    Details page's default view.
 
+    Built once per worker and series version and shared by every session, so
+    the figure must not be modified.
+    """
+    return _default_all_tickers_figure(
+        data_dir, tuple(symbols), spec, series_id(data_dir, symbols)
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _default_all_tickers_figure(
+    data_dir: Path, symbols: tuple[str, ...], spec: TickerSeriesSpec, generation: str
+) -> tuple[Figure, tuple[Date, Date] | None, list[str]]:
+    record_miss("default_all_tickers_figure")
+    common_range, _ = get_all_tickers_common_range(
+        data_dir=data_dir, symbols=list(symbols)
+    )
+    start = common_range[0] if common_range is not None else Date.today()
+    return build_all_tickers_normalized_figure(
+        data_dir=data_dir, symbols=list(symbols), start=start, spec=spec
+    )
+
+
+@traced("build_single_ticker_figure")
 def build_single_ticker_figure(
     *,
     data_dir: Path,
     symbol: str,
     start: Date | None = None,
     spec: TickerSeriesSpec = TickerSeriesSpec(),
-) -> tuple[px.line, tuple[Date, Date] | None]:
+) -> tuple[Figure, tuple[Date, Date] | None]:
     """Build an absolute close price chart for a single ticker."""
+    import plotly.express as px
+
     df = load_close_series(data_dir, symbol)
     if df is None or df.empty:
         fig = px.line(template=spec.template, height=spec.height)
@@ -189,3 +317,62 @@ def build_single_ticker_figure(
         margin=dict(l=10, r=10, t=50, b=10),
     )
     return fig, (min_date, max_date)
+
+
+@traced("default_single_ticker_figure", cached=True)
+def default_single_ticker_figure(
+    *,
+    data_dir: Path,
+    symbol: str,
+    spec: TickerSeriesSpec = TickerSeriesSpec(),
+) -> tuple[Figure, tuple[Date, Date] | None]:
+    """`build_single_ticker_figure` over the whole series, shared like
+    `default_all_tickers_figure`."""
+    return _default_single_ticker_figure(
+        data_dir, symbol.upper(), spec, series_id(data_dir, [symbol.upper()])
+    )
+
+
+# one figure per ticker viewed; figures are far larger than their series, so
+# only the most recent few are kept
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _default_single_ticker_figure(
+    data_dir: Path, symbol: str, spec: TickerSeriesSpec, generation: str
+) -> tuple[Figure, tuple[Date, Date] | None]:
+    record_miss("default_single_ticker_figure")
+    return build_single_ticker_figure(data_dir=data_dir, symbol=symbol, spec=spec)
+
+
+@traced("build_group_index_figure")
+def build_group_index_figure(
+    levels: pd.DataFrame,
+    *,
+    start: Date | None = None,
+    spec: TickerSeriesSpec = TickerSeriesSpec(),
+) -> Figure:
+    """Group index levels rebased to 100 on `start` (or each index's first day)."""
+    import plotly.express as px
+
+    df = levels if start is None else levels[levels.index >= pd.Timestamp(start)]
+    # divide each column by its first non-missing level
+    rebased = df / df.bfill().iloc[0] * 100.0 if not df.empty else df
+    plot_df = rebased.reset_index().melt(
+        id_vars="date", var_name="index", value_name="level"
+    )
+    fig = px.line(
+        plot_df.dropna(),
+        x="date",
+        y="level",
+        color="index",
+        template=spec.template,
+        height=spec.height,
+        title="Group indices — rebased to 100",
+    )
+    fig.update_traces(mode="lines")
+    fig.update_layout(
+        xaxis_title=None,
+        yaxis_title="Level",
+        margin=dict(l=10, r=10, t=50, b=10),
+        legend_title_text="",
+    )
+    return fig
@@ -2,8 +2,35 @@ from pathlib import Path
 from pydantic import Field, HttpUrl
 from pydantic_settings import BaseSettings
 
+from finance_daily.constants import (
+    SERIES_CACHE_MAX_ENTRIES,
+    SERIES_CACHE_MAX_MB,
+    FetchMode,
+)
+
 
 class AppConfig(BaseSettings):
     data_dir: Path = Field(..., env="DATA_DIR")
     config_dir: Path = Field(..., env="CONFIG_DIR")
     data_src: HttpUrl = HttpUrl("https://Woodygoodenough.github.io/finance-etl")
+    fetch_mode: FetchMode = Field(FetchMode.DELTA, env="FETCH_MODE")
+    # opt-in per-rerun timing panel in the sidebar
+    debug_panel: bool = Field(False, env="DEBUG_PANEL")
+    # `.prom` -> Prometheus text totals, anything else -> JSONL spans per rerun
+    trace_export_path: Path | None = Field(None, env="TRACE_EXPORT_PATH")
+    # headless data API (`poetry run api`)
+    api_host: str = Field("127.0.0.1", env="API_HOST")
+    api_port: int = Field(8600, env="API_PORT")
+    # production mode: >1 runs that many Streamlit workers behind a balancer
+    app_workers: int = Field(1, env="APP_WORKERS")
+    app_port: int = Field(8501, env="APP_PORT")
+    # comma-separated addresses/networks of reverse proxies in front of the
+    # balancer; their X-Forwarded-For picks the worker instead of their address
+    trusted_proxies: str = Field("", env="TRUSTED_PROXIES")
+    # warm every page's caches in the background after the first page render
+    prewarm_on_start: bool = Field(True, env="PREWARM_ON_START")
+    # LRU limits of the close series cache shared by every session
+    series_cache_max_entries: int = Field(
+        SERIES_CACHE_MAX_ENTRIES, env="SERIES_CACHE_MAX_ENTRIES"
+    )
+    series_cache_max_mb: float = Field(SERIES_CACHE_MAX_MB, env="SERIES_CACHE_MAX_MB")
@@ -21,6 +21,25 @@ class DatasetName(str, Enum):
 # per ticker dataset names
 DAILY_RAW_T = "fact_all_daily_raw_{symbol}.csv"
 
+
+# per ticker raw series fields
+class DailyRawFields(str, Enum):
+    DATE = "date"
+    CLOSE = "close"
+
+
+# group index weighting schemes
+class GroupWeighting(str, Enum):
+    EQUAL = "equal"
+    CUSTOM = "custom"  # tickers.yaml `weight:` per member
+
+
+# how the fetch refreshes the append-mostly per ticker series
+class FetchMode(str, Enum):
+    FULL = "full"  # re-download every file
+    DELTA = "delta"  # HTTP Range from the local size, full download on mismatch
+
+
 # project structure
 PAGES_DIR = "pages_impl"
 OVERVIEW_SCT = Path(PAGES_DIR) / "overview.py"
@@ -31,6 +50,19 @@ FUNDAMENTALS_SCT = Path(PAGES_DIR) / "fundamentals.py"
 
 # config file names
 TICKERS_F = "tickers.yaml"
+SCHEDULE_F = "schedule.yaml"
+
+# bookkeeping files written into DATA_DIR
+FETCH_HISTORY_F = "fetch_history.jsonl"
+SERVING_DB_F = "serving.sqlite"
+FETCH_LOCK_F = ".fetch.lock"
+SCHEDULER_STATE_F = "scheduler_state.json"
+NEWS_CURSOR_F = "news_cursor.json"
+GENERATION_F = "generation.json"
+
+# default limits of the process-wide close series cache (SERIES_CACHE_MAX_*)
+SERIES_CACHE_MAX_ENTRIES = 512
+SERIES_CACHE_MAX_MB = 256
 
 
 # ETL meta fields
@@ -56,3 +88,61 @@ class NewsFields(str, Enum):
     BANNER_IMAGE = "banner_image"
     OVERALL_SENTIMENT_SCORE = "overall_sentiment_score"
     OVERALL_SENTIMENT_LABEL = "overall_sentiment_label"
+
+
+class FundamentalsFields(str, Enum):
+    SYMBOL = "symbol"
+    FISCAL_DATE_ENDING = "fiscal_date_ending"
+    TOTAL_REVENUE = "total_revenue"
+    GROSS_PROFIT = "gross_profit"
+    NET_INCOME = "net_income"
+    EPS = "eps"
+    SHARES_OUTSTANDING = "shares_outstanding"
+    TOTAL_ASSETS = "total_assets"
+    TOTAL_LIABILITIES = "total_liabilities"
+    TOTAL_SHAREHOLDER_EQUITY = "total_shareholder_equity"
+    OPERATING_CASHFLOW = "operating_cashflow"
+
+
+class FundamentalsMetric(str, Enum):
+    """Columns `fundamentals_engine` derives from the raw fundamentals."""
+
+    GROSS_MARGIN = "gross_margin"
+    NET_MARGIN = "net_margin"
+    RETURN_ON_EQUITY = "return_on_equity"
+    DEBT_TO_EQUITY = "debt_to_equity"
+    BOOK_VALUE_PER_SHARE = "book_value_per_share"
+    EPS_TTM = "eps_ttm"
+    REVENUE_QOQ = "total_revenue_qoq"
+    REVENUE_YOY = "total_revenue_yoy"
+    NET_INCOME_YOY = "net_income_yoy"
+    EPS_YOY = "eps_yoy"
+    PERIOD_CLOSE = "period_close"
+    MARKET_CAP = "market_cap"
+    PE_TTM = "pe_ttm"
+    PRICE_TO_BOOK = "price_to_book"
+
+
+# columns used for row filters pushed down into `load_dataset`
+DATASET_DATE_FIELDS: dict[DatasetName, str] = {
+    DatasetName.FACT_NEWS_RAW: NewsFields.TIME_PUBLISHED.value,
+}
+DATASET_SYMBOL_FIELDS: dict[DatasetName, str] = {
+    DatasetName.FACT_LATEST: SnapshotFields.TICKER.value,
+    DatasetName.FACT_FUNDAMENTALS: FundamentalsFields.SYMBOL.value,
+}
+# columns a fetched file must have to replace the local copy
+DATASET_REQUIRED_FIELDS: dict[DatasetName, tuple[str, ...]] = {
+    DatasetName.FACT_LATEST: (SnapshotFields.TICKER.value,),
+    DatasetName.FACT_NEWS_RAW: (NewsFields.TITLE.value, NewsFields.URL.value),
+    DatasetName.FACT_FUNDAMENTALS: (FundamentalsFields.SYMBOL.value,),
+    DatasetName.DIM_META_GROUP1: (
+        ETLMetaFields.OVERALL_SUCCESS.value,
+        ETLMetaFields.LAST_ETL_TIMESTAMP.value,
+    ),
+    DatasetName.DIM_META_GROUP2: (
+        ETLMetaFields.OVERALL_SUCCESS.value,
+        ETLMetaFields.LAST_ETL_TIMESTAMP.value,
+    ),
+}
+DAILY_RAW_REQUIRED_FIELDS = (DailyRawFields.DATE.value, DailyRawFields.CLOSE.value)
@@ -7,3 +7,6 @@ class AppContext:
     lastest_data_date: datetime | None
     last_fetch_ok: bool | None = None
     last_fetch_error: str | None = None
+    # `generation_id` of the data this context was built from: the ID the
+    # fetch wrote to generation.json while the files are unchanged since
+    generation: str | None = None
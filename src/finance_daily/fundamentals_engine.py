@@ -0,0 +1,276 @@
+"""Fundamentals pivoted to (symbol, fiscal period) with derived ratios.
+
+The dataset is read once per data generation into one float matrix, rows
+sorted by symbol then period, with per-symbol row offsets: a drilldown is a
+slice and a cross-section of latest periods is one fancy index. Margins,
+period-over-period growth and valuation ratios (against the close on or
+before each period end) are computed column-wise over the whole matrix at
+load time, so the page never reloads or recomputes per rerun.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from finance_daily.config import AppConfig
+from finance_daily.constants import (
+    DatasetName,
+    FundamentalsFields as F,
+    FundamentalsMetric as M,
+)
+from finance_daily.components.ticker_series_chart import load_close_series
+from finance_daily.generation import dataset_id, series_id
+from finance_daily.serving_db import read_dataset
+from finance_daily.utils import load_tickers
+
+# growth compares against the period this many days back, within a tolerance,
+# so a gap in reporting gives NaN rather than a multi-period change
+QOQ_DAYS = (80, 100)
+YOY_DAYS = (350, 380)
+# the four quarters summed into trailing EPS must span at most this
+TTM_MAX_SPAN_DAYS = 300
+
+
+@dataclass(frozen=True)
+class FundamentalsTable:
+    """`values[r, c]` is `columns[c]` for the row's symbol and period.
+
+    Rows of `symbols[i]` are `offsets[i]:offsets[i + 1]`, oldest period first.
+    """
+
+    symbols: tuple[str, ...]
+    offsets: np.ndarray  # int64, len(symbols) + 1
+    periods: np.ndarray  # datetime64[ns], one per row
+    columns: tuple[str, ...]
+    values: np.ndarray  # float64, shape (len(periods), len(columns))
+    positions: dict[str, int]  # symbol -> index into `symbols`
+
+    def rows(self, symbol: str) -> slice:
+        i = self.positions.get(symbol)
+        if i is None:
+            return slice(0, 0)
+        return slice(int(self.offsets[i]), int(self.offsets[i + 1]))
+
+    def symbol_frame(self, symbol: str) -> pd.DataFrame:
+        """Every period of one symbol, indexed by fiscal date ending."""
+        rows = self.rows(symbol)
+        return pd.DataFrame(
+            self.values[rows],
+            index=pd.DatetimeIndex(self.periods[rows], name=F.FISCAL_DATE_ENDING.value),
+            columns=self.columns,
+        )
+
+    def latest(self, symbols: Sequence[str]) -> pd.DataFrame:
+        """The most recent period of each symbol that has one, indexed by symbol."""
+        spans = [(s, self.rows(s)) for s in symbols]
+        found = [s for s, rows in spans if rows.stop > rows.start]
+        last = np.array(
+            [rows.stop - 1 for _, rows in spans if rows.stop > rows.start],
+            dtype=np.int64,
+        )
+        df = pd.DataFrame(
+            self.values[last],
+            index=pd.Index(found, name=F.SYMBOL.value),
+            columns=self.columns,
+        )
+        df.insert(0, F.FISCAL_DATE_ENDING.value, self.periods[last])
+        return df
+
+    def metric(self, column: str, symbols: Sequence[str]) -> pd.DataFrame:
+        """One column across periods, one frame column per symbol."""
+        c = self.columns.index(column)
+        return pd.DataFrame(
+            {
+                s: pd.Series(
+                    self.values[self.rows(s), c],
+                    index=pd.DatetimeIndex(self.periods[self.rows(s)]),
+                )
+                for s in symbols
+                if s in self.positions
+            }
+        )
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = num / den
+    out[~np.isfinite(out)] = np.nan
+    return out
+
+
+def _lagged(
+    values: np.ndarray,
+    periods: np.ndarray,
+    group_start: np.ndarray,
+    lag: int,
+    days: tuple[int, int],
+) -> np.ndarray:
+    """`values` `lag` rows back within the same symbol, NaN unless that row
+    is `days` (min, max) before."""
+    n = len(values)
+    idx = np.arange(n) - lag
+    ok = idx >= group_start
+    idx = np.where(ok, idx, 0)
+    gap = (periods - periods[idx]) / np.timedelta64(1, "D")
+    ok &= (gap >= days[0]) & (gap <= days[1])
+    return np.where(ok, values[idx], np.nan)
+
+
+def _growth(
+    values: np.ndarray, periods: np.ndarray, group_start: np.ndarray, lag: int, days
+) -> np.ndarray:
+    prev = _lagged(values, periods, group_start, lag, days)
+    # growth from a negative base is not meaningful
+    return _ratio(values - prev, np.where(prev > 0, prev, np.nan))
+
+
+def _trailing_sum(
+    values: np.ndarray, periods: np.ndarray, group_start: np.ndarray, window: int
+) -> np.ndarray:
+    present = ~np.isnan(values)
+    csum = np.concatenate([[0.0], np.cumsum(np.where(present, values, 0.0))])
+    cnt = np.concatenate([[0], np.cumsum(present)])
+    end = np.arange(1, len(values) + 1)
+    start = end - window
+    ok = start >= group_start
+    start = np.where(ok, start, 0)
+    span = (periods - periods[start]) / np.timedelta64(1, "D")
+    ok &= (cnt[end] - cnt[start] == window) & (span <= TTM_MAX_SPAN_DAYS)
+    return np.where(ok, csum[end] - csum[start], np.nan)
+
+
+def _period_closes(
+    close_series: Callable[[str], pd.DataFrame | None] | None,
+    symbols: np.ndarray,
+    offsets: np.ndarray,
+    periods: np.ndarray,
+) -> np.ndarray:
+    """Each row's close on the last trading day on or before its period end."""
+    out = np.full(len(periods), np.nan)
+    if close_series is None:
+        return out
+    for i, symbol in enumerate(symbols):
+        series = close_series(symbol)
+        if series is None or series.empty:
+            continue
+        dates = series["date"].to_numpy(dtype="datetime64[ns]")
+        close = series["close"].to_numpy(dtype=np.float64)
+        rows = slice(int(offsets[i]), int(offsets[i + 1]))
+        day = np.searchsorted(dates, periods[rows], side="right") - 1
+        out[rows] = np.where(day >= 0, close[np.maximum(day, 0)], np.nan)
+    return out
+
+
+def build_fundamentals_table(
+    df: pd.DataFrame,
+    close_series: Callable[[str], pd.DataFrame | None] | None = None,
+) -> FundamentalsTable:
+    """Pivot the raw dataset and derive ratios; rows without a symbol or a
+    parseable period are dropped, later duplicates of a (symbol, period) win.
+
+    `close_series(symbol)` gives a ticker's (date, close) rows, sorted by
+    date, like `load_close_series`; without it the valuation ratios are NaN.
+    """
+    # rows are matched up by label below; a concatenated frame may repeat them
+    df = df.reset_index(drop=True)
+    symbol = df[F.SYMBOL.value].astype("string").str.strip().str.upper()
+    period = pd.to_datetime(df[F.FISCAL_DATE_ENDING.value], errors="coerce")
+    keep = (symbol.notna() & period.notna()).to_numpy(dtype=bool)
+    raw = df.loc[keep].drop(columns=[F.SYMBOL.value, F.FISCAL_DATE_ENDING.value])
+    # text columns (e.g. a currency code) coerce to all-NaN and are dropped
+    raw = raw.apply(pd.to_numeric, errors="coerce").dropna(axis=1, how="all")
+    keys = pd.DataFrame({"s": symbol[keep], "p": period[keep]}, index=raw.index)
+
+    keys = keys.sort_values(["s", "p"], kind="stable")
+    last = ~keys.duplicated(keep="last")
+    keys, raw = keys[last], raw.loc[keys.index[last]]
+
+    sym = keys["s"].to_numpy(dtype=object)
+    periods = keys["p"].to_numpy(dtype="datetime64[ns]")
+    symbols, first = np.unique(sym, return_index=True)
+    offsets = np.append(first, len(sym)).astype(np.int64)
+    group_start = np.repeat(first, np.diff(offsets))
+
+    def col(name: F) -> np.ndarray:
+        if name.value in raw.columns:
+            return raw[name.value].to_numpy(dtype=np.float64, na_value=np.nan)
+        return np.full(len(raw), np.nan)
+
+    revenue, equity = col(F.TOTAL_REVENUE), col(F.TOTAL_SHAREHOLDER_EQUITY)
+    net_income, eps = col(F.NET_INCOME), col(F.EPS)
+    shares = col(F.SHARES_OUTSTANDING)
+    eps_ttm = _trailing_sum(eps, periods, group_start, 4)
+    bvps = _ratio(equity, shares)
+    close = _period_closes(close_series, symbols, offsets, periods)
+
+    derived = {
+        M.GROSS_MARGIN: _ratio(col(F.GROSS_PROFIT), revenue),
+        M.NET_MARGIN: _ratio(net_income, revenue),
+        M.RETURN_ON_EQUITY: _ratio(net_income, equity),
+        M.DEBT_TO_EQUITY: _ratio(col(F.TOTAL_LIABILITIES), equity),
+        M.BOOK_VALUE_PER_SHARE: bvps,
+        M.EPS_TTM: eps_ttm,
+        M.REVENUE_QOQ: _growth(revenue, periods, group_start, 1, QOQ_DAYS),
+        M.REVENUE_YOY: _growth(revenue, periods, group_start, 4, YOY_DAYS),
+        M.NET_INCOME_YOY: _growth(net_income, periods, group_start, 4, YOY_DAYS),
+        M.EPS_YOY: _growth(eps, periods, group_start, 4, YOY_DAYS),
+        M.PERIOD_CLOSE: close,
+        M.MARKET_CAP: close * shares,
+        # a loss makes P/E meaningless, as does negative book for P/B
+        M.PE_TTM: _ratio(close, np.where(eps_ttm > 0, eps_ttm, np.nan)),
+        M.PRICE_TO_BOOK: _ratio(close, np.where(bvps > 0, bvps, np.nan)),
+    }
+    values = np.column_stack(
+        [raw.to_numpy(dtype=np.float64, na_value=np.nan).reshape(raw.shape)]
+        + list(derived.values())
+    )
+    return FundamentalsTable(
+        symbols=tuple(symbols),
+        offsets=offsets,
+        periods=periods,
+        columns=(*raw.columns, *(m.value for m in derived)),
+        values=values,
+        positions={s: i for i, s in enumerate(symbols)},
+    )
+
+
+# --- cached entry point ---
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _fundamentals_table(
+    config: AppConfig, symbols: tuple[str, ...], generation: str
+) -> FundamentalsTable | None:
+    # one read-only instance per worker and generation, shared by all sessions
+    df = read_dataset(DatasetName.FACT_FUNDAMENTALS, config=config)
+    if df is None or F.SYMBOL.value not in df or F.FISCAL_DATE_ENDING.value not in df:
+        return None
+    configured = set(symbols)
+
+    def close_series(symbol: str) -> pd.DataFrame | None:
+        # the per-ticker series cache the Details page uses, itself backed by
+        # the shared store, so no second copy of the prices is built here
+        if symbol not in configured:
+            return None
+        return load_close_series(config.data_dir, symbol)
+
+    return build_fundamentals_table(df, close_series)
+
+
+def load_fundamentals(config: AppConfig) -> FundamentalsTable | None:
+    """The pivoted fundamentals; None if there is no usable local dataset.
+
+    Rebuilt when the fundamentals or the tickers' price files change.
+    """
+    symbols = tuple(load_tickers(config).to_symbols())
+    data_dir = config.data_dir
+    generation = (
+        f"{dataset_id(data_dir, DatasetName.FACT_FUNDAMENTALS)}"
+        f"-{series_id(data_dir, symbols)}"
+    )
+    return _fundamentals_table(config, symbols, generation)
@@ -0,0 +1,160 @@
+"""Data generation IDs: short hashes of the versions of the local data files.
+
+The fetch pipeline (`fetch_and_store`, `poll_news`) calls `write_generation`
+after changing files. It records every source file's (mtime_ns, size) and a
+hash of its content in DATA_DIR/generation.json, re-hashing only the files
+whose signature changed since the last record, so a file rewritten with the
+same rows keeps its hash.
+
+Cached loaders take the ID of their own inputs as an argument: `dataset_id`
+for one dataset, `series_id` for a set of per-symbol series files
+(`inputs_id` in general). An entry is keyed by the exact version of the files
+it was computed from, so a news poll invalidates what reads the news file and
+nothing else, without clearing anything. A recorded hash is used while the
+file on disk still has the recorded signature; a file changed outside the
+pipeline, or never recorded (tests, synthetic data), is keyed by its
+signature instead, so it still invalidates its caches. Asking costs one stat
+per input file.
+
+`generation_id` covers every recorded file at once: while none changed since,
+it is the ID `write_generation` returned. The session context
+(`state.get_app_ctx`) is rebuilt when it changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from finance_daily.constants import DAILY_RAW_T, GENERATION_F, DatasetName
+from finance_daily.shared_store import file_signature
+
+_HASH_CHUNK = 1 << 20
+
+
+@dataclass(frozen=True)
+class _Record:
+    sources: dict[str, list[int]]  # file name -> (mtime_ns, size)
+    hashes: dict[str, str]  # file name -> content hash
+
+
+# generation file path -> (its signature, the record it holds)
+_RECORDS: dict[Path, tuple[list[int], _Record]] = {}
+_RECORDS_LOCK = threading.Lock()
+
+
+def _hash(manifest: dict[str, object]) -> str:
+    encoded = json.dumps(manifest, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _content_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def source_manifest(data_dir: Path, symbols: list[str]) -> dict[str, list[int]]:
+    """file name -> (mtime_ns, size) of every dataset and series file present."""
+    names = [ds.value for ds in DatasetName]
+    names += [DAILY_RAW_T.format(symbol=s) for s in symbols]
+    manifest = {}
+    for name in names:
+        signature = file_signature(data_dir / name)
+        if signature is not None:
+            manifest[name] = signature
+    return manifest
+
+
+def _read_record(path: Path) -> _Record | None:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        return _Record(sources=dict(raw["sources"]), hashes=dict(raw["hashes"]))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_generation(data_dir: Path, symbols: list[str]) -> str:
+    """Record the current data version; returns its ID."""
+    manifest = source_manifest(data_dir, symbols)
+    path = data_dir / GENERATION_F
+    previous = _read_record(path) or _Record(sources={}, hashes={})
+    hashes = {}
+    for name, signature in manifest.items():
+        if previous.sources.get(name) == signature and name in previous.hashes:
+            hashes[name] = previous.hashes[name]
+        else:
+            hashes[name] = _content_hash(data_dir / name)
+    gen_id = _hash(hashes)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(
+        json.dumps({"id": gen_id, "sources": manifest, "hashes": hashes}),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+    return gen_id
+
+
+def _recorded(data_dir: Path) -> _Record | None:
+    path = data_dir / GENERATION_F
+    signature = file_signature(path)
+    if signature is None:
+        return None
+    cached = _RECORDS.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    with _RECORDS_LOCK:
+        record = _read_record(path)
+        if record is None:
+            # removed, damaged or from an older version: key on signatures
+            # until the next fetch
+            return None
+        _RECORDS[path] = (signature, record)
+    return record
+
+
+def inputs_id(data_dir: Path, names: Iterable[str]) -> str:
+    """ID of the current version of the files `names` (absent ones included)."""
+    record = _recorded(data_dir)
+    keys: dict[str, object] = {}
+    for name in names:
+        signature = file_signature(data_dir / name)
+        if (
+            record is not None
+            and signature is not None
+            and record.sources.get(name) == signature
+            and name in record.hashes
+        ):
+            keys[name] = record.hashes[name]
+        else:
+            keys[name] = signature
+    return _hash(keys)
+
+
+def dataset_id(data_dir: Path, dsname: DatasetName) -> str:
+    """ID of the current version of one dataset file."""
+    return inputs_id(data_dir, [dsname.value])
+
+
+def series_id(data_dir: Path, symbols: Iterable[str]) -> str:
+    """ID of the current version of the daily series files of `symbols`."""
+    return inputs_id(data_dir, [DAILY_RAW_T.format(symbol=s) for s in symbols])
+
+
+def _unrecorded_id(data_dir: Path) -> str:
+    return _hash({p.name: file_signature(p) for p in sorted(data_dir.glob("*.csv"))})
+
+
+def generation_id(data_dir: Path) -> str:
+    """ID of all the data currently in `data_dir`."""
+    record = _recorded(data_dir)
+    if record is None:
+        return _unrecorded_id(data_dir)
+    return inputs_id(data_dir, record.sources)
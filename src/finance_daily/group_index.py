@@ -0,0 +1,165 @@
+"""Equal- and custom-weight index levels for the ticker groups in tickers.yaml.
+
+Indices rebalance daily: a day's index return is the weighted mean of the
+members' returns that day, renormalized over the members that have one, so a
+member with a shorter history joins when its data starts. Levels start at
+`BASE_LEVEL` on the first day any member has a close. All indices are
+computed together as one matrix product over the price panel, and
+`extend_levels` chains newly appended days onto existing levels.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from finance_daily.constants import GroupWeighting, SnapshotFields
+from finance_daily.price_panel import PricePanel
+from finance_daily.shared_types import ETLTickers
+
+BASE_LEVEL = 100.0
+# trading days back for the snapshot summary's one-week change
+WEEK_ROWS = 5
+
+
+@dataclass(frozen=True)
+class GroupIndexDef:
+    group: str
+    weighting: GroupWeighting
+    weights: tuple[tuple[str, float], ...]  # (symbol, weight), weight > 0
+
+    @property
+    def name(self) -> str:
+        return f"{self.group} ({self.weighting.value})"
+
+    def to_json(self) -> dict:
+        return {
+            "group": self.group,
+            "weighting": self.weighting.value,
+            "weights": [list(w) for w in self.weights],
+        }
+
+
+def group_index_defs(tickers: ETLTickers) -> list[GroupIndexDef]:
+    """An equal-weight index per group, plus a custom one where weights are set."""
+    defs = []
+    for group in tickers.group_names():
+        members = tickers.get_group(group)
+        defs.append(
+            GroupIndexDef(
+                group=group,
+                weighting=GroupWeighting.EQUAL,
+                weights=tuple((t.symbol, 1.0) for t in members),
+            )
+        )
+        custom = tuple((t.symbol, t.weight) for t in members if t.weight)
+        if custom:
+            defs.append(
+                GroupIndexDef(
+                    group=group, weighting=GroupWeighting.CUSTOM, weights=custom
+                )
+            )
+    return defs
+
+
+def weight_matrix(defs: list[GroupIndexDef], symbols: tuple[str, ...]) -> np.ndarray:
+    """(len(symbols), len(defs)) weights; members missing from `symbols` drop out."""
+    index = {s: j for j, s in enumerate(symbols)}
+    w = np.zeros((len(symbols), len(defs)))
+    for k, d in enumerate(defs):
+        for sym, weight in d.weights:
+            if sym in index:
+                w[index[sym], k] = weight
+    return w
+
+
+def _index_returns(close: np.ndarray, w: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = close[1:] / close[:-1] - 1.0
+    present = np.isfinite(r)
+    num = np.where(present, r, 0.0) @ w
+    den = present.astype(np.float64) @ w
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, num / den, np.nan)
+
+
+def _chain(start: np.ndarray, returns: np.ndarray) -> np.ndarray:
+    # a day without any member return leaves the level unchanged
+    return start * np.cumprod(np.where(np.isnan(returns), 1.0, 1.0 + returns), axis=0)
+
+
+def compute_levels(panel: PricePanel, defs: list[GroupIndexDef]) -> np.ndarray:
+    """(len(panel.dates), len(defs)) index levels, NaN before an index starts."""
+    w = weight_matrix(defs, panel.symbols)
+    close = np.asarray(panel.close, dtype=np.float64)
+    if len(close) == 0:
+        return np.empty((0, len(defs)))
+    levels = np.vstack(
+        [
+            np.full((1, len(defs)), BASE_LEVEL),
+            _chain(np.full(len(defs), BASE_LEVEL), _index_returns(close, w)),
+        ]
+    )
+    has_close = (~np.isnan(close)).astype(np.float64) @ w > 0
+    levels[~np.logical_or.accumulate(has_close, axis=0)] = np.nan
+    return levels
+
+
+def extend_levels(
+    levels: np.ndarray,
+    old_panel: PricePanel,
+    new_panel: PricePanel,
+    defs: list[GroupIndexDef],
+) -> np.ndarray:
+    """Levels for `new_panel`, reusing `levels` (computed on `old_panel`).
+
+    Only valid when `new_panel` is `old_panel` with rows appended after its
+    last date; anything else falls back to `compute_levels`.
+    """
+    n = len(old_panel.dates)
+    appended_only = (
+        n > 0
+        and levels.shape == (n, len(defs))
+        and old_panel.symbols == new_panel.symbols
+        and len(new_panel.dates) >= n
+        and np.array_equal(new_panel.dates[:n], old_panel.dates)
+        and np.array_equal(new_panel.close[:n], old_panel.close, equal_nan=True)
+        and not np.isnan(levels[-1]).any()
+    )
+    if not appended_only:
+        return compute_levels(new_panel, defs)
+    w = weight_matrix(defs, new_panel.symbols)
+    tail = np.asarray(new_panel.close[n - 1 :], dtype=np.float64)
+    return np.vstack([levels, _chain(levels[-1], _index_returns(tail, w))])
+
+
+def levels_frame(
+    dates: np.ndarray, defs: list[GroupIndexDef], levels: np.ndarray
+) -> pd.DataFrame:
+    return pd.DataFrame(
+        levels, index=pd.DatetimeIndex(dates, name="date"), columns=[d.name for d in defs]
+    )
+
+
+def group_summary(levels: pd.DataFrame) -> pd.DataFrame:
+    """One snapshot-shaped row per index: latest level and 1D / 1W change."""
+    rows = []
+    for name in levels.columns:
+        s = levels[name].dropna()
+        if s.empty:
+            continue
+
+        def change(back: int) -> float | None:
+            return s.iloc[-1] / s.iloc[-1 - back] - 1.0 if len(s) > back else None
+
+        rows.append(
+            {
+                SnapshotFields.TICKER.value: name,
+                SnapshotFields.CLOSE.value: s.iloc[-1],
+                SnapshotFields.PCT_1_DAY.value: change(1),
+                SnapshotFields.PCT_1_WEEK.value: change(WEEK_ROWS),
+            }
+        )
+    return pd.DataFrame(rows, columns=[f.value for f in SnapshotFields])
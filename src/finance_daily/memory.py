@@ -0,0 +1,244 @@
+"""Memory accounting for caches and sessions, and a size-bounded LRU cache.
+
+`st.cache_data` entries are kept until their TTL (if any) runs out, so a
+cache keyed by symbol grows with every ticker viewed. `LruCache` bounds a
+process-wide cache by entry count and by total bytes, evicting the least
+recently used entries; the per-ticker close series use one
+(`ticker_series_chart.SERIES_CACHE`, sized by `SERIES_CACHE_MAX_ENTRIES` /
+`SERIES_CACHE_MAX_MB`).
+
+`cache_usage` and `session_usage` report what is held: entries and bytes of
+every `LruCache` and `st.cache_data` function cache (its pickled copies), and
+the deep size of each session's state. The debug panel shows both.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Generic, Hashable, TypeVar
+
+import numpy as np
+import pandas as pd
+
+V = TypeVar("V")
+
+# every LruCache created, by name, for `cache_usage`
+_LRU_CACHES: dict[str, LruCache] = {}
+
+
+def deep_size(obj: Any, _seen: set[int] | None = None) -> int:
+    """Approximate bytes held by `obj` and everything it references.
+
+    DataFrames and arrays count their buffers (object columns included);
+    containers and plain objects are walked, counting shared objects once.
+    """
+    seen = _seen if _seen is not None else set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += deep_size(k, seen) + deep_size(v, seen)
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for item in obj:
+            size += deep_size(item, seen)
+    if hasattr(obj, "__dict__"):
+        size += deep_size(vars(obj), seen)
+    for slot in getattr(type(obj), "__slots__", ()):
+        if isinstance(slot, str) and hasattr(obj, slot):
+            size += deep_size(getattr(obj, slot), seen)
+    return size
+
+
+@dataclass(frozen=True)
+class CacheUsage:
+    name: str
+    kind: str  # "lru" or "st.cache_data"
+    entries: int
+    bytes: int
+    max_entries: int | None = None
+    max_bytes: int | None = None
+    hits: int | None = None
+    misses: int | None = None
+    evictions: int | None = None
+
+
+class LruCache(Generic[V]):
+    """Thread-safe LRU cache bounded by entry count and total deep size.
+
+    Values are shared between callers, not copied, so they must be treated as
+    read-only. A value larger than `max_bytes` on its own is returned but not
+    kept.
+    """
+
+    def __init__(self, name: str, *, max_entries: int, max_bytes: int) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[V, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+        _LRU_CACHES[name] = self
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], V]) -> V:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        # computed outside the lock; concurrent misses on one key both compute
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key: Hashable, value: V) -> None:
+        size = deep_size(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def resize(self, *, max_entries: int, max_bytes: int) -> None:
+        with self._lock:
+            self.max_entries, self.max_bytes = max_entries, max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def usage(self) -> CacheUsage:
+        with self._lock:
+            return CacheUsage(
+                name=self.name,
+                kind="lru",
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_entries=self.max_entries,
+                max_bytes=self.max_bytes,
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+            )
+
+
+def _cache_data_usage() -> list[CacheUsage]:
+    # Streamlit keeps no public per-function view; its stats providers are the
+    # closest thing and give one stat per entry (the pickled copy's length).
+    # These are private, so a Streamlit upgrade that changes them reports
+    # nothing rather than breaking the debug panel.
+    try:
+        from streamlit.runtime.caching.cache_data_api import _data_caches
+
+        caches = [
+            cache
+            for function_caches in list(_data_caches._function_caches.values())
+            for cache in list(function_caches.values())
+        ]
+        stats = [
+            stat
+            for cache in caches
+            for entry_stats in cache.get_stats().values()
+            for stat in entry_stats
+        ]
+        usage: dict[str, list[int]] = {}
+        for stat in stats:
+            usage.setdefault(stat.cache_name, []).append(stat.byte_length)
+    except (ImportError, AttributeError, RuntimeError):
+        return []
+    return [
+        CacheUsage(
+            name=name, kind="st.cache_data", entries=len(sizes), bytes=sum(sizes)
+        )
+        for name, sizes in usage.items()
+    ]
+
+
+def cache_usage() -> list[CacheUsage]:
+    """Entries and bytes of every LRU cache and `st.cache_data` function cache,
+    largest first."""
+    usage = [cache.usage() for cache in _LRU_CACHES.values()]
+    usage += _cache_data_usage()
+    return sorted(usage, key=lambda u: u.bytes, reverse=True)
+
+
+@dataclass(frozen=True)
+class SessionUsage:
+    session_id: str
+    keys: int
+    bytes: int
+    largest: tuple[tuple[str, int], ...]  # (key, bytes) of the biggest values
+
+
+def _state_usage(session_id: str, state: dict[str, Any], top: int) -> SessionUsage:
+    sizes = {str(k): deep_size(v) for k, v in state.items()}
+    largest = sorted(sizes.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return SessionUsage(
+        session_id=session_id,
+        keys=len(sizes),
+        bytes=sum(sizes.values()),
+        largest=tuple(largest),
+    )
+
+
+def session_usage(top: int = 5) -> list[SessionUsage]:
+    """Deep size of every active session's state (AppConfig, AppContext,
+    widget values, ...); only the current session outside a server."""
+    import streamlit as st
+    from streamlit import runtime
+
+    states: dict[str, dict[str, Any]] = {}
+    try:
+        if runtime.exists():
+            # the runtime keeps its session manager private; fall back to the
+            # current session if that changes
+            session_mgr = runtime.get_instance()._session_mgr
+            for info in session_mgr.list_active_sessions():
+                session = info.session
+                states[session.id] = session.session_state.filtered_state
+    except (AttributeError, RuntimeError):
+        states = {}
+    if not states:
+        ctx = st.runtime.scriptrunner.get_script_run_ctx()
+        session_id = ctx.session_id if ctx is not None else "current"
+        states[session_id] = st.session_state.to_dict()
+    usage = [_state_usage(sid, state, top) for sid, state in states.items()]
+    return sorted(usage, key=lambda u: u.bytes, reverse=True)
+
+
+def process_rss_bytes() -> int | None:
+    """Resident set size of this process (Linux), None elsewhere."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
@@ -1,29 +1,217 @@
 import streamlit as st
 from streamlit_elements import elements, mui
 
-from finance_daily.constants import DatasetName
+from finance_daily.components.fundamentals_chart import build_fundamentals_trend_figure
+from finance_daily.components.debug_panel import traced_fragment
+from finance_daily.config import AppConfig
+from finance_daily.constants import (
+    DatasetName,
+    FundamentalsFields as F,
+    FundamentalsMetric as M,
+)
+from finance_daily.fundamentals_engine import FundamentalsTable, load_fundamentals
+from finance_daily.serving_db import DatasetQuery, count_rows, query_dataset
 from finance_daily.state import get_app_config
-from finance_daily.utils import load_dataset
+from finance_daily.utils import load_tickers
 
+PAGE_ROWS = 50
 
-cfg = get_app_config()
+# column -> (label, st.column_config number format)
+METRICS: dict[str, tuple[str, str]] = {
+    F.TOTAL_REVENUE.value: ("Revenue", "compact"),
+    F.NET_INCOME.value: ("Net income", "compact"),
+    F.EPS.value: ("EPS", "%.2f"),
+    M.EPS_TTM.value: ("EPS (TTM)", "%.2f"),
+    M.GROSS_MARGIN.value: ("Gross margin", "percent"),
+    M.NET_MARGIN.value: ("Net margin", "percent"),
+    M.RETURN_ON_EQUITY.value: ("ROE", "percent"),
+    M.DEBT_TO_EQUITY.value: ("Debt / equity", "%.2f"),
+    M.REVENUE_QOQ.value: ("Revenue QoQ", "percent"),
+    M.REVENUE_YOY.value: ("Revenue YoY", "percent"),
+    M.NET_INCOME_YOY.value: ("Net income YoY", "percent"),
+    M.EPS_YOY.value: ("EPS YoY", "percent"),
+    M.PERIOD_CLOSE.value: ("Close at period end", "%.2f"),
+    M.MARKET_CAP.value: ("Market cap", "compact"),
+    M.PE_TTM.value: ("P/E (TTM)", "%.1f"),
+    M.PRICE_TO_BOOK.value: ("P/B", "%.2f"),
+}
+COMPARISON_COLUMNS = [
+    F.TOTAL_REVENUE.value,
+    M.REVENUE_YOY.value,
+    M.NET_MARGIN.value,
+    M.RETURN_ON_EQUITY.value,
+    M.EPS_TTM.value,
+    M.PE_TTM.value,
+    M.PRICE_TO_BOOK.value,
+    M.MARKET_CAP.value,
+]
+HEADLINE_METRICS = [
+    (F.TOTAL_REVENUE.value, M.REVENUE_YOY.value),
+    (M.EPS_TTM.value, M.EPS_YOY.value),
+    (M.NET_MARGIN.value, None),
+    (M.PE_TTM.value, None),
+]
 
-st.title("Fundamentals")
-st.caption("This page is under progress. Current view shows the raw fundamentals dataset.")
-st.info("Under construction: next we’ll add per-ticker drilldowns, trends, and better valuation context.")
 
-df = load_dataset(DatasetName.FACT_FUNDAMENTALS, config=cfg)
-if df is None or df.empty:
-    st.warning(
-        "No local fundamentals dataset found yet. Click **Refresh data** on Overview, or ensure `DATA_DIR` is configured."
+def _column_config(columns) -> dict:
+    return {
+        c: st.column_config.NumberColumn(METRICS[c][0], format=METRICS[c][1])
+        for c in columns
+        if c in METRICS
+    }
+
+
+def _format(column: str, value: float, *, signed: bool = False) -> str:
+    fmt = METRICS[column][1]
+    if value != value:  # NaN
+        return "—"
+    if fmt == "percent":
+        return f"{value:+.1%}" if signed else f"{value:.1%}"
+    if fmt == "compact":
+        for div, suffix in ((1e12, "T"), (1e9, "B"), (1e6, "M")):
+            if abs(value) >= div:
+                return f"{value / div:,.2f}{suffix}"
+        return f"{value:,.0f}"
+    return fmt % value
+
+
+@st.fragment
+@traced_fragment
+def comparison_section(table: FundamentalsTable, symbols: list[str]) -> None:
+    st.subheader("Latest period")
+    selected = st.multiselect(
+        "Symbols",
+        options=symbols,
+        default=symbols,
+        key="fundamentals_compare",
     )
-else:
-    df_view = df.copy()
-    if "symbol" in df_view.columns:
-        df_view = df_view.sort_values("symbol", ascending=True)
+    df = table.latest(selected)
+    if df.empty:
+        st.info("No fundamentals for the selected symbols.")
+        return
+    columns = [c for c in COMPARISON_COLUMNS if c in df.columns]
+    st.dataframe(
+        df[[F.FISCAL_DATE_ENDING.value, *columns]],
+        column_config={
+            F.FISCAL_DATE_ENDING.value: st.column_config.DateColumn("Period"),
+            **_column_config(columns),
+        },
+    )
+
+
+@st.fragment
+@traced_fragment
+def drilldown_section(table: FundamentalsTable, symbols: list[str]) -> None:
+    st.subheader("Drilldown")
+    left, right = st.columns([0.4, 0.6], vertical_alignment="bottom")
+    with left:
+        symbol = st.selectbox("Ticker", options=symbols, key="fundamentals_symbol")
+    metrics = [c for c in METRICS if c in table.columns]
+    with right:
+        metric = st.selectbox(
+            "Trend",
+            options=metrics,
+            format_func=lambda c: METRICS[c][0],
+            key="fundamentals_metric",
+        )
+
+    # a constant-time slice of the pivoted table; nothing is reloaded
+    df = table.symbol_frame(symbol)
+    if df.empty:
+        st.info(f"No fundamentals for {symbol}.")
+        return
+
+    latest = df.iloc[-1]
+    for col, (value, change) in zip(st.columns(len(HEADLINE_METRICS)), HEADLINE_METRICS):
+        if value not in df.columns:
+            continue
+        with col:
+            st.metric(
+                METRICS[value][0],
+                _format(value, latest[value]),
+                delta=(
+                    _format(change, latest[change], signed=True)
+                    if change is not None and latest[change] == latest[change]
+                    else None
+                ),
+            )
+
+    st.plotly_chart(
+        build_fundamentals_trend_figure(
+            table.metric(metric, [symbol]),
+            label=f"{symbol} · {METRICS[metric][0]}",
+            percent=METRICS[metric][1] == "percent",
+        ),
+        width="stretch",
+    )
+    shown = [c for c in metrics if c in df.columns]
+    st.dataframe(
+        df[shown].sort_index(ascending=False),
+        column_config={
+            F.FISCAL_DATE_ENDING.value: st.column_config.DateColumn("Period"),
+            **_column_config(shown),
+        },
+    )
+
 
-    cols = list(df_view.columns)
-    rows = df_view.to_dict(orient="records")
+@st.fragment
+@traced_fragment
+def raw_dataset_section(config: AppConfig, symbols: list[str]) -> None:
+    selected = st.multiselect(
+        "Symbols",
+        options=symbols,
+        default=[],
+        placeholder="All symbols",
+        help="Only rows for the selected symbols are read from the dataset; "
+        "none selected reads them all.",
+        key="fundamentals_raw_symbols",
+    )
+
+    filters = DatasetQuery(symbols=tuple(selected) or None)
+    total = count_rows(DatasetName.FACT_FUNDAMENTALS, config=config, query=filters)
+    n_pages = max(1, -(-total // PAGE_ROWS))
+
+    # a zero-row query returns just the schema, for the sort options
+    schema = query_dataset(
+        DatasetName.FACT_FUNDAMENTALS, config=config, query=DatasetQuery(limit=0)
+    )
+    sortable = list(schema.columns) if schema is not None else []
+
+    sort_col, order_col, page_col = st.columns([0.5, 0.25, 0.25], vertical_alignment="bottom")
+    with sort_col:
+        sort_by = st.selectbox(
+            "Sort by",
+            options=sortable,
+            index=(
+                sortable.index(F.SYMBOL.value)
+                if F.SYMBOL.value in sortable
+                else 0
+            ),
+        )
+    with page_col:
+        page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1)
+    with order_col:
+        descending = st.toggle("Descending", value=False)
+
+    # one page is read per rerun; sorting and paging run in the serving database
+    df = query_dataset(
+        DatasetName.FACT_FUNDAMENTALS,
+        config=config,
+        query=DatasetQuery(
+            symbols=filters.symbols,
+            order_by=sort_by,
+            descending=descending,
+            limit=PAGE_ROWS,
+            offset=(page - 1) * PAGE_ROWS,
+        ),
+    )
+    if df is None or df.empty:
+        st.info("No rows for the selected symbols.")
+        return
+
+    cols = list(df.columns)
+    st.caption(f"Rows {(page - 1) * PAGE_ROWS + 1}–{(page - 1) * PAGE_ROWS + len(df)} of {total}")
+    rows = df.to_dict(orient="records")
 
     with elements("fundamentals_table"):
         mui.Card(
@@ -82,3 +270,25 @@ else:
         )
 
 
+cfg = get_app_config()
+
+st.title("Fundamentals")
+st.caption("Per-ticker drilldowns, period-over-period trends and valuation ratios.")
+
+table = load_fundamentals(cfg)
+if table is None or not table.symbols:
+    st.warning(
+        "No local fundamentals dataset found yet. Click **Refresh data** on Overview, or ensure `DATA_DIR` is configured."
+    )
+else:
+    # configured tickers first, in tickers.yaml order
+    configured = load_tickers(cfg).to_symbols()
+    symbols = [s for s in configured if s in table.positions]
+    symbols += [s for s in table.symbols if s not in set(configured)]
+
+    comparison_section(table, symbols)
+    st.markdown("---")
+    drilldown_section(table, symbols)
+
+    with st.expander("Raw dataset"):
+        raw_dataset_section(cfg, symbols)
@@ -6,15 +6,22 @@ from finance_daily.state import (
     update_app_ctx,
     refresh_everything,
 )
-from finance_daily.constants import DatasetName, SnapshotFields
-from finance_daily.components import SnapshotTableSpec, render_snapshot_table
-from finance_daily.components import NewsFeedSpec, df_to_news_items, render_news_feed
-from finance_daily.utils import load_dataset
+from finance_daily.constants import SnapshotFields
+from finance_daily.components import (
+    SnapshotFilter,
+    SnapshotTableSpec,
+    load_snapshot_view,
+    render_snapshot_table,
+)
+from finance_daily.components import NewsFeedSpec, load_news_items, render_news_feed
+from finance_daily.components.debug_panel import traced_fragment
+from finance_daily.config import AppConfig
+from finance_daily.group_index import group_summary
+from finance_daily.returns_engine import load_group_indices
+from finance_daily.utils import load_tickers
 
 
-ctx = get_app_ctx()
 cfg = get_app_config()
-snapshot_df = load_dataset(DatasetName.FACT_LATEST, config=cfg)
 
 # --- TOP ROW ---
 # Best practice for "wider" widgets in Streamlit: give them more layout space via column ratios.
@@ -35,6 +42,8 @@ with top_col_1:
     if refresh_clicked:
         refresh_everything()
 
+    ctx = get_app_ctx()
+
     st.metric(
         "Last refresh",
         value=(
@@ -58,36 +67,100 @@ with top_col_1:
             st.code(ctx.last_fetch_error)
 
 # --- Snapshot Table ---
-with top_col_2:
+SNAPSHOT_SORT_LABELS = {
+    "Ticker": SnapshotFields.TICKER.value,
+    "Price": SnapshotFields.CLOSE.value,
+    "1D": SnapshotFields.PCT_1_DAY.value,
+    "1W": SnapshotFields.PCT_1_WEEK.value,
+}
+
+
+# Each dataset-backed section is its own fragment: an interaction inside one
+# reruns only that section, never the other table or the status column.
+@st.fragment
+@traced_fragment
+def snapshot_section(config: AppConfig) -> None:
     header_left, header_right = st.columns([1, 1], vertical_alignment="center")
     with header_left:
         st.subheader("Latest snapshot")
+    with header_right:
+        show_col, sort_col, order_col = st.columns(
+            [0.4, 0.3, 0.3], vertical_alignment="bottom"
+        )
+        show = show_col.selectbox(
+            "Show", options=list(SnapshotFilter), format_func=lambda f: f.value
+        )
+        # the filters rank by their own key
+        ranked = show is not SnapshotFilter.ALL
+        sort_label = sort_col.selectbox(
+            "Sort by", options=list(SNAPSHOT_SORT_LABELS), disabled=ranked
+        )
+        descending = order_col.toggle("Descending", value=False, disabled=ranked)
 
-    if snapshot_df is None:
+    # datasets are loaded where they are rendered, so the header and metrics
+    # above reach the browser before any table is parsed; the view is
+    # formatted and sorted once per data generation, so sorting and filtering
+    # here are index slices
+    with st.spinner("Loading snapshot…"):
+        snapshot = load_snapshot_view(config)
+
+    if snapshot is None:
         st.warning(
             "No local dataset found yet. Click **Refresh data** to download it, or ensure `DATA_DIR` is configured."
         )
     else:
         render_snapshot_table(
-            snapshot_df,
+            snapshot,
             spec=SnapshotTableSpec(
                 max_rows=50,
+                sort_by=SNAPSHOT_SORT_LABELS[sort_label],
+                ascending=not descending,
+            ),
+            show=show,
+        )
+
+    # precomputed at fetch time, so this is a lookup rather than a reload
+    groups_df = group_summary(
+        load_group_indices(config.data_dir, load_tickers(config))
+    )
+    if not groups_df.empty:
+        st.caption("Group indices")
+        render_snapshot_table(
+            groups_df,
+            spec=SnapshotTableSpec(
                 sort_by=SnapshotFields.TICKER.value,
                 percent_is_fraction=True,
+                key="group_snapshot_table",
             ),
         )
+
+
+OVERVIEW_NEWS_ITEMS = 5
+# the feed reruns on its own to show items merged by the intraday news poll;
+# unchanged news is a cache hit on the file signature
+NEWS_REFRESH_S = 300
+
+
+@st.fragment(run_every=NEWS_REFRESH_S)
+@traced_fragment
+def news_section(config: AppConfig) -> None:
+    st.subheader("News feed")
+    with st.spinner("Loading news…"):
+        items = load_news_items(config, limit=OVERVIEW_NEWS_ITEMS)
+
+    if items is None:
+        st.warning(
+            "No local news dataset found yet. Click **Refresh data** to download it, or ensure `DATA_DIR` is configured."
+        )
+    else:
+        render_news_feed(
+            items, spec=NewsFeedSpec(max_items=OVERVIEW_NEWS_ITEMS, show_summaries=True)
+        )
+
+
+with top_col_2:
+    snapshot_section(cfg)
 st.markdown("---")
 
 # --- BOTTOM ROW ---
-# News feed
-news_df = load_dataset(DatasetName.FACT_NEWS_RAW, config=cfg)
-
-st.subheader("News feed")
-if news_df is None:
-    st.warning(
-        "No local news dataset found yet. Click **Refresh data** to download it, or ensure `DATA_DIR` is configured."
-    )
-else:
-    spec = NewsFeedSpec(max_items=5, show_summaries=True)
-    items = df_to_news_items(news_df)
-    render_news_feed(items, spec=spec)
+news_section(cfg)
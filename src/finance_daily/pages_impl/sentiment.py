@@ -1,9 +1,16 @@
+import numpy as np
 import streamlit as st
 
+from finance_daily.components import (
+    NewsCollection,
+    NewsFeedSpec,
+    load_news_items,
+    render_news_feed,
+)
+from finance_daily.components.debug_panel import traced_fragment
 from finance_daily.constants import DatasetName
-from finance_daily.components import NewsFeedSpec, df_to_news_items, render_news_feed
+from finance_daily.serving_db import date_bounds
 from finance_daily.state import get_app_config
-from finance_daily.utils import load_dataset
 
 
 cfg = get_app_config()
@@ -11,15 +18,12 @@ cfg = get_app_config()
 st.title("Sentiment analysis")
 st.caption("Overall market/news sentiment based on recent headlines.")
 
-news_df = load_dataset(DatasetName.FACT_NEWS_RAW, config=cfg)
-if news_df is None:
-    st.warning(
-        "No local news dataset found yet. Click **Refresh data** on Overview, or ensure `DATA_DIR` is configured."
-    )
-else:
-    items = df_to_news_items(news_df)
-    scores = [it.sentiment_score for it in items if it.sentiment_score is not None]
-    avg = (sum(scores) / len(scores)) if scores else None
+
+@st.fragment
+@traced_fragment
+def sentiment_summary(items: NewsCollection) -> None:
+    scores = items.scores[~np.isnan(items.scores)]
+    avg = float(scores.mean()) if len(scores) else None
 
     top_left, top_right = st.columns([0.55, 0.45], vertical_alignment="center")
     with top_left:
@@ -29,5 +33,33 @@ else:
     with top_right:
         st.caption(f"Articles scored: {len(scores)} / {len(items)}")
 
-    spec = NewsFeedSpec(max_items=50, show_summaries=True)
+
+@st.fragment
+@traced_fragment
+def sentiment_feed(items: NewsCollection) -> None:
+    spec = NewsFeedSpec(max_items=50, show_summaries=True, page_size=10)
     render_news_feed(items, spec=spec, key="sentiment_news", columns=2)
+
+
+bounds = date_bounds(DatasetName.FACT_NEWS_RAW, config=cfg)
+since = None
+if bounds is not None:
+    since = st.date_input(
+        "Published since",
+        value=bounds[0],
+        min_value=bounds[0],
+        max_value=bounds[1],
+        help="Only articles published on or after this day are scored and listed.",
+    )
+    # the earliest day is the whole dataset: share the unfiltered cache entry
+    if since == bounds[0]:
+        since = None
+
+items = load_news_items(cfg, since=since)
+if items is None:
+    st.warning(
+        "No local news dataset found yet. Click **Refresh data** on Overview, or ensure `DATA_DIR` is configured."
+    )
+else:
+    sentiment_summary(items)
+    sentiment_feed(items)
@@ -1,16 +1,33 @@
 from datetime import date as Date
+from pathlib import Path
 
 import streamlit as st
-from finance_daily.state import get_app_config, get_app_ctx
+from finance_daily.state import get_app_config
+from finance_daily.shared_types import ETLTickers
 from finance_daily.utils import load_tickers
+from finance_daily.generation import series_id
+from finance_daily.components.debug_panel import traced_fragment
+from finance_daily.returns_engine import (
+    correlation_block,
+    load_group_indices,
+    rolling_benchmark_correlation,
+)
+from finance_daily.components.correlation_heatmap import (
+    CorrelationSpec,
+    build_beta_figure,
+    build_correlation_heatmap,
+    build_rolling_correlation_figure,
+)
 from finance_daily.components.ticker_series_chart import (
     TickerSeriesSpec,
     get_all_tickers_common_range,
     build_all_tickers_normalized_figure,
+    build_group_index_figure,
     build_single_ticker_figure,
+    default_all_tickers_figure,
+    default_single_ticker_figure,
 )
 
-ctx = get_app_ctx()
 cfg = get_app_config()
 
 st.title("Details")
@@ -18,23 +35,19 @@ st.caption(
     "Explore close prices by ticker, or compare all tickers normalized from a start date."
 )
 
-tickers = load_tickers(cfg)
-symbols = tickers.to_symbols()
-
-left, right = st.columns([0.62, 0.38], vertical_alignment="bottom")
-with left:
-    mode = st.selectbox(
-        "Ticker",
-        options=["All tickers"] + symbols,
-        index=0,
-        help="Choose All tickers for a normalized comparison, or pick one ticker for absolute prices.",
-    )
-
 spec = TickerSeriesSpec()
+corr_spec = CorrelationSpec()
 
-if mode == "All tickers":
+ALL_TICKERS = "All tickers"
+GROUP_INDICES = "Group indices"
+CORRELATION_WINDOWS = {"1M": 21, "3M": 63, "6M": 126, "1Y": 252, "All": None}
+ROLLING_WINDOW = 63
+DEFAULT_BENCHMARK = "SPY"
+
+
+def _all_tickers_chart(data_dir: Path, symbols: list[str], right) -> None:
     common_range, missing = get_all_tickers_common_range(
-        data_dir=cfg.data_dir, symbols=symbols
+        data_dir=data_dir, symbols=symbols
     )
 
     if common_range is None:
@@ -42,7 +55,7 @@ if mode == "All tickers":
             "No common date range found across tickers (or missing local files)."
         )
         fig, _, _ = build_all_tickers_normalized_figure(
-            data_dir=cfg.data_dir, symbols=symbols, start=Date.today(), spec=spec
+            data_dir=data_dir, symbols=symbols, start=Date.today(), spec=spec
         )
     else:
         min_d, max_d = common_range
@@ -56,18 +69,25 @@ if mode == "All tickers":
                 key="all_start_date",
             )
 
-        fig, _, missing = build_all_tickers_normalized_figure(
-            data_dir=cfg.data_dir, symbols=symbols, start=start_date, spec=spec
-        )
+        if start_date == min_d:
+            # the default view, built once per worker
+            fig, _, missing = default_all_tickers_figure(
+                data_dir=data_dir, symbols=symbols, spec=spec
+            )
+        else:
+            fig, _, missing = build_all_tickers_normalized_figure(
+                data_dir=data_dir, symbols=symbols, start=start_date, spec=spec
+            )
 
     if missing:
         st.info(f"Missing local price files for: {', '.join(missing)}")
 
     st.plotly_chart(fig, width="content")
-else:
-    symbol = mode
-    fig, date_range = build_single_ticker_figure(
-        data_dir=cfg.data_dir, symbol=symbol, start=None, spec=spec
+
+
+def _single_ticker_chart(data_dir: Path, symbol: str, right) -> None:
+    fig, date_range = default_single_ticker_figure(
+        data_dir=data_dir, symbol=symbol, spec=spec
     )
 
     if date_range is None:
@@ -85,7 +105,130 @@ else:
                 key="single_start_date",
             )
 
-        fig, _ = build_single_ticker_figure(
-            data_dir=cfg.data_dir, symbol=symbol, start=start_date, spec=spec
-        )
+        if start_date != min_d:
+            fig, _ = build_single_ticker_figure(
+                data_dir=data_dir, symbol=symbol, start=start_date, spec=spec
+            )
         st.plotly_chart(fig, width="content")
+
+
+def _group_index_chart(data_dir: Path, tickers: ETLTickers, right) -> None:
+    levels = load_group_indices(data_dir, tickers)
+    valid = levels.dropna(how="all")
+    if valid.empty:
+        st.warning("No local price data for any group. Try refreshing datasets.")
+        return
+
+    min_d, max_d = valid.index.min().date(), valid.index.max().date()
+    with right:
+        start_date = st.date_input(
+            "Start date (rebased)",
+            value=min_d,
+            min_value=min_d,
+            max_value=max_d,
+            help="Every index is rebased to 100 on this date.",
+            key="group_start_date",
+        )
+    st.plotly_chart(
+        build_group_index_figure(valid, start=start_date, spec=spec), width="content"
+    )
+
+
+# Ticker and date widgets live inside the fragment, so changing them reruns only
+# the chart below instead of the whole page (tickers are read once per page run).
+@st.fragment
+@traced_fragment
+def series_explorer(data_dir: Path, tickers: ETLTickers) -> None:
+    symbols = tickers.to_symbols()
+    left, right = st.columns([0.62, 0.38], vertical_alignment="bottom")
+    with left:
+        mode = st.selectbox(
+            "Ticker",
+            options=[ALL_TICKERS, GROUP_INDICES] + symbols,
+            index=0,
+            help="Choose All tickers for a normalized comparison, Group indices for the group aggregates, or pick one ticker for absolute prices.",
+        )
+
+    if mode == ALL_TICKERS:
+        _all_tickers_chart(data_dir, symbols, right)
+    elif mode == GROUP_INDICES:
+        _group_index_chart(data_dir, tickers, right)
+    else:
+        _single_ticker_chart(data_dir, mode, right)
+
+
+@st.fragment
+@traced_fragment
+def correlation_explorer(data_dir: Path, tickers: ETLTickers) -> None:
+    st.subheader("Correlations")
+    all_symbols = tickers.to_symbols()
+    group_col, window_col, bench_col = st.columns(3)
+    with group_col:
+        group = st.selectbox("Group", options=[ALL_TICKERS] + tickers.group_names())
+    with window_col:
+        window_label = st.selectbox(
+            "Window", options=list(CORRELATION_WINDOWS), index=3
+        )
+    with bench_col:
+        benchmark = st.selectbox(
+            "Benchmark",
+            options=all_symbols,
+            index=(
+                all_symbols.index(DEFAULT_BENCHMARK)
+                if DEFAULT_BENCHMARK in all_symbols
+                else 0
+            ),
+        )
+
+    symbols = tuple(
+        all_symbols if group == ALL_TICKERS else tickers.get_group_symbols(group)
+    )
+    # the benchmark joins the group so betas can be taken against it
+    if benchmark not in symbols:
+        symbols += (benchmark,)
+    # groups are slices of one returns matrix over every ticker
+    universe = tuple(all_symbols)
+    generation = series_id(data_dir, universe)
+    block = correlation_block(
+        data_dir=data_dir,
+        universe=universe,
+        symbols=symbols,
+        window=CORRELATION_WINDOWS[window_label],
+        generation=generation,
+    )
+    st.plotly_chart(
+        build_correlation_heatmap(
+            block,
+            title=f"Daily return correlation — {group}, {window_label}",
+            spec=corr_spec,
+        ),
+        width="content",
+    )
+
+    beta_col, rolling_col = st.columns(2)
+    with beta_col:
+        st.plotly_chart(
+            build_beta_figure(block.betas(benchmark), benchmark=benchmark, spec=corr_spec),
+            width="content",
+        )
+    with rolling_col:
+        rolling = rolling_benchmark_correlation(
+            data_dir=data_dir,
+            universe=universe,
+            symbols=symbols,
+            benchmark=benchmark,
+            window=ROLLING_WINDOW,
+            generation=generation,
+        )
+        st.plotly_chart(
+            build_rolling_correlation_figure(
+                rolling, benchmark=benchmark, window=ROLLING_WINDOW, spec=corr_spec
+            ),
+            width="content",
+        )
+
+
+tickers = load_tickers(cfg)
+series_explorer(cfg.data_dir, tickers)
+st.markdown("---")
+correlation_explorer(cfg.data_dir, tickers)
@@ -0,0 +1,112 @@
+"""Aligned close-price matrix for all configured tickers."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+
+import numpy as np
+import pandas as pd
+
+from finance_daily.constants import DAILY_RAW_T, DailyRawFields
+
+
+@dataclass(frozen=True)
+class PricePanel:
+    """Close prices on the union of trading dates.
+
+    `close[i, j]` is the close of `symbols[j]` on `dates[i]`, NaN where that
+    ticker has no row. Arrays may be read-only memory maps shared between
+    processes, so never write into them.
+    """
+
+    dates: np.ndarray  # datetime64[ns], ascending
+    symbols: tuple[str, ...]
+    close: np.ndarray  # float64, shape (len(dates), len(symbols))
+
+    def column_index(self, symbol: str) -> int | None:
+        try:
+            return self.symbols.index(symbol)
+        except ValueError:
+            return None
+
+    def close_frame(self, symbol: str) -> pd.DataFrame | None:
+        """(date, close) rows for one ticker, like `load_close_series` returns."""
+        j = self.column_index(symbol)
+        if j is None:
+            return None
+        col = self.close[:, j]
+        mask = ~np.isnan(col)
+        if not mask.any():
+            return None
+        return pd.DataFrame(
+            {"date": pd.DatetimeIndex(self.dates[mask]), "close": col[mask]}
+        )
+
+    def with_appended(self, appended: dict[str, AppendedRows]) -> PricePanel:
+        """A new panel with rows added to some tickers; `self` is not modified.
+
+        Rows of symbols outside the panel are ignored.
+        """
+        columns = {
+            j: rows
+            for sym, rows in appended.items()
+            if (j := self.column_index(sym)) is not None
+        }
+        new_dates = [rows.dates for rows in columns.values()]
+        dates = np.unique(np.concatenate([self.dates, *new_dates]))
+        close = np.full((len(dates), len(self.symbols)), np.nan)
+        close[np.searchsorted(dates, self.dates), :] = self.close
+        for j, rows in columns.items():
+            close[np.searchsorted(dates, rows.dates), j] = rows.close
+        return PricePanel(dates=dates, symbols=self.symbols, close=close)
+
+
+@dataclass(frozen=True)
+class AppendedRows:
+    """Rows a delta fetch appended to a series file that had `base_size` bytes."""
+
+    base_size: int
+    dates: np.ndarray  # datetime64[ns], ascending
+    close: np.ndarray  # float64
+
+
+def read_close_rows(source: Path | IO[bytes]) -> tuple[np.ndarray, np.ndarray] | None:
+    """(dates, closes) from a raw series CSV, sorted, one row per date."""
+    date_col, close_col = DailyRawFields.DATE.value, DailyRawFields.CLOSE.value
+    df = pd.read_csv(source, usecols=lambda c: c in (date_col, close_col))
+    if df.empty or date_col not in df.columns or close_col not in df.columns:
+        return None
+    dates = pd.to_datetime(df[date_col], errors="coerce")
+    close = pd.to_numeric(df[close_col], errors="coerce")
+    ok = dates.notna() & close.notna()
+    out = (
+        pd.DataFrame({"date": dates[ok], "close": close[ok]})
+        .drop_duplicates("date", keep="last")
+        .sort_values("date")
+    )
+    return out["date"].to_numpy("datetime64[ns]"), out["close"].to_numpy("float64")
+
+
+def build_price_panel(data_dir: Path, symbols: list[str]) -> PricePanel:
+    """Read every ticker's raw CSV once and align closes on the union of dates."""
+    series: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    for sym in symbols:
+        path = data_dir / DAILY_RAW_T.format(symbol=sym)
+        read = read_close_rows(path) if path.exists() else None
+        if read is not None:
+            series[sym] = read
+
+    if series:
+        dates = np.unique(np.concatenate([d for d, _ in series.values()]))
+    else:
+        dates = np.array([], dtype="datetime64[ns]")
+
+    close = np.full((len(dates), len(symbols)), np.nan)
+    for j, sym in enumerate(symbols):
+        if sym in series:
+            d, c = series[sym]
+            close[np.searchsorted(dates, d), j] = c
+
+    return PricePanel(dates=dates, symbols=tuple(symbols), close=close)
@@ -0,0 +1,232 @@
+"""Daily-return correlations, covariances and betas across tickers.
+
+The aligned returns matrix of the whole ticker universe is built once per
+version of its series files, from the price panel; groups and benchmarks are
+column selections of it. A correlation/covariance block for any (symbols,
+window) is then four matrix products over it (BLAS via numpy), using pairwise-complete
+observations so a ticker with a short history does not shrink every other
+pair's sample. Rolling correlations use cumulative sums, O(T * N).
+
+Group index levels (`group_index`) are read from the shared store, where the
+fetch precomputes them, or computed from the same panel when it is stale.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from finance_daily.generation import series_id
+from finance_daily.group_index import (
+    GroupIndexDef,
+    compute_levels,
+    group_index_defs,
+    levels_frame,
+)
+from finance_daily.price_panel import PricePanel, build_price_panel
+from finance_daily.shared_store import shared_group_indices, shared_price_panel
+from finance_daily.shared_types import ETLTickers
+from finance_daily.tracing import record_miss, traced
+
+# fewer overlapping returns than this and a pair's statistics are NaN
+MIN_OBSERVATIONS = 20
+
+
+@dataclass(frozen=True)
+class ReturnsMatrix:
+    """Simple daily returns, `values[t, j]` from close t-1 to close t of
+    `symbols[j]`; NaN when either close is missing."""
+
+    dates: np.ndarray  # datetime64[ns], date of the later close
+    symbols: tuple[str, ...]
+    values: np.ndarray  # float64, shape (len(dates), len(symbols))
+
+    def select(self, symbols: tuple[str, ...], window: int | None) -> ReturnsMatrix:
+        """Columns for `symbols` (in that order), last `window` rows only."""
+        index = {s: j for j, s in enumerate(self.symbols)}
+        cols = [index[s] for s in symbols if s in index]
+        rows = slice(-window, None) if window else slice(None)
+        return ReturnsMatrix(
+            dates=self.dates[rows],
+            symbols=tuple(self.symbols[j] for j in cols),
+            values=self.values[rows][:, cols],
+        )
+
+
+@dataclass(frozen=True)
+class CorrelationBlock:
+    """Pairwise statistics for `symbols`; all arrays are (n, n).
+
+    `var[i, j]` is the variance of `symbols[i]` over the rows where both i and
+    j have a return, so `cov[i, j] / var[j, i]` is the beta of i against j.
+    """
+
+    symbols: tuple[str, ...]
+    corr: np.ndarray
+    cov: np.ndarray
+    var: np.ndarray
+    n_obs: np.ndarray
+
+    def corr_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.corr, index=self.symbols, columns=self.symbols)
+
+    def betas(self, benchmark: str) -> pd.Series:
+        """Beta of every symbol against `benchmark` (1.0 for itself)."""
+        b = self.symbols.index(benchmark)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            beta = self.cov[:, b] / self.var[b, :]
+        return pd.Series(beta, index=self.symbols, name=f"beta vs {benchmark}")
+
+
+def returns_from_panel(panel: PricePanel) -> ReturnsMatrix:
+    close = np.asarray(panel.close, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values = close[1:] / close[:-1] - 1.0
+    values[~np.isfinite(values)] = np.nan
+    return ReturnsMatrix(dates=panel.dates[1:], symbols=panel.symbols, values=values)
+
+
+def pairwise_block(returns: ReturnsMatrix) -> CorrelationBlock:
+    """Pairwise-complete covariance and correlation in four GEMMs."""
+    present = ~np.isnan(returns.values)
+    m = present.astype(np.float64)
+    x = np.where(present, returns.values, 0.0)
+
+    n = m.T @ m  # rows where both i and j have a return
+    sx = x.T @ m  # sum of i's returns over those rows
+    sxx = (x * x).T @ m
+    sxy = x.T @ x
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = (sxy - sx * sx.T / n) / (n - 1)
+        var = (sxx - sx * sx / n) / (n - 1)
+        corr = cov / np.sqrt(var * var.T)
+    too_few = n < MIN_OBSERVATIONS
+    for a in (cov, var, corr):
+        a[too_few] = np.nan
+    return CorrelationBlock(
+        symbols=returns.symbols,
+        corr=np.clip(corr, -1.0, 1.0),
+        cov=cov,
+        var=var,
+        n_obs=n.astype(np.int64),
+    )
+
+
+def rolling_correlation(
+    returns: ReturnsMatrix, benchmark: str, window: int
+) -> pd.DataFrame:
+    """Trailing `window`-day correlation of every symbol with `benchmark`."""
+    b = returns.symbols.index(benchmark)
+    y = returns.values[:, [b]]
+    both = ~np.isnan(returns.values) & ~np.isnan(y)
+    x = np.where(both, returns.values, 0.0)
+    y = np.where(both, y, 0.0)
+
+    def trailing(a: np.ndarray) -> np.ndarray:
+        c = np.cumsum(a, axis=0)
+        c = np.vstack([np.zeros((1, a.shape[1])), c])
+        return c[window:] - c[:-window]
+
+    n = trailing(both.astype(np.float64))
+    sx, sy = trailing(x), trailing(y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = trailing(x * y) - sx * sy / n
+        vx = trailing(x * x) - sx * sx / n
+        vy = trailing(y * y) - sy * sy / n
+        corr = cov / np.sqrt(vx * vy)
+    corr[n < max(MIN_OBSERVATIONS, window // 2)] = np.nan
+    return pd.DataFrame(
+        np.clip(corr, -1.0, 1.0),
+        index=pd.DatetimeIndex(returns.dates[window - 1 :]),
+        columns=returns.symbols,
+    )
+
+
+# --- cached entry points ---
+
+
+def _price_panel(data_dir: Path, symbols: tuple[str, ...]) -> PricePanel:
+    panel = shared_price_panel(data_dir, list(symbols))
+    return panel if panel is not None else build_price_panel(data_dir, list(symbols))
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _returns_matrix(
+    data_dir: Path, universe: tuple[str, ...], generation: str
+) -> ReturnsMatrix:
+    # large and read-only: one shared instance per generation, never copied
+    return returns_from_panel(_price_panel(data_dir, universe)).select(universe, None)
+
+
+def load_returns(data_dir: Path, universe: tuple[str, ...]) -> ReturnsMatrix:
+    """Aligned returns for every symbol of `universe`, rebuilt only when their
+    data changes; take subsets with `ReturnsMatrix.select`."""
+    return _returns_matrix(data_dir, universe, series_id(data_dir, universe))
+
+
+@traced("correlation_block", cached=True)
+@st.cache_data(show_spinner=False)
+def correlation_block(
+    *,
+    data_dir: Path,
+    universe: tuple[str, ...],
+    symbols: tuple[str, ...],
+    window: int | None,
+    generation: str,
+) -> CorrelationBlock:
+    """Statistics of `symbols` (a subset of `universe`) over the last `window`
+    trading days (all history if None).
+
+    `generation` (the universe's `finance_daily.generation.series_id`) only
+    keys the cache.
+    """
+    record_miss("correlation_block")
+    returns = load_returns(data_dir, universe)
+    return pairwise_block(returns.select(symbols, window))
+
+
+@traced("rolling_benchmark_correlation", cached=True)
+@st.cache_data(show_spinner=False)
+def rolling_benchmark_correlation(
+    *,
+    data_dir: Path,
+    universe: tuple[str, ...],
+    symbols: tuple[str, ...],
+    benchmark: str,
+    window: int,
+    generation: str,
+) -> pd.DataFrame:
+    record_miss("rolling_benchmark_correlation")
+    returns = load_returns(data_dir, universe).select(symbols, None)
+    return rolling_correlation(returns, benchmark, window)
+
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def _group_indices(
+    data_dir: Path,
+    defs: tuple[GroupIndexDef, ...],
+    symbols: tuple[str, ...],
+    generation: str,
+) -> pd.DataFrame:
+    # normally precomputed by the fetch into the shared store
+    shared = shared_group_indices(data_dir, list(defs))
+    if shared is not None:
+        return shared
+    panel = _price_panel(data_dir, symbols)
+    return levels_frame(panel.dates, list(defs), compute_levels(panel, list(defs)))
+
+
+def load_group_indices(data_dir: Path, tickers: ETLTickers) -> pd.DataFrame:
+    """Every group index level (one column each) by date."""
+    symbols = tuple(tickers.to_symbols())
+    return _group_indices(
+        data_dir,
+        tuple(group_index_defs(tickers)),
+        symbols,
+        series_id(data_dir, symbols),
+    )
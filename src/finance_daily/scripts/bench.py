@@ -0,0 +1,477 @@
+"""Benchmark suite for the data loaders, transforms and renderers.
+
+Generates a synthetic universe (N tickers x M days, K news articles), times
+each hot path over several rounds and writes the results as JSON so runs from
+different commits can be compared:
+
+    poetry run bench --tickers 50 --days 2500 --news 5000 --output base.json
+    poetry run bench --output new.json --compare base.json
+
+The fetch benchmark downloads from a local `mock_source` server; `--years`
+sizes the series in years instead of `--days`.
+
+`--memory-check-gb` additionally validates and converts a synthetic news file
+of that size in a fresh process and fails if its peak RSS grows by more than
+`--memory-ceiling-mb`:
+
+    poetry run bench --memory-check-gb 2 --memory-ceiling-mb 512
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import platform
+import queue
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+import streamlit as st
+from streamlit.logger import set_log_level
+
+from finance_daily.config import AppConfig
+from finance_daily.constants import DatasetName
+from finance_daily.scripts.mock_source import serve_mock_source
+from finance_daily.scripts.synthetic import (
+    SyntheticScale,
+    generate,
+    write_large_news_csv,
+)
+
+
+@dataclass
+class BenchEnv:
+    config: AppConfig
+    symbols: list[str]
+    source_dir: Path
+    source_url: str
+    news_df: pd.DataFrame
+    snapshot_df: pd.DataFrame
+
+
+@dataclass(frozen=True)
+class Benchmark:
+    name: str
+    run: Callable[[BenchEnv], object]
+    # called before every round, outside the timed region
+    reset: Callable[[BenchEnv], None] | None = None
+
+
+@dataclass
+class BenchResult:
+    rounds: int
+    min_s: float
+    median_s: float
+    mean_s: float
+    stdev_s: float
+    samples_s: list[float] = field(default_factory=list)
+
+
+def _clear_all_caches(_: BenchEnv) -> None:
+    from finance_daily.components.ticker_series_chart import SERIES_CACHE
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    SERIES_CACHE.clear()
+
+
+def _bench_load_close_series(env: BenchEnv) -> None:
+    from finance_daily.components.ticker_series_chart import load_close_series
+
+    for sym in env.symbols:
+        load_close_series(env.config.data_dir, sym)
+
+
+def _bench_load_news_dataset(env: BenchEnv) -> None:
+    from finance_daily.components.news_feed import NEWS_FEED_COLUMNS
+    from finance_daily.utils import load_dataset
+
+    load_dataset(
+        DatasetName.FACT_NEWS_RAW, config=env.config, columns=NEWS_FEED_COLUMNS
+    )
+
+
+def _warm_series_cold_frame(env: BenchEnv) -> None:
+    from finance_daily.components.ticker_series_chart import _normalized_frame
+
+    _normalized_frame.clear()
+    _bench_load_close_series(env)
+
+
+def _bench_normalized_figure(env: BenchEnv) -> None:
+    from finance_daily.components.ticker_series_chart import (
+        build_all_tickers_normalized_figure,
+        get_all_tickers_common_range,
+    )
+
+    common, _ = get_all_tickers_common_range(
+        data_dir=env.config.data_dir, symbols=env.symbols
+    )
+    build_all_tickers_normalized_figure(
+        data_dir=env.config.data_dir,
+        symbols=env.symbols,
+        start=common[0] if common else pd.Timestamp.today().date(),
+    )
+
+
+def _bench_df_to_news_items(env: BenchEnv) -> None:
+    from finance_daily.components.news_feed import df_to_news_items
+
+    df_to_news_items(env.news_df)
+
+
+def _bench_news_collection(env: BenchEnv) -> None:
+    from finance_daily.components.news_feed import NewsCollection
+
+    NewsCollection.from_frame(env.news_df)
+
+
+def _bench_render_snapshot_table(env: BenchEnv) -> None:
+    from finance_daily.components.snapshot_table import (
+        SnapshotTableSpec,
+        render_snapshot_table,
+    )
+
+    render_snapshot_table(
+        env.snapshot_df, spec=SnapshotTableSpec(max_rows=len(env.snapshot_df))
+    )
+
+
+# snapshot frame id -> its view, built on the first round
+_SNAPSHOT_VIEWS: dict[int, object] = {}
+
+
+def _bench_snapshot_view(env: BenchEnv) -> None:
+    from finance_daily.components.snapshot_table import SnapshotView
+
+    SnapshotView.from_frame(env.snapshot_df)
+
+
+def _bench_render_snapshot_sorted(env: BenchEnv) -> None:
+    # every sort a user can pick, from a view built once (as the overview does)
+    from finance_daily.components.snapshot_table import (
+        SORTABLE_FIELDS,
+        SnapshotTableSpec,
+        SnapshotView,
+        render_snapshot_table,
+    )
+
+    view = _SNAPSHOT_VIEWS.get(id(env.snapshot_df))
+    if view is None:
+        view = _SNAPSHOT_VIEWS[id(env.snapshot_df)] = SnapshotView.from_frame(
+            env.snapshot_df
+        )
+    for field_name in SORTABLE_FIELDS:
+        for ascending in (True, False):
+            render_snapshot_table(
+                view,
+                spec=SnapshotTableSpec(
+                    max_rows=50, sort_by=field_name, ascending=ascending
+                ),
+            )
+
+
+def _bench_render_news_feed(env: BenchEnv) -> None:
+    from finance_daily.components.news_feed import (
+        NewsFeedSpec,
+        df_to_news_items,
+        render_news_feed,
+    )
+
+    items = df_to_news_items(env.news_df.head(50))
+    render_news_feed(items, spec=NewsFeedSpec(max_items=50), columns=2)
+
+
+def _bench_fetch_and_store(env: BenchEnv) -> None:
+    from finance_daily.services.nightly_fetch import fetch_and_store
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = AppConfig(
+            data_dir=Path(tmp),
+            config_dir=env.config.config_dir,
+            data_src=env.source_url,
+        )
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fetch_and_store(config)
+        if not result.ok:
+            raise RuntimeError(f"fetch_and_store failed: {result.errors[:3]}")
+
+
+BENCHMARKS: list[Benchmark] = [
+    Benchmark("load_close_series", _bench_load_close_series, _clear_all_caches),
+    Benchmark("load_dataset_news", _bench_load_news_dataset, _clear_all_caches),
+    Benchmark(
+        "build_all_tickers_normalized_figure",
+        _bench_normalized_figure,
+        _warm_series_cold_frame,
+    ),
+    Benchmark("df_to_news_items", _bench_df_to_news_items),
+    Benchmark("news_collection", _bench_news_collection),
+    Benchmark("render_snapshot_table", _bench_render_snapshot_table),
+    Benchmark("snapshot_view", _bench_snapshot_view),
+    Benchmark("render_snapshot_sorted", _bench_render_snapshot_sorted),
+    Benchmark("render_news_feed", _bench_render_news_feed),
+    Benchmark("fetch_and_store", _bench_fetch_and_store),
+]
+
+
+def time_benchmark(bench: Benchmark, env: BenchEnv, rounds: int) -> BenchResult:
+    # one untimed round for imports and lazily built state
+    if bench.reset:
+        bench.reset(env)
+    bench.run(env)
+
+    samples = []
+    for _ in range(rounds):
+        if bench.reset:
+            bench.reset(env)
+        t0 = time.perf_counter()
+        bench.run(env)
+        samples.append(time.perf_counter() - t0)
+
+    return BenchResult(
+        rounds=rounds,
+        min_s=min(samples),
+        median_s=statistics.median(samples),
+        mean_s=statistics.fmean(samples),
+        stdev_s=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        samples_s=samples,
+    )
+
+
+def _validate_and_convert(src: str, target: str, out: multiprocessing.Queue) -> None:
+    # runs in a fresh process, so ru_maxrss covers only this work
+    import resource
+
+    import pyarrow  # noqa: F401  (imported before the baseline is taken)
+
+    from finance_daily.csv_stream import csv_to_arrow, validate_csv
+
+    base_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    summary = validate_csv(Path(src))
+    csv_to_arrow(Path(src), Path(target), summary=summary)
+    elapsed = time.perf_counter() - t0
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    out.put((summary.rows, base_kib, peak_kib, elapsed))
+
+
+def _worker_result(
+    proc: multiprocessing.process.BaseProcess,
+    out: multiprocessing.Queue,
+    timeout_s: float,
+):
+    """`proc`'s result from `out`; raises if it dies first or runs too long."""
+    deadline = time.monotonic() + timeout_s
+    while True:
+        try:
+            return out.get(timeout=1.0)
+        except queue.Empty:
+            pass
+        if not proc.is_alive() and out.empty():
+            raise RuntimeError(f"worker exited with code {proc.exitcode}, no result")
+        if time.monotonic() > deadline:
+            proc.terminate()
+            raise RuntimeError(f"worker gave no result within {timeout_s:.0f}s")
+
+
+def memory_check(
+    file_gb: float, ceiling_mb: float, *, seed: int = 0, timeout_s: float = 3600.0
+) -> dict:
+    """Peak RSS growth while validating and converting a `file_gb` news CSV."""
+    import numpy as np
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = Path(tmp) / DatasetName.FACT_NEWS_RAW.value
+        write_large_news_csv(
+            src, int(file_gb * 1e9), rng=np.random.default_rng(seed)
+        )
+        ctx = multiprocessing.get_context("spawn")
+        out = ctx.Queue()
+        proc = ctx.Process(
+            target=_validate_and_convert, args=(str(src), str(src) + ".arrow", out)
+        )
+        proc.start()
+        try:
+            rows, base_kib, peak_kib, elapsed = _worker_result(proc, out, timeout_s)
+        finally:
+            proc.join()
+        if proc.exitcode != 0:
+            raise RuntimeError(f"worker exited with code {proc.exitcode}")
+        file_bytes = src.stat().st_size
+
+    growth_mb = (peak_kib - base_kib) / 1024  # ru_maxrss is KiB on Linux
+    return {
+        "file_bytes": file_bytes,
+        "rows": rows,
+        "seconds": elapsed,
+        "baseline_rss_mb": base_kib / 1024,
+        "peak_rss_mb": peak_kib / 1024,
+        "growth_mb": growth_mb,
+        "ceiling_mb": ceiling_mb,
+        "ok": growth_mb <= ceiling_mb,
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def run_suite(
+    scale: SyntheticScale, *, rounds: int, only: list[str] | None = None
+) -> dict:
+    benches = [b for b in BENCHMARKS if not only or b.name in only]
+    results: dict[str, dict] = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir, config_dir = Path(tmp) / "data", Path(tmp) / "config"
+        symbols = generate(data_dir, config_dir, scale)
+
+        with serve_mock_source(data_dir) as url:
+            env = BenchEnv(
+                config=AppConfig(data_dir=data_dir, config_dir=config_dir),
+                symbols=symbols,
+                source_dir=data_dir,
+                source_url=url,
+                news_df=pd.read_csv(data_dir / DatasetName.FACT_NEWS_RAW.value),
+                snapshot_df=pd.read_csv(data_dir / DatasetName.FACT_LATEST.value),
+            )
+            for bench in benches:
+                print(f"running {bench.name} ...", file=sys.stderr)
+                results[bench.name] = asdict(time_benchmark(bench, env, rounds))
+
+    return {
+        "meta": {
+            "timestamp": time.time(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pandas": pd.__version__,
+            "scale": asdict(scale),
+            "rounds": rounds,
+        },
+        "benchmarks": results,
+    }
+
+
+def compare(current: dict, baseline: dict, *, threshold: float) -> list[str]:
+    """Print median deltas against `baseline`; returns names that regressed."""
+    regressed = []
+    print(f"{'benchmark':<40}{'base ms':>10}{'new ms':>10}{'delta':>9}")
+    for name, cur in current["benchmarks"].items():
+        base = baseline.get("benchmarks", {}).get(name)
+        if base is None:
+            print(f"{name:<40}{'—':>10}{cur['median_s'] * 1e3:>10.2f}{'new':>9}")
+            continue
+        delta = cur["median_s"] / base["median_s"] - 1.0 if base["median_s"] else 0.0
+        flag = "  REGRESSION" if delta > threshold else ""
+        if flag:
+            regressed.append(name)
+        print(
+            f"{name:<40}{base['median_s'] * 1e3:>10.2f}"
+            f"{cur['median_s'] * 1e3:>10.2f}{delta:>+9.1%}{flag}"
+        )
+    return regressed
+
+
+def _print_results(report: dict) -> None:
+    print(f"{'benchmark':<40}{'median ms':>12}{'min ms':>10}{'stdev ms':>10}")
+    for name, r in report["benchmarks"].items():
+        print(
+            f"{name:<40}{r['median_s'] * 1e3:>12.2f}"
+            f"{r['min_s'] * 1e3:>10.2f}{r['stdev_s'] * 1e3:>10.2f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=SyntheticScale.n_tickers)
+    parser.add_argument("--days", type=int, default=SyntheticScale.n_days)
+    parser.add_argument("--years", type=float, help="overrides --days")
+    parser.add_argument("--news", type=int, default=SyntheticScale.n_news)
+    parser.add_argument("--seed", type=int, default=SyntheticScale.seed)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument(
+        "--only", nargs="*", choices=[b.name for b in BENCHMARKS], default=None
+    )
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to diff against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative median slowdown counted as a regression (default 0.2)",
+    )
+    parser.add_argument(
+        "--strict", action="store_true", help="exit non-zero on regressions"
+    )
+    parser.add_argument(
+        "--memory-check-gb",
+        type=float,
+        help="also convert a synthetic news CSV of this size and check peak RSS",
+    )
+    parser.add_argument(
+        "--memory-ceiling-mb",
+        type=float,
+        default=512.0,
+        help="allowed RSS growth for --memory-check-gb (default 512)",
+    )
+    args = parser.parse_args(argv)
+
+    set_log_level("error")
+    scale = SyntheticScale(
+        n_tickers=args.tickers, n_days=args.days, n_news=args.news, seed=args.seed
+    )
+    if args.years:
+        scale = SyntheticScale.from_years(
+            args.years, n_tickers=args.tickers, n_news=args.news, seed=args.seed
+        )
+    report = run_suite(scale, rounds=args.rounds, only=args.only)
+    if args.memory_check_gb:
+        check = memory_check(
+            args.memory_check_gb, args.memory_ceiling_mb, seed=args.seed
+        )
+        report["memory_check"] = check
+        print(
+            f"memory check: {check['file_bytes'] / 1e9:.2f} GB, {check['rows']} rows "
+            f"in {check['seconds']:.1f}s, RSS +{check['growth_mb']:.0f} MB "
+            f"(ceiling {check['ceiling_mb']:.0f} MB) "
+            f"{'ok' if check['ok'] else 'EXCEEDED'}",
+            file=sys.stderr,
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+
+    exceeded = not report.get("memory_check", {}).get("ok", True)
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        regressed = compare(report, baseline, threshold=args.threshold)
+        return 1 if exceeded or (args.strict and regressed) else 0
+
+    _print_results(report)
+    return 1 if exceeded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,388 @@
+"""Concurrent-session load test for the Streamlit app.
+
+Mirrors `prod_server`: every worker is a separate process (own interpreter,
+GIL and caches) and every simulated session is a thread in it driving the
+full multipage app through Streamlit's AppTest. A session opens the app,
+then performs random user actions with a think time between them:
+
+* `switch_page` to another page,
+* `pick_ticker` in the Details page's Ticker box,
+* `move_start_date` of the Details chart.
+
+Each action is one rerun; one that raises counts as a failed rerun. The
+report has p50/p95/p99 rerun latency per action and overall, reruns per
+second, and per worker the RSS before the sessions started and at its peak:
+
+    DATA_DIR=... CONFIG_DIR=... poetry run load_test --workers 2 --sessions 8
+
+`--tickers N` runs against a synthetic universe of N tickers instead of
+DATA_DIR. `--max-p95-ms` exits non-zero when the overall p95 is above it;
+the run is abandoned after `--timeout-s`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from finance_daily.constants import (
+    FUNDAMENTALS_SCT,
+    OVERVIEW_SCT,
+    SENTIMENT_SCT,
+    SERIES_SCT,
+)
+
+APP_SCRIPT = Path(__file__).resolve().parent.parent / "app.py"
+PAGES = {
+    "overview": OVERVIEW_SCT,
+    "series": SERIES_SCT,
+    "sentiment": SENTIMENT_SCT,
+    "fundamentals": FUNDAMENTALS_SCT,
+}
+# relative weights of the simulated user actions
+ACTIONS = {"switch_page": 4, "pick_ticker": 3, "move_start_date": 3}
+PERCENTILES = (50, 95, 99)
+# how long the sessions of a worker wait for each other before starting anyway
+START_TIMEOUT_S = 300.0
+
+
+@dataclass(frozen=True)
+class LoadSpec:
+    workers: int = 1
+    sessions: int = 4  # per worker
+    actions: int = 20  # per session, after opening the app
+    think_s: float = 0.5  # mean pause between actions
+    seed: int = 0
+    timeout_s: float = 3600.0  # for the whole run
+
+
+@dataclass(frozen=True)
+class Sample:
+    action: str
+    seconds: float
+    ok: bool
+
+
+class Session:
+    """One simulated browser session."""
+
+    def __init__(self, rng: random.Random) -> None:
+        from streamlit.testing.v1 import AppTest
+
+        self.rng = rng
+        self.at = AppTest.from_file(str(APP_SCRIPT), default_timeout=120)
+        self.page = "overview"
+
+    def _rerun(self, action: str) -> Sample:
+        t0 = time.perf_counter()
+        self.at.run()
+        return Sample(action, time.perf_counter() - t0, not self.at.exception)
+
+    def open(self) -> Sample:
+        return self._rerun("open")
+
+    def _switch_to(self, page: str) -> Sample:
+        self.at.switch_page(str(PAGES[page]))
+        self.page = page
+        return self._rerun("switch_page")
+
+    def next_action(self) -> str:
+        return self.rng.choices(list(ACTIONS), weights=list(ACTIONS.values()))[0]
+
+    def step(self, action: str) -> Sample:
+        if action == "switch_page":
+            return self._switch_to(
+                self.rng.choice([p for p in PAGES if p != self.page])
+            )
+        if self.page != "series":
+            # the user navigates to the page first
+            return self._switch_to("series")
+        if action == "pick_ticker":
+            box = next(s for s in self.at.selectbox if s.label == "Ticker")
+            box.set_value(self.rng.choice(box.options))
+            return self._rerun(action)
+        if not self.at.date_input:
+            return self._rerun(action)
+        widget = self.at.date_input[0]
+        span = (widget.max - widget.min).days
+        widget.set_value(widget.min + timedelta(days=self.rng.randint(0, span)))
+        return self._rerun(action)
+
+
+def _rss_mb() -> float:
+    """Current resident set size (Linux), falling back to the peak."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _share_test_runtime() -> None:
+    """Keep AppTest's mock Runtime visible between runs.
+
+    AppTest installs a mock `Runtime` singleton for the length of each run and
+    unsets it afterwards, which is fine for one session per process. Here a
+    session finishing would pull the runtime from under every other session
+    still running, so the last one installed stays visible instead.
+    """
+    from streamlit.runtime import Runtime
+
+    installed: list[Runtime] = []
+
+    def instance(cls) -> Runtime:
+        if cls._instance is not None:
+            installed[:] = [cls._instance]
+            return cls._instance
+        if installed:
+            return installed[0]
+        raise RuntimeError("Runtime hasn't been created!")
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(
+        lambda cls: cls._instance is not None or bool(installed)
+    )
+
+
+def _attempt(action: str, perform: Callable[[], Sample]) -> Sample:
+    """`perform()`, or a failed sample for `action` if it raises."""
+    t0 = time.perf_counter()
+    try:
+        return perform()
+    except Exception:
+        return Sample(action, time.perf_counter() - t0, False)
+
+
+def _worker(index: int, spec: LoadSpec, out: multiprocessing.Queue) -> None:
+    from streamlit.logger import set_log_level
+
+    set_log_level("error")
+    _share_test_runtime()
+    # imported before the baseline, so it covers only the sessions' data
+    import streamlit.testing.v1  # noqa: F401
+
+    base_mb = _rss_mb()
+    samples: list[Sample] = []
+    lock = threading.Lock()
+    start = threading.Barrier(spec.sessions, timeout=START_TIMEOUT_S)
+
+    def run_session(i: int) -> None:
+        rng = random.Random(spec.seed * 1_000_003 + index * 1_000 + i)
+        done: list[Sample] = []
+        try:
+            try:
+                session = Session(rng)
+            except Exception:
+                # the other sessions start without this one
+                start.abort()
+                done.append(Sample("open", 0.0, False))
+                return
+            try:
+                start.wait()
+            except threading.BrokenBarrierError:
+                pass
+            done.append(_attempt("open", session.open))
+            for _ in range(spec.actions):
+                time.sleep(rng.expovariate(1 / spec.think_s) if spec.think_s else 0)
+                action = session.next_action()
+                done.append(_attempt(action, partial(session.step, action)))
+        finally:
+            with lock:
+                samples.extend(done)
+
+    threads = [
+        threading.Thread(target=run_session, args=(i,), daemon=True)
+        for i in range(spec.sessions)
+    ]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    out.put(
+        {
+            "worker": index,
+            "wall_s": time.perf_counter() - t0,
+            "samples": [asdict(s) for s in samples],
+            "base_rss_mb": base_mb,
+            "end_rss_mb": _rss_mb(),
+            "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        }
+    )
+
+
+def _latency_stats(seconds: list[float]) -> dict:
+    ms = np.asarray(seconds) * 1e3
+    stats = {"count": len(ms)}
+    if len(ms):
+        for p, v in zip(PERCENTILES, np.percentile(ms, PERCENTILES)):
+            stats[f"p{p}_ms"] = float(v)
+        stats["max_ms"] = float(ms.max())
+    return stats
+
+
+def _collect(
+    procs: list[multiprocessing.process.BaseProcess],
+    out: multiprocessing.Queue,
+    timeout_s: float,
+) -> list[dict]:
+    """One result per worker from `out`; raises if a worker dies without one
+    or they run past `timeout_s`."""
+    deadline = time.monotonic() + timeout_s
+    results: list[dict] = []
+    while len(results) < len(procs):
+        try:
+            results.append(out.get(timeout=1.0))
+            continue
+        except queue.Empty:
+            pass
+        reported = {r["worker"] for r in results}
+        for i, p in enumerate(procs):
+            if i not in reported and not p.is_alive() and out.empty():
+                raise RuntimeError(f"worker {i} exited with code {p.exitcode}")
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"workers gave no result within {timeout_s:.0f}s")
+    return results
+
+
+def run_load(spec: LoadSpec, env: dict[str, str] | None = None) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    saved = dict(os.environ)
+    # spawned workers read DATA_DIR / CONFIG_DIR from the inherited environment
+    os.environ.update(env or {})
+    procs = [
+        ctx.Process(target=_worker, args=(i, spec, out)) for i in range(spec.workers)
+    ]
+    try:
+        for p in procs:
+            p.start()
+        workers = _collect(procs, out, spec.timeout_s)
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+        for p in procs:
+            if p.is_alive():
+                p.join(timeout=5.0)
+            if p.is_alive():
+                p.terminate()
+                p.join()
+
+    samples = [Sample(**s) for w in workers for s in w.pop("samples")]
+    by_action: dict[str, list[float]] = {}
+    for s in samples:
+        by_action.setdefault(s.action, []).append(s.seconds)
+    wall = max(w["wall_s"] for w in workers)
+    return {
+        "meta": {"timestamp": time.time(), "spec": asdict(spec)},
+        "reruns": len(samples),
+        "errors": sum(not s.ok for s in samples),
+        "wall_s": wall,
+        "throughput_rps": len(samples) / wall if wall else 0.0,
+        "latency": _latency_stats([s.seconds for s in samples]),
+        "by_action": {a: _latency_stats(v) for a, v in sorted(by_action.items())},
+        "workers": sorted(workers, key=lambda w: w["worker"]),
+    }
+
+
+def _print_report(report: dict) -> None:
+    spec = report["meta"]["spec"]
+    print(
+        f"{spec['workers']} worker(s) x {spec['sessions']} sessions, "
+        f"{report['reruns']} reruns in {report['wall_s']:.1f}s "
+        f"({report['throughput_rps']:.1f}/s), {report['errors']} with errors"
+    )
+    print(f"{'action':<18}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = [*report["by_action"].items(), ("all", report["latency"])]
+    for action, r in rows:
+        if not r["count"]:
+            continue
+        print(
+            f"{action:<18}{r['count']:>7}{r['p50_ms']:>10.1f}"
+            f"{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+        )
+    print(f"{'worker':<8}{'base MB':>10}{'end MB':>10}{'peak MB':>10}")
+    for w in report["workers"]:
+        print(
+            f"{w['worker']:<8}{w['base_rss_mb']:>10.0f}{w['end_rss_mb']:>10.0f}"
+            f"{w['peak_rss_mb']:>10.0f}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=LoadSpec.workers)
+    parser.add_argument(
+        "--sessions", type=int, default=LoadSpec.sessions, help="per worker"
+    )
+    parser.add_argument(
+        "--actions", type=int, default=LoadSpec.actions, help="per session"
+    )
+    parser.add_argument("--think-ms", type=float, default=LoadSpec.think_s * 1e3)
+    parser.add_argument("--seed", type=int, default=LoadSpec.seed)
+    parser.add_argument(
+        "--timeout-s", type=float, default=LoadSpec.timeout_s, help="for the whole run"
+    )
+    parser.add_argument("--tickers", type=int, help="use a synthetic universe")
+    parser.add_argument("--years", type=float, default=4.0)
+    parser.add_argument("--news", type=int, default=2000)
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    parser.add_argument(
+        "--max-p95-ms", type=float, help="exit non-zero when the overall p95 is above"
+    )
+    args = parser.parse_args(argv)
+
+    spec = LoadSpec(
+        workers=args.workers,
+        sessions=args.sessions,
+        actions=args.actions,
+        think_s=args.think_ms / 1e3,
+        seed=args.seed,
+        timeout_s=args.timeout_s,
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {}
+        if args.tickers:
+            from finance_daily.scripts.synthetic import SyntheticScale, generate
+
+            data_dir, config_dir = Path(tmp) / "data", Path(tmp) / "config"
+            generate(
+                data_dir,
+                config_dir,
+                SyntheticScale.from_years(
+                    args.years, n_tickers=args.tickers, n_news=args.news, seed=args.seed
+                ),
+            )
+            env = {"DATA_DIR": str(data_dir), "CONFIG_DIR": str(config_dir)}
+        report = run_load(spec, env)
+
+    _print_report(report)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(report, indent=2))
+    p95 = report["latency"].get("p95_ms", 0.0)
+    if args.max_p95_ms is not None and p95 > args.max_p95_ms:
+        print(f"p95 {p95:.0f} ms is above {args.max_p95_ms:.0f} ms", file=sys.stderr)
+        return 1
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
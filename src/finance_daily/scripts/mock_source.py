@@ -0,0 +1,242 @@
+"""Local stand-in for the ETL's static file host, for offline load tests.
+
+Serves a directory of dataset CSVs the way the production host does (GET
+with byte ranges, ETag / Last-Modified and conditional requests), with
+optional per-request latency, a bandwidth cap per response and injected
+failures:
+
+    poetry run mock_source --generate --tickers 700 --years 10 --news 50000 \\
+        --dir /tmp/etl --config-dir /tmp/etl-config --latency-ms 80 --error-rate 0.02
+
+then point the fetcher or the app at it:
+
+    DATA_SRC=http://127.0.0.1:8700/ DATA_DIR=/tmp/data CONFIG_DIR=/tmp/etl-config \\
+        poetry run nightly_fetch
+
+`--generate` writes a synthetic universe first (`finance_daily.scripts.synthetic`).
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import email.utils
+import os
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+from finance_daily.scripts.synthetic import SyntheticScale, generate
+
+DEFAULT_PORT = 8700
+_CHUNK_BYTES = 16 * 1024
+
+
+@dataclass(frozen=True)
+class MockSourceSpec:
+    latency_s: float = 0.0  # before every response
+    latency_jitter_s: float = 0.0  # uniform extra latency on top
+    bandwidth_bps: float | None = None  # per response; None is unlimited
+    error_rate: float = 0.0  # share of requests answered with `error_status`
+    error_status: int = 503
+    truncate_rate: float = 0.0  # share of bodies cut off halfway
+    seed: int | None = None
+
+
+class MockSourceHandler(SimpleHTTPRequestHandler):
+    spec: MockSourceSpec = MockSourceSpec()
+    rng: random.Random = random.Random()
+
+    def log_message(self, *_):
+        pass
+
+    def _etag(self, st: os.stat_result) -> str:
+        return f'"{st.st_mtime_ns:x}-{st.st_size:x}"'
+
+    def do_HEAD(self) -> None:
+        self._respond(head=True)
+
+    def do_GET(self) -> None:
+        self._respond(head=False)
+
+    def _respond(self, *, head: bool) -> None:
+        spec = self.spec
+        delay = spec.latency_s + self.rng.uniform(0.0, spec.latency_jitter_s)
+        if delay:
+            time.sleep(delay)
+        if spec.error_rate and self.rng.random() < spec.error_rate:
+            self.send_error(spec.error_status, "injected failure")
+            return
+
+        path = Path(self.translate_path(self.path))
+        if not path.is_file():
+            self.send_error(404, "File not found")
+            return
+        st = path.stat()
+        etag = self._etag(st)
+        modified = email.utils.formatdate(st.st_mtime, usegmt=True)
+
+        if self.headers.get("If-None-Match") == etag or (
+            "If-None-Match" not in self.headers
+            and self.headers.get("If-Modified-Since") == modified
+        ):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        start, end = 0, st.st_size - 1
+        status = 200
+        range_header = self.headers.get("Range", "")
+        if range_header.startswith("bytes="):
+            first, _, last = range_header.removeprefix("bytes=").partition("-")
+            if first.isdigit():
+                start = int(first)
+                end = min(int(last), end) if last.isdigit() else end
+                if start > end:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{st.st_size}")
+                    self.end_headers()
+                    return
+                status = 206
+        length = end - start + 1
+
+        self.send_response(status)
+        self.send_header("Content-Type", "text/csv")
+        self.send_header("Content-Length", str(length))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", modified)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{st.st_size}")
+        self.end_headers()
+        if head:
+            return
+
+        if spec.truncate_rate and self.rng.random() < spec.truncate_rate:
+            length //= 2  # the client sees a short read
+            self.close_connection = True
+        with path.open("rb") as f:
+            f.seek(start)
+            self._send_body(f, length)
+
+    def _send_body(self, f, length: int) -> None:
+        rate = self.spec.bandwidth_bps
+        t0 = time.perf_counter()
+        sent = 0
+        while sent < length:
+            chunk = f.read(min(_CHUNK_BYTES, length - sent))
+            if not chunk:
+                break
+            try:
+                self.wfile.write(chunk)
+            except (BrokenPipeError, ConnectionResetError):
+                return
+            sent += len(chunk)
+            if rate:
+                ahead = sent / rate - (time.perf_counter() - t0)
+                if ahead > 0:
+                    time.sleep(ahead)
+
+
+@contextlib.contextmanager
+def serve_mock_source(
+    directory: Path,
+    spec: MockSourceSpec = MockSourceSpec(),
+    *,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> Iterator[str]:
+    """Serve `directory` in a background thread; yields the base URL.
+
+    `port` 0 picks a free ephemeral port.
+    """
+    handler = type(
+        "BoundMockSourceHandler",
+        (MockSourceHandler,),
+        {"spec": spec, "rng": random.Random(spec.seed)},
+    )
+    server = ThreadingHTTPServer(
+        (host, port), partial(handler, directory=str(directory))
+    )
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_address[1]}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", type=Path, required=True, help="directory to serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--latency-jitter-ms", type=float, default=0.0)
+    parser.add_argument(
+        "--bandwidth-kbps", type=float, help="per response, in kilobytes per second"
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+
+    gen = parser.add_argument_group("synthetic data")
+    gen.add_argument(
+        "--generate", action="store_true", help="write a synthetic universe to --dir"
+    )
+    gen.add_argument("--config-dir", type=Path, help="where tickers.yaml goes")
+    gen.add_argument("--tickers", type=int, default=SyntheticScale.n_tickers)
+    gen.add_argument("--years", type=float, default=4.0)
+    gen.add_argument("--news", type=int, default=SyntheticScale.n_news)
+    gen.add_argument("--news-days", type=int, default=SyntheticScale.news_days)
+    gen.add_argument("--groups", type=int, default=SyntheticScale.n_groups)
+    args = parser.parse_args(argv)
+
+    if args.generate:
+        config_dir = args.config_dir or args.dir.with_name(args.dir.name + "-config")
+        scale = SyntheticScale.from_years(
+            args.years,
+            n_tickers=args.tickers,
+            n_news=args.news,
+            n_groups=args.groups,
+            news_days=args.news_days,
+            seed=args.seed,
+        )
+        t0 = time.perf_counter()
+        generate(args.dir, config_dir, scale)
+        print(
+            f"Generated {scale.n_tickers} tickers x {scale.n_days} days, "
+            f"{scale.n_news} news items in {time.perf_counter() - t0:.1f}s; "
+            f"CONFIG_DIR={config_dir}"
+        )
+
+    spec = MockSourceSpec(
+        latency_s=args.latency_ms / 1e3,
+        latency_jitter_s=args.latency_jitter_ms / 1e3,
+        bandwidth_bps=args.bandwidth_kbps * 1e3 if args.bandwidth_kbps else None,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        truncate_rate=args.truncate_rate,
+        seed=args.seed,
+    )
+    with serve_mock_source(args.dir, spec, host=args.host, port=args.port) as url:
+        print(f"Serving {args.dir} at {url} (DATA_SRC={url}), Ctrl+C to stop")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
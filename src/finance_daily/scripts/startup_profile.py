@@ -0,0 +1,172 @@
+"""Cold-start and per-page render timings checked against a budget.
+
+Every measurement runs in a fresh interpreter so module imports are cold:
+
+* import time of the heavy modules the pages pull in, and
+* per page, the first render (imports + dataset loads + render) and a warm
+  rerun of the same session, driven through Streamlit's AppTest.
+
+Run with `poetry run profile_startup` (DATA_DIR / CONFIG_DIR must point at a
+populated data directory). `--strict` exits non-zero when a budget is blown.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from finance_daily.constants import (
+    FUNDAMENTALS_SCT,
+    OVERVIEW_SCT,
+    SENTIMENT_SCT,
+    SERIES_SCT,
+)
+
+# seconds, measured in a fresh interpreter
+IMPORT_BUDGETS: dict[str, float] = {
+    "streamlit": 1.5,
+    "pandas": 1.0,
+    "plotly.express": 1.5,
+    "streamlit_elements": 1.5,
+    "finance_daily.state": 2.5,
+    "finance_daily.components.ticker_series_chart": 2.5,
+    "finance_daily.components.news_feed": 3.0,
+}
+
+# seconds for the first full render of a page in a cold process
+PAGE_BUDGETS: dict[str, float] = {
+    "overview": 4.0,
+    "series": 4.0,
+    "sentiment": 4.0,
+    "fundamentals": 4.0,
+}
+
+PAGE_SCRIPTS = {
+    "overview": OVERVIEW_SCT,
+    "series": SERIES_SCT,
+    "sentiment": SENTIMENT_SCT,
+    "fundamentals": FUNDAMENTALS_SCT,
+}
+
+_IMPORT_SNIPPET = (
+    "import importlib, sys, time; t = time.perf_counter(); "
+    "importlib.import_module(sys.argv[1]); print(time.perf_counter() - t)"
+)
+
+
+def _page_path(page: str) -> Path:
+    return Path(__file__).resolve().parent.parent / PAGE_SCRIPTS[page]
+
+
+def measure_import(module: str) -> float:
+    """Seconds to import `module` in a fresh interpreter."""
+    out = subprocess.run(
+        [sys.executable, "-c", _IMPORT_SNIPPET, module],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def measure_page(page: str) -> dict:
+    """First-render and warm-rerun seconds for `page` in a fresh interpreter."""
+    out = subprocess.run(
+        [sys.executable, "-m", __spec__.name, "--page-child", page],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _page_child(page: str) -> None:
+    from streamlit.testing.v1 import AppTest
+
+    t0 = time.perf_counter()
+    at = AppTest.from_file(str(_page_path(page)), default_timeout=120)
+    at.run()
+    first = time.perf_counter() - t0
+
+    t1 = time.perf_counter()
+    at.run()
+    rerun = time.perf_counter() - t1
+
+    print(
+        json.dumps(
+            {
+                "first_render_s": first,
+                "rerun_s": rerun,
+                "exceptions": [str(e.value) for e in at.exception],
+            }
+        )
+    )
+
+
+def run_profile(pages: list[str]) -> dict:
+    imports = {}
+    for module, budget in IMPORT_BUDGETS.items():
+        seconds = measure_import(module)
+        imports[module] = {
+            "seconds": seconds,
+            "budget": budget,
+            "over_budget": seconds > budget,
+        }
+
+    page_results = {}
+    for page in pages:
+        res = measure_page(page)
+        res["budget"] = PAGE_BUDGETS[page]
+        res["over_budget"] = res["first_render_s"] > PAGE_BUDGETS[page]
+        page_results[page] = res
+
+    return {"timestamp": time.time(), "imports": imports, "pages": page_results}
+
+
+def _print_report(report: dict) -> None:
+    print(f"{'import':<48}{'seconds':>10}{'budget':>10}")
+    for module, r in report["imports"].items():
+        flag = "  OVER" if r["over_budget"] else ""
+        print(f"{module:<48}{r['seconds']:>10.3f}{r['budget']:>10.1f}{flag}")
+    print()
+    print(f"{'page':<16}{'first render':>14}{'rerun':>10}{'budget':>10}")
+    for page, r in report["pages"].items():
+        flag = "  OVER" if r["over_budget"] else ""
+        if r["exceptions"]:
+            flag += f"  ERRORS: {r['exceptions']}"
+        print(
+            f"{page:<16}{r['first_render_s']:>14.3f}{r['rerun_s']:>10.3f}"
+            f"{r['budget']:>10.1f}{flag}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--pages", nargs="*", choices=list(PAGE_SCRIPTS), default=list(PAGE_SCRIPTS)
+    )
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    parser.add_argument("--strict", action="store_true", help="fail on over-budget")
+    parser.add_argument("--page-child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.page_child:
+        _page_child(args.page_child)
+        return 0
+
+    report = run_profile(args.pages)
+    _print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    over = [m for m, r in report["imports"].items() if r["over_budget"]]
+    over += [p for p, r in report["pages"].items() if r["over_budget"]]
+    return 1 if args.strict and over else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+"""Synthetic datasets shaped like the ETL output, for benchmarks and load tests.
+
+All generators are deterministic for a given seed and write the same file
+names the fetcher downloads (`DatasetName` and `DAILY_RAW_T`), so a generated
+directory can stand in for DATA_DIR or be served as the fetch source
+(`finance_daily.scripts.mock_source`).
+
+Prices follow a one-factor market model with a group factor, so correlations,
+betas and group indices look like real ones; some tickers list partway
+through the history. Fundamentals are consistent per symbol (margins, share
+counts and balance sheets evolve quarter to quarter) and news mentions the
+universe's tickers with sentiment labels derived from the score.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from finance_daily.constants import DAILY_RAW_T, TICKERS_F, DatasetName
+
+TRADING_DAYS_PER_YEAR = 252
+# Alpha Vantage's score -> label thresholds
+SENTIMENT_LABELS = (
+    (-0.35, "Bearish"),
+    (-0.15, "Somewhat-Bearish"),
+    (0.15, "Neutral"),
+    (0.35, "Somewhat-Bullish"),
+    (np.inf, "Bullish"),
+)
+# share of tickers whose history starts partway through the range
+LATE_LISTING_SHARE = 0.1
+
+_HEADLINE_VERBS = (
+    "beats",
+    "misses",
+    "raises",
+    "cuts",
+    "surges on",
+    "slides after",
+    "announces",
+    "expands",
+    "faces",
+    "rallies on",
+)
+_HEADLINE_NOUNS = (
+    "quarterly estimates",
+    "full-year guidance",
+    "buyback plan",
+    "new product line",
+    "regulatory review",
+    "analyst upgrade",
+    "supply constraints",
+    "record demand",
+    "dividend increase",
+    "leadership change",
+)
+_SUMMARY_SENTENCES = (
+    "Shares moved sharply in early trading.",
+    "Analysts were divided on the outlook.",
+    "The company reiterated its long-term targets.",
+    "Volume was well above the recent average.",
+    "Management pointed to stronger margins in the second half.",
+    "Investors weighed the results against rising rates.",
+    "The move follows a volatile week for the sector.",
+    "Several brokers revised their price targets.",
+)
+_SOURCES = ("Example Wire", "Market Daily", "Synthetic Times", "Ticker Tape")
+
+
+@dataclass(frozen=True)
+class SyntheticScale:
+    n_tickers: int = 7
+    n_days: int = 1000
+    n_news: int = 500
+    n_groups: int = 2
+    seed: int = 0
+    news_days: int = 90  # news is spread over this many days before `end`
+    end: str = "2025-12-31"
+
+    @classmethod
+    def from_years(cls, years: float, **kwargs) -> SyntheticScale:
+        return cls(n_days=max(2, int(years * TRADING_DAYS_PER_YEAR)), **kwargs)
+
+
+def synthetic_symbols(n: int) -> list[str]:
+    """Deterministic ticker symbols: AAAA, AAAB, ..."""
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    out = []
+    for i in range(n):
+        sym = ""
+        for _ in range(4):
+            i, r = divmod(i, len(letters))
+            sym = letters[r] + sym
+        out.append(sym)
+    return out
+
+
+def price_paths(
+    n_tickers: int,
+    n_days: int,
+    *,
+    rng: np.random.Generator,
+    n_groups: int = 1,
+) -> np.ndarray:
+    """Close prices, shape (n_days, n_tickers): market beta times a market
+    factor, plus a factor shared within each group, plus idiosyncratic noise.
+    NaN before a late-listed ticker's first day."""
+    market = rng.normal(0.0003, 0.01, (n_days, 1))
+    groups = rng.normal(0.0, 0.006, (n_days, max(1, n_groups)))
+    beta = rng.uniform(0.6, 1.6, n_tickers)
+    vol = rng.uniform(0.008, 0.03, n_tickers)
+    group_of = np.arange(n_tickers) % max(1, n_groups)
+    returns = (
+        market * beta
+        + groups[:, group_of]
+        + rng.normal(0.0, 1.0, (n_days, n_tickers)) * vol
+    )
+    close = rng.uniform(10.0, 500.0, n_tickers) * np.exp(np.cumsum(returns, axis=0))
+
+    late = rng.random(n_tickers) < LATE_LISTING_SHARE
+    first_day = np.where(late, rng.integers(0, max(1, n_days // 2), n_tickers), 0)
+    close[np.arange(n_days)[:, None] < first_day] = np.nan
+    return close
+
+
+def daily_series_frame(
+    n_days: int,
+    *,
+    rng: np.random.Generator,
+    end: str = "2025-12-31",
+    close: np.ndarray | None = None,
+) -> pd.DataFrame:
+    """One ticker's OHLCV rows on business days ending at `end`; `close`
+    (NaN before listing) defaults to a single random path."""
+    if close is None:
+        close = price_paths(1, n_days, rng=rng)[:, 0]
+    dates = pd.bdate_range(end=end, periods=n_days)
+    listed = ~np.isnan(close)
+    dates, close = dates[listed], close[listed]
+    n = len(close)
+    prev = np.concatenate([close[:1], close[:-1]])
+    open_ = prev * (1.0 + rng.normal(0.0, 0.004, n))
+    wick = np.abs(rng.normal(0.0, 0.006, (2, n)))
+    return pd.DataFrame(
+        {
+            "date": dates.strftime("%Y-%m-%d"),
+            "open": open_.round(4),
+            "high": (np.maximum(open_, close) * (1.0 + wick[0])).round(4),
+            "low": (np.minimum(open_, close) * (1.0 - wick[1])).round(4),
+            "close": close.round(4),
+            "volume": np.exp(rng.normal(15.0, 1.0, n)).astype(np.int64),
+        }
+    )
+
+
+def sentiment_labels(scores: np.ndarray) -> np.ndarray:
+    bounds = np.array([b for b, _ in SENTIMENT_LABELS])
+    names = np.array([name for _, name in SENTIMENT_LABELS], dtype=object)
+    return names[np.searchsorted(bounds, scores, side="left")]
+
+
+def news_frame(
+    n_news: int,
+    *,
+    rng: np.random.Generator,
+    symbols: list[str] | None = None,
+    days: int = 90,
+    end: str = "2025-12-31 23:00",
+) -> pd.DataFrame:
+    """`n_news` articles over the `days` before `end`, newest last."""
+    symbols = symbols or ["MKT"]
+    published = pd.Timestamp(end, tz="UTC") - pd.to_timedelta(
+        np.sort(rng.integers(0, days * 24 * 3600, n_news))[::-1], unit="s"
+    )
+    mention = rng.choice(np.array(symbols, dtype=object), n_news)
+    verb = rng.choice(np.array(_HEADLINE_VERBS, dtype=object), n_news)
+    noun = rng.choice(np.array(_HEADLINE_NOUNS, dtype=object), n_news)
+    ids = np.arange(n_news).astype(str)
+    sentences = np.array(_SUMMARY_SENTENCES, dtype=object)
+    n_sentences = rng.integers(1, 25, n_news)
+    summaries = [" ".join(rng.choice(sentences, k)) for k in n_sentences]
+    score = np.clip(rng.normal(0.08, 0.2, n_news), -1.0, 1.0).round(6)
+    banner = pd.Series("https://news.example.com/img/" + ids + ".jpg")
+    # not every article has an image
+    banner[rng.random(n_news) < 0.2] = None
+    return pd.DataFrame(
+        {
+            "title": mention + " " + verb + " " + noun,
+            "url": "https://news.example.com/article/" + ids,
+            "time_published": published.strftime("%Y-%m-%d %H:%M:%S+00:00"),
+            "authors": "Synthetic Desk",
+            "summary": summaries,
+            "banner_image": banner,
+            "source": rng.choice(np.array(_SOURCES, dtype=object), n_news),
+            "overall_sentiment_score": score,
+            "overall_sentiment_label": sentiment_labels(score),
+        }
+    )
+
+
+def write_large_news_csv(
+    path: Path, target_bytes: int, *, rng: np.random.Generator, batch_rows: int = 10_000
+) -> int:
+    """Write a news CSV of at least `target_bytes` by repeating one encoded
+    batch (URLs repeat; fine for memory and throughput tests); returns rows."""
+    batch = news_frame(batch_rows, rng=rng).to_csv(index=False).encode("utf-8")
+    header_end = batch.index(b"\n") + 1
+    header, body = batch[:header_end], batch[header_end:]
+    rows = 0
+    with path.open("wb") as f:
+        f.write(header)
+        written = len(header)
+        while written < target_bytes:
+            f.write(body)
+            written += len(body)
+            rows += batch_rows
+    return rows
+
+
+def snapshot_frame(
+    symbols: list[str], series: dict[str, pd.DataFrame]
+) -> pd.DataFrame:
+    rows = []
+    for sym in symbols:
+        close = series[sym]["close"].to_numpy()
+        rows.append(
+            {
+                "ticker": sym,
+                "date": series[sym]["date"].iloc[-1],
+                "close": close[-1],
+                "pct_1_day": close[-1] / close[-2] - 1.0 if len(close) > 1 else None,
+                "pct_1_week": close[-1] / close[-6] - 1.0 if len(close) > 5 else None,
+            }
+        )
+    return pd.DataFrame(rows)
+
+
+def fundamentals_frame(
+    symbols: list[str],
+    *,
+    rng: np.random.Generator,
+    n_quarters: int = 8,
+    end: str = "2025-09-30",
+) -> pd.DataFrame:
+    """Quarterly statements per symbol: revenue grows with seasonality around
+    a per-symbol trend, margins and leverage are per-symbol with noise."""
+    n_sym = len(symbols)
+    quarters = pd.date_range(end=end, periods=n_quarters, freq="QE")
+    season = 1.0 + 0.05 * np.sin(np.arange(n_quarters) * np.pi / 2)
+
+    def per_symbol(values: np.ndarray) -> np.ndarray:
+        return np.repeat(values[:, None], n_quarters, axis=1)
+
+    shape = (n_sym, n_quarters)
+    growth = rng.normal(0.02, 0.04, (n_sym, 1)) + rng.normal(0.0, 0.03, shape)
+    revenue = (
+        np.exp(rng.normal(21.0, 1.5, (n_sym, 1)))
+        * np.exp(np.cumsum(growth, axis=1))
+        * season
+    )
+    gross_margin = per_symbol(rng.uniform(0.2, 0.8, n_sym)) + rng.normal(0, 0.02, shape)
+    gross = revenue * np.clip(gross_margin, 0.05, 0.95)
+    net_margin = per_symbol(rng.normal(0.1, 0.1, n_sym)) + rng.normal(0, 0.03, shape)
+    net = revenue * net_margin
+    # slow buybacks
+    shares = per_symbol(np.exp(rng.normal(20.0, 1.0, n_sym))) * np.cumprod(
+        1.0 - rng.uniform(0.0, 0.01, shape), axis=1
+    )
+    # retained earnings accumulate into equity
+    equity = per_symbol(revenue[:, 0] * rng.uniform(1.0, 4.0, n_sym)) + np.cumsum(
+        net * 0.6, axis=1
+    )
+    liabilities = equity * per_symbol(rng.uniform(0.3, 2.5, n_sym))
+    operating_cf = net * rng.uniform(0.9, 1.5, shape)
+    return pd.DataFrame(
+        {
+            "symbol": np.repeat(symbols, n_quarters),
+            "fiscal_date_ending": np.tile(quarters.strftime("%Y-%m-%d"), n_sym),
+            "reported_currency": "USD",
+            "total_revenue": revenue.ravel().round(0),
+            "gross_profit": gross.ravel().round(0),
+            "net_income": net.ravel().round(0),
+            "eps": (net / shares).ravel().round(4),
+            "shares_outstanding": shares.ravel().round(0),
+            "total_assets": (equity + liabilities).ravel().round(0),
+            "total_liabilities": liabilities.ravel().round(0),
+            "total_shareholder_equity": equity.ravel().round(0),
+            "operating_cashflow": operating_cf.ravel().round(0),
+        }
+    )
+
+
+def etl_meta_frame(timestamp: str = "2025-12-31T22:00:00") -> pd.DataFrame:
+    return pd.DataFrame({"overall_success": [1], "etl_timestamp": [timestamp]})
+
+
+def write_tickers_yaml(config_dir: Path, symbols: list[str], n_groups: int) -> Path:
+    config_dir.mkdir(parents=True, exist_ok=True)
+    groups: dict[str, list[dict]] = {}
+    for i, sym in enumerate(symbols):
+        groups.setdefault(f"group_{i % n_groups + 1}", []).append(
+            {"symbol": sym, "name": f"{sym} Synthetic Corp."}
+        )
+    path = config_dir / TICKERS_F
+    path.write_text(yaml.safe_dump(groups, sort_keys=False), encoding="utf-8")
+    return path
+
+
+def generate(
+    data_dir: Path, config_dir: Path, scale: SyntheticScale = SyntheticScale()
+) -> list[str]:
+    """Write a full synthetic data/config directory pair; returns the symbols."""
+    rng = np.random.default_rng(scale.seed)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    symbols = synthetic_symbols(scale.n_tickers)
+
+    close = price_paths(
+        scale.n_tickers, scale.n_days, rng=rng, n_groups=scale.n_groups
+    )
+    series = {}
+    for j, sym in enumerate(symbols):
+        series[sym] = daily_series_frame(
+            scale.n_days, rng=rng, end=scale.end, close=close[:, j]
+        )
+        series[sym].to_csv(data_dir / DAILY_RAW_T.format(symbol=sym), index=False)
+
+    snapshot_frame(symbols, series).to_csv(
+        data_dir / DatasetName.FACT_LATEST.value, index=False
+    )
+    news_frame(
+        scale.n_news,
+        rng=rng,
+        symbols=symbols,
+        days=scale.news_days,
+        end=f"{scale.end} 23:00",
+    ).to_csv(data_dir / DatasetName.FACT_NEWS_RAW.value, index=False)
+    last_quarter = pd.Timestamp(scale.end) - pd.offsets.QuarterEnd(1)
+    fundamentals_frame(
+        symbols,
+        rng=rng,
+        n_quarters=max(4, scale.n_days // (TRADING_DAYS_PER_YEAR // 4)),
+        end=last_quarter.strftime("%Y-%m-%d"),
+    ).to_csv(data_dir / DatasetName.FACT_FUNDAMENTALS.value, index=False)
+    for meta in (DatasetName.DIM_META_GROUP1, DatasetName.DIM_META_GROUP2):
+        etl_meta_frame(f"{scale.end}T22:00:00").to_csv(
+            data_dir / meta.value, index=False
+        )
+
+    write_tickers_yaml(config_dir, symbols, scale.n_groups)
+    return symbols
@@ -0,0 +1,91 @@
+"""Minimal client for the headless data API, with ETag revalidation.
+
+Stands in for the internal tools that consume the API and is handy for
+poking at a running server:
+
+    python -m finance_daily.services.api_client /series symbols=GOOG,SPY
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import urllib.error
+import urllib.request
+from urllib.parse import urlencode, urljoin
+
+import pandas as pd
+
+
+class ApiClient:
+    def __init__(self, base_url: str, *, timeout: float = 30.0):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.timeout = timeout
+        # url -> (etag, body); a 304 reuses the stored body
+        self._etags: dict[str, tuple[str, bytes]] = {}
+        self.last_status: int | None = None
+
+    def get(self, path: str, **params) -> bytes:
+        query = urlencode({k: v for k, v in params.items() if v is not None})
+        url = urljoin(self.base_url, path.lstrip("/")) + (f"?{query}" if query else "")
+        req = urllib.request.Request(url)
+        cached = self._etags.get(url)
+        if cached is not None:
+            req.add_header("If-None-Match", cached[0])
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+                body = resp.read()
+                self.last_status = resp.status
+                etag = resp.headers.get("ETag")
+        except urllib.error.HTTPError as e:
+            if e.code == 304 and cached is not None:
+                self.last_status = 304
+                return cached[1]
+            raise
+        if etag:
+            self._etags[url] = (etag, body)
+        return body
+
+    def get_table(self, path: str, **params) -> pd.DataFrame:
+        payload = json.loads(self.get(path, **params))
+        return pd.DataFrame(payload["data"], columns=payload["columns"])
+
+    def snapshot(self) -> pd.DataFrame:
+        return self.get_table("/snapshot")
+
+    def series(
+        self,
+        symbols: list[str] | None = None,
+        *,
+        start: str | None = None,
+        end: str | None = None,
+    ) -> pd.DataFrame:
+        return self.get_table(
+            "/series",
+            symbols=",".join(symbols) if symbols else None,
+            start=start,
+            end=end,
+        )
+
+    def news(
+        self,
+        *,
+        since: str | None = None,
+        until: str | None = None,
+        label: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> pd.DataFrame:
+        return self.get_table(
+            "/news", since=since, until=until, label=label, limit=limit, offset=offset
+        )
+
+
+if __name__ == "__main__":
+    from finance_daily.config import AppConfig
+
+    cfg = AppConfig()
+    client = ApiClient(f"http://{cfg.api_host}:{cfg.api_port}/")
+    path = sys.argv[1] if len(sys.argv) > 1 else "/snapshot"
+    params = dict(arg.split("=", 1) for arg in sys.argv[2:])
+    print(client.get_table(path, **params))
@@ -0,0 +1,404 @@
+"""Headless HTTP API over the same loaders the Streamlit pages use.
+
+Endpoints (GET/HEAD):
+
+    /health
+    /snapshot
+    /series?symbols=GOOG,SPY&start=2024-01-02&end=2024-06-28
+    /news?since=2025-01-01&until=2025-01-31&label=bullish&limit=50&offset=0
+
+Tables are returned as columnar JSON (`{"columns": [...], "data": {col: [...]}}`)
+or, with `format=arrow`, as an Arrow IPC stream. Every response carries an
+ETag derived from the request, the state of the files it reads and the data
+generation, so clients revalidate with `If-None-Match` and get a 304 without
+any parsing. Encoded responses are kept in one process-wide cache shared by
+all connections.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date as Date
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+from finance_daily.config import AppConfig
+from finance_daily.constants import DAILY_RAW_T, TICKERS_F, DatasetName, NewsFields
+from finance_daily.generation import generation_id
+from finance_daily.utils import load_dataset, load_tickers
+
+# encoded responses kept in memory (LRU by count)
+RESPONSE_CACHE_ENTRIES = 256
+_MAX_HEADER_BYTES = 16 * 1024
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass(frozen=True)
+class ApiResponse:
+    status: int
+    body: bytes
+    content_type: str
+    etag: str | None = None
+
+
+class _ResponseCache:
+    def __init__(self, max_entries: int):
+        self._entries: OrderedDict[str, ApiResponse] = OrderedDict()
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+
+    def get(self, etag: str) -> ApiResponse | None:
+        with self._lock:
+            resp = self._entries.get(etag)
+            if resp is not None:
+                self._entries.move_to_end(etag)
+            return resp
+
+    def put(self, resp: ApiResponse) -> None:
+        with self._lock:
+            self._entries[resp.etag] = resp
+            self._entries.move_to_end(resp.etag)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+_responses = _ResponseCache(RESPONSE_CACHE_ENTRIES)
+
+
+def _files_signature(paths: list[Path]) -> str:
+    """Cheap stand-in for file contents: (name, mtime, size) of each file."""
+    parts = []
+    for p in paths:
+        try:
+            st = p.stat()
+            parts.append(f"{p.name}:{st.st_mtime_ns}:{st.st_size}")
+        except FileNotFoundError:
+            parts.append(f"{p.name}:missing")
+    return "|".join(parts)
+
+
+def _parse_date(value: str | None, name: str) -> Date | None:
+    if not value:
+        return None
+    try:
+        return Date.fromisoformat(value)
+    except ValueError:
+        raise ApiError(400, f"{name} must be YYYY-MM-DD")
+
+
+def _parse_int(value: str | None, name: str, default: int) -> int:
+    if value is None:
+        return default
+    try:
+        n = int(value)
+    except ValueError:
+        raise ApiError(400, f"{name} must be an integer")
+    if n < 0:
+        raise ApiError(400, f"{name} must be >= 0")
+    return n
+
+
+def _json_column(s: pd.Series) -> list:
+    if pd.api.types.is_datetime64_any_dtype(s):
+        s = s.dt.strftime("%Y-%m-%d")
+    return s.astype(object).where(s.notna(), None).tolist()
+
+
+def encode_table(df: pd.DataFrame, fmt: str) -> tuple[bytes, str]:
+    if fmt == "arrow":
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = io.BytesIO()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue(), "application/vnd.apache.arrow.stream"
+
+    payload = {
+        "columns": list(df.columns),
+        "rows": len(df),
+        "data": {c: _json_column(df[c]) for c in df.columns},
+    }
+    body = json.dumps(payload, separators=(",", ":"), allow_nan=False)
+    return body.encode("utf-8"), "application/json"
+
+
+class DataApi:
+    """Request routing and query logic, independent of the transport."""
+
+    def __init__(self, config: AppConfig):
+        self.config = config
+
+    # -- routes -----------------------------------------------------------
+
+    def snapshot(self, params: dict[str, str]) -> pd.DataFrame:
+        df = load_dataset(DatasetName.FACT_LATEST, config=self.config)
+        if df is None:
+            raise ApiError(404, "snapshot dataset not available")
+        return df
+
+    def series(self, params: dict[str, str]) -> pd.DataFrame:
+        from finance_daily.components.ticker_series_chart import (
+            get_all_tickers_common_range,
+            normalized_frame,
+        )
+
+        tickers = load_tickers(self.config)
+        symbols = self._symbols(params, tickers)
+        start = _parse_date(params.get("start"), "start")
+        end = _parse_date(params.get("end"), "end")
+        if start is None:
+            common, _ = get_all_tickers_common_range(
+                data_dir=self.config.data_dir, symbols=symbols
+            )
+            if common is None:
+                raise ApiError(404, "no common date range for these symbols")
+            start = common[0]
+
+        plot_df, _, _ = normalized_frame(
+            data_dir=self.config.data_dir, symbols=tuple(symbols), start=start
+        )
+        if plot_df is None or plot_df.empty:
+            raise ApiError(404, "no price data for these symbols")
+        if end is not None:
+            plot_df = plot_df[plot_df["date"] <= pd.Timestamp(end)]
+        wide = plot_df.pivot(index="date", columns="ticker", values="pct_from_start")
+        wide = wide.reindex(columns=[s for s in symbols if s in wide.columns])
+        return wide.reset_index()
+
+    def news(self, params: dict[str, str]) -> pd.DataFrame:
+        since = _parse_date(params.get("since"), "since")
+        until = _parse_date(params.get("until"), "until")
+        limit = _parse_int(params.get("limit"), "limit", 50)
+        offset = _parse_int(params.get("offset"), "offset", 0)
+
+        df = load_dataset(
+            DatasetName.FACT_NEWS_RAW,
+            config=self.config,
+            date_range=(since, until) if since or until else None,
+        )
+        if df is None:
+            raise ApiError(404, "news dataset not available")
+
+        label_col = NewsFields.OVERALL_SENTIMENT_LABEL.value
+        if params.get("label") and label_col in df.columns:
+            wanted = {v.strip().lower() for v in params["label"].split(",")}
+            df = df[df[label_col].astype(str).str.lower().isin(wanted)]
+
+        time_col = NewsFields.TIME_PUBLISHED.value
+        if time_col in df.columns:
+            df = df.sort_values(time_col, ascending=False, na_position="last")
+        return df.iloc[offset : offset + limit].reset_index(drop=True)
+
+    _ROUTES = {"/snapshot": "snapshot", "/series": "series", "/news": "news"}
+
+    # -- helpers ----------------------------------------------------------
+
+    def _symbols(self, params: dict[str, str], tickers=None) -> list[str]:
+        tickers = tickers or load_tickers(self.config)
+        raw = params.get("symbols")
+        if not raw:
+            return tickers.to_symbols()
+        symbols = [s.strip().upper() for s in raw.split(",") if s.strip()]
+        unknown = [s for s in symbols if not tickers.has_symbol(s)]
+        if unknown:
+            raise ApiError(400, f"unknown symbols: {', '.join(unknown)}")
+        return symbols
+
+    def _source_files(self, path: str, params: dict[str, str]) -> list[Path]:
+        """Files whose state determines the response for `path`."""
+        data_dir = self.config.data_dir
+        if path == "/snapshot":
+            return [data_dir / DatasetName.FACT_LATEST.value]
+        if path == "/news":
+            return [data_dir / DatasetName.FACT_NEWS_RAW.value]
+        return [self.config.config_dir / TICKERS_F] + [
+            data_dir / DAILY_RAW_T.format(symbol=s) for s in self._symbols(params)
+        ]
+
+    def _etag(self, path: str, params: dict[str, str]) -> str:
+        signature = _files_signature(self._source_files(path, params))
+        # the data version the loaders key their caches on, so a tag never
+        # outlives the cached frames it was computed from
+        generation = generation_id(self.config.data_dir)
+        key = json.dumps([path, sorted(params.items()), signature, generation])
+        return '"' + hashlib.sha1(key.encode("utf-8")).hexdigest() + '"'
+
+    def handle(self, target: str, if_none_match: str | None) -> ApiResponse:
+        url = urlsplit(target)
+        params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path == "/health":
+            return ApiResponse(200, b'{"ok":true}', "application/json")
+
+        method_name = self._ROUTES.get(url.path)
+        if method_name is None:
+            raise ApiError(404, f"unknown endpoint {url.path}")
+        fmt = params.get("format", "json")
+        if fmt not in ("json", "arrow"):
+            raise ApiError(400, "format must be json or arrow")
+
+        etag = self._etag(url.path, params)
+        if if_none_match and etag in [t.strip() for t in if_none_match.split(",")]:
+            return ApiResponse(304, b"", "", etag)
+
+        cached = _responses.get(etag)
+        if cached is not None:
+            return cached
+
+        df = getattr(self, method_name)(params)
+        body, content_type = encode_table(df, fmt)
+        resp = ApiResponse(200, body, content_type, etag)
+        _responses.put(resp)
+        return resp
+
+
+# -- transport ------------------------------------------------------------
+
+_REASONS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    500: "Internal Server Error",
+}
+
+
+def _error_response(status: int, message: str) -> ApiResponse:
+    body = json.dumps({"error": message}).encode("utf-8")
+    return ApiResponse(status, body, "application/json")
+
+
+async def _write_response(
+    writer: asyncio.StreamWriter, resp: ApiResponse, *, head: bool, keep_alive: bool
+) -> None:
+    headers = [
+        f"HTTP/1.1 {resp.status} {_REASONS.get(resp.status, '')}",
+        f"Content-Length: {0 if resp.status == 304 else len(resp.body)}",
+        f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        "Cache-Control: no-cache",
+    ]
+    if resp.content_type:
+        headers.append(f"Content-Type: {resp.content_type}")
+    if resp.etag:
+        headers.append(f"ETag: {resp.etag}")
+    writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1"))
+    if not head and resp.status != 304:
+        writer.write(resp.body)
+    await writer.drain()
+
+
+async def _read_request(reader: asyncio.StreamReader) -> tuple[str, str, dict] | None:
+    try:
+        raw = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    except asyncio.LimitOverrunError:
+        raise ApiError(400, "request headers too large")
+    lines = raw.decode("latin-1").split("\r\n")
+    try:
+        method, target, _version = lines[0].split(" ", 2)
+    except ValueError:
+        raise ApiError(400, "malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+    return method.upper(), target, headers
+
+
+def make_handler(api: DataApi):
+    async def handle_connection(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ApiError as e:
+                    await _write_response(
+                        writer,
+                        _error_response(e.status, str(e)),
+                        head=False,
+                        keep_alive=False,
+                    )
+                    break
+                if request is None:
+                    break
+                method, target, headers = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                if method not in ("GET", "HEAD"):
+                    resp = _error_response(405, "only GET and HEAD are supported")
+                else:
+                    try:
+                        # pandas work runs off the event loop
+                        resp = await loop.run_in_executor(
+                            None, api.handle, target, headers.get("if-none-match")
+                        )
+                    except ApiError as e:
+                        resp = _error_response(e.status, str(e))
+                    except Exception as e:  # keep serving other requests
+                        resp = _error_response(500, f"{type(e).__name__}: {e}")
+
+                await _write_response(
+                    writer, resp, head=method == "HEAD", keep_alive=keep_alive
+                )
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle_connection
+
+
+async def serve(config: AppConfig, host: str, port: int) -> None:
+    api = DataApi(config)
+    server = await asyncio.start_server(
+        make_handler(api), host, port, limit=_MAX_HEADER_BYTES
+    )
+    addrs = ", ".join(str(s.getsockname()) for s in server.sockets)
+    print(f"finance-daily API listening on {addrs}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> None:
+    from streamlit.logger import set_log_level
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    # the cached loaders run outside a Streamlit runtime here
+    set_log_level("error")
+    config = AppConfig()
+    try:
+        asyncio.run(
+            serve(config, args.host or config.api_host, args.port or config.api_port)
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
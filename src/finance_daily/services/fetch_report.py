@@ -0,0 +1,120 @@
+"""Summarize DATA_DIR/fetch_history.jsonl: run trends and the slowest files."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+from datetime import datetime
+from pathlib import Path
+
+from finance_daily.config import AppConfig
+from finance_daily.constants import FETCH_HISTORY_F
+
+
+def load_run_history(path: Path) -> list[dict]:
+    """Runs in file (chronological) order; unparsable lines are skipped."""
+    if not path.exists():
+        return []
+    runs = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                runs.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return runs
+
+
+def file_durations(runs: list[dict]) -> dict[str, list[float]]:
+    """file name -> durations across `runs`, oldest first (successful fetches only)."""
+    out: dict[str, list[float]] = {}
+    for run in runs:
+        for s in run.get("file_stats", []):
+            if s.get("ok"):
+                out.setdefault(s["file_name"], []).append(s["duration_s"])
+    return out
+
+
+def degrading_files(
+    runs: list[dict], *, recent: int = 3, min_ratio: float = 1.5
+) -> list[tuple[str, float, float]]:
+    """Files whose mean duration over the last `recent` runs is `min_ratio`x
+    their earlier mean, as (file, earlier_mean_s, recent_mean_s)."""
+    out = []
+    for name, durations in file_durations(runs).items():
+        if len(durations) <= recent:
+            continue
+        earlier = statistics.fmean(durations[:-recent])
+        latest = statistics.fmean(durations[-recent:])
+        if earlier > 0 and latest / earlier >= min_ratio:
+            out.append((name, earlier, latest))
+    return sorted(out, key=lambda t: t[2] / t[1], reverse=True)
+
+
+def _fmt_ts(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M")
+
+
+def print_report(runs: list[dict], *, last: int, top: int) -> None:
+    if not runs:
+        print("No fetch history recorded yet.")
+        return
+
+    print(f"Last {min(last, len(runs))} of {len(runs)} runs")
+    print(
+        f"{'started':<18}{'ok':>4}{'files':>7}{'failed':>8}{'MB':>9}"
+        f"{'seconds':>10}{'MB/s':>8}{'retries':>9}"
+    )
+    for run in runs[-last:]:
+        print(
+            f"{_fmt_ts(run['started_at']):<18}{'yes' if run['ok'] else 'NO':>4}"
+            f"{run['files']:>7}{run['failed_files']:>8}{run['bytes'] / 1e6:>9.1f}"
+            f"{run['duration_s']:>10.1f}{run['throughput_bps'] / 1e6:>8.2f}"
+            f"{run['retries']:>9}"
+        )
+
+    latest = runs[-1]
+    slowest = sorted(
+        latest.get("file_stats", []), key=lambda s: s["duration_s"], reverse=True
+    )[:top]
+    print()
+    print("Slowest files in the latest run")
+    print(f"{'file':<44}{'seconds':>9}{'ttfb':>8}{'MB':>8}{'retries':>9}")
+    for s in slowest:
+        ttfb = f"{s['ttfb_s']:.2f}" if s.get("ttfb_s") is not None else "—"
+        print(
+            f"{s['file_name']:<44}{s['duration_s']:>9.2f}{ttfb:>8}"
+            f"{s['bytes'] / 1e6:>8.2f}{s['retries']:>9}"
+        )
+
+    window = runs[-last:]
+    means = {
+        name: statistics.fmean(d) for name, d in file_durations(window).items()
+    }
+    print()
+    print(f"Slowest files on average (last {len(window)} runs)")
+    for name, mean in sorted(means.items(), key=lambda t: t[1], reverse=True)[:top]:
+        print(f"{name:<44}{mean:>9.2f}")
+
+    degrading = degrading_files(window)
+    if degrading:
+        print()
+        print("Degrading files (recent mean vs earlier mean)")
+        for name, earlier, recent in degrading[:top]:
+            print(f"{name:<44}{earlier:>9.2f} -> {recent:.2f}s")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--last", type=int, default=14, help="runs to summarize")
+    parser.add_argument("--top", type=int, default=10, help="files per listing")
+    parser.add_argument("--history", type=Path, help="defaults to DATA_DIR history")
+    args = parser.parse_args(argv)
+
+    path = args.history or AppConfig().data_dir / FETCH_HISTORY_F
+    print_report(load_run_history(path), last=args.last, top=args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+"""Incremental intraday news refresh (`poll_news`).
+
+The nightly fetch replaces the whole news file. Between nightly runs the
+scheduler's news job polls instead:
+
+1. A conditional GET (ETag / Last-Modified from the previous poll): an
+   unchanged source answers 304 and nothing is transferred.
+2. Otherwise the response is streamed to a side file and read in chunks. Only
+   rows published at or after the `time_published` cursor, less
+   `LATE_WINDOW_S` for items that show up late, are candidates. Candidates
+   whose URL hash is already among the local items of that window are
+   dropped.
+3. The remaining rows are appended to the local CSV and inserted into the
+   serving database (`append_dataset_rows`). Both are O(new items), and the
+   app's news caches pick them up through the file signature.
+
+The cursor, ETag and Last-Modified are kept in DATA_DIR/news_cursor.json.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urljoin
+
+import numpy as np
+import pandas as pd
+
+from finance_daily.config import AppConfig
+from finance_daily.constants import (
+    DATASET_REQUIRED_FIELDS,
+    NEWS_CURSOR_F,
+    DatasetName,
+    NewsFields,
+)
+from finance_daily.csv_stream import CsvValidationError, iter_csv_chunks, validate_csv
+from finance_daily.generation import write_generation
+from finance_daily.serving_db import DatasetQuery, append_dataset_rows, read_dataset
+from finance_daily.services.nightly_fetch import (
+    FetchResult,
+    FileFetchStats,
+    _fetch_file,
+    append_run_history,
+    fetch_lock,
+)
+from finance_daily.shared_store import file_signature
+from finance_daily.utils import load_tickers
+
+# items published up to this long before the cursor are still diffed by URL
+LATE_WINDOW_S = 2 * 86_400
+_CHUNK_BYTES = 64 * 1024
+NEWS_FILE = DatasetName.FACT_NEWS_RAW
+
+
+@dataclass
+class NewsCursor:
+    time_published: int | None = None  # epoch seconds of the newest local item
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+@dataclass
+class NewsPollResult:
+    ok: bool
+    new_items: int = 0
+    not_modified: bool = False
+    bytes: int = 0
+    duration_s: float = 0.0
+    error: str | None = None
+
+
+def _cursor_path(config: AppConfig) -> Path:
+    return config.data_dir / NEWS_CURSOR_F
+
+
+def read_cursor(config: AppConfig) -> NewsCursor:
+    try:
+        raw = json.loads(_cursor_path(config).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return NewsCursor()
+    return NewsCursor(**{k: raw.get(k) for k in asdict(NewsCursor())})
+
+
+def _write_cursor(config: AppConfig, cursor: NewsCursor) -> None:
+    path = _cursor_path(config)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(asdict(cursor)), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _epoch_seconds(values: pd.Series) -> np.ndarray:
+    """UTC epoch seconds as float, NaN where the timestamp doesn't parse."""
+    parsed = pd.to_datetime(
+        values.astype("string").str.replace("Z", "+00:00", regex=False),
+        errors="coerce",
+        utc=True,
+        format="ISO8601",
+    )
+    seconds = (parsed - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)
+    return seconds.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _url_hashes(urls: pd.Series) -> np.ndarray:
+    return pd.util.hash_array(
+        urls.astype("string").str.strip().to_numpy(dtype=object, na_value="")
+    )
+
+
+def _local_window(
+    config: AppConfig, since: float | None
+) -> tuple[np.ndarray, float | None]:
+    """URL hashes of local items published since `since` (all when None),
+    and the newest local publish time."""
+    start = (
+        datetime.fromtimestamp(since, tz=timezone.utc).date()
+        if since is not None
+        else None
+    )
+    # an indexed range read when the serving database is fresh
+    df = read_dataset(
+        NEWS_FILE,
+        config=config,
+        query=DatasetQuery(
+            columns=(NewsFields.URL.value, NewsFields.TIME_PUBLISHED.value),
+            date_range=(start, None) if start is not None else None,
+        ),
+    )
+    if df is None or df.empty or NewsFields.URL.value not in df.columns:
+        return np.empty(0, dtype=np.uint64), None
+    published = _epoch_seconds(df[NewsFields.TIME_PUBLISHED.value])
+    newest = float(np.nanmax(published)) if np.isfinite(published).any() else None
+    return np.unique(_url_hashes(df[NewsFields.URL.value])), newest
+
+
+def _download(
+    url: str, output_path: Path, cursor: NewsCursor
+) -> tuple[int, str | None, str | None] | None:
+    """Conditional download to `output_path`; None when the source answers
+    304. Returns (bytes, ETag, Last-Modified)."""
+    headers = {}
+    if cursor.etag:
+        headers["If-None-Match"] = cursor.etag
+    if cursor.last_modified:
+        headers["If-Modified-Since"] = cursor.last_modified
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        resp = urllib.request.urlopen(req, timeout=30)  # nosec - url is configured
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return None
+        raise
+    written = 0
+    expected = resp.headers.get("Content-Length")
+    with resp, output_path.open("wb") as f:
+        while chunk := resp.read(_CHUNK_BYTES):
+            f.write(chunk)
+            written += len(chunk)
+    # a dropped connection ends the reads early without an error; keeping the
+    # ETag of a cut body would turn the missing rows into a 304 next time
+    if expected is not None and written != int(expected):
+        raise OSError(f"short read: {written} of {expected} bytes")
+    return written, resp.headers.get("ETag"), resp.headers.get("Last-Modified")
+
+
+def _new_rows(
+    part: Path, known: np.ndarray, since: float | None, required: tuple[str, ...]
+) -> pd.DataFrame:
+    """Rows of `part` published since `since` whose URL is not in `known`."""
+    # the cursor needs a publish time on every merged row
+    summary = validate_csv(part, (*required, NewsFields.TIME_PUBLISHED.value))
+    found: list[pd.DataFrame] = []
+    seen = known
+    for chunk in iter_csv_chunks(part, summary):
+        published = _epoch_seconds(chunk[NewsFields.TIME_PUBLISHED.value])
+        keep = np.isfinite(published) & chunk[NewsFields.URL.value].notna().to_numpy()
+        if since is not None:
+            keep &= published >= since
+        chunk = chunk[keep]
+        hashes = _url_hashes(chunk[NewsFields.URL.value])
+        # first occurrence within the chunk, and not already local
+        _, first = np.unique(hashes, return_index=True)
+        fresh = np.zeros(len(hashes), dtype=bool)
+        fresh[first] = True
+        fresh &= ~np.isin(hashes, seen)
+        if fresh.any():
+            found.append(chunk[fresh])
+            seen = np.union1d(seen, hashes[fresh])
+    if not found:
+        return pd.DataFrame(columns=list(summary.columns))
+    return pd.concat(found, ignore_index=True)
+
+
+def _append_csv(path: Path, rows: pd.DataFrame) -> None:
+    with path.open("rb") as f:
+        header = f.readline().decode("utf-8").rstrip("\r\n").split(",")
+        f.seek(-1, os.SEEK_END)
+        newline = f.read(1) == b"\n"
+    with path.open("a", encoding="utf-8", newline="") as f:
+        if not newline:
+            f.write("\n")
+        rows.reindex(columns=header).to_csv(f, header=False, index=False)
+
+
+def _poll(config: AppConfig) -> NewsPollResult:
+    t0 = time.perf_counter()
+    local = config.data_dir / NEWS_FILE.value
+    url = urljoin(str(config.data_src).rstrip("/") + "/", NEWS_FILE.value)
+    required = DATASET_REQUIRED_FIELDS.get(NEWS_FILE, ())
+    cursor = read_cursor(config)
+
+    if not local.exists():
+        # nothing to merge into: one plain download seeds the local copy
+        stats = _fetch_file(url, local, required)
+        result = NewsPollResult(
+            ok=stats.ok, new_items=stats.rows or 0, bytes=stats.bytes, error=stats.error
+        )
+        if stats.ok:
+            write_generation(config.data_dir, load_tickers(config).to_symbols())
+            _, newest = _local_window(config, None)
+            _write_cursor(config, NewsCursor(time_published=newest))
+        result.duration_s = time.perf_counter() - t0
+        return result
+
+    since = (
+        cursor.time_published - LATE_WINDOW_S
+        if cursor.time_published is not None
+        else None
+    )
+    known, newest = _local_window(config, since)
+    if since is None and newest is not None:
+        # first poll: the local file seeds the cursor
+        since = newest - LATE_WINDOW_S
+        known, _ = _local_window(config, since)
+
+    part = local.with_name(local.name + ".poll")
+    try:
+        downloaded = _download(url, part, cursor)
+        if downloaded is None:
+            return NewsPollResult(
+                ok=True, not_modified=True, duration_s=time.perf_counter() - t0
+            )
+        size, etag, last_modified = downloaded
+        rows = _new_rows(part, known, since, required)
+    except (urllib.error.URLError, OSError, CsvValidationError) as e:
+        return NewsPollResult(
+            ok=False, error=str(e), duration_s=time.perf_counter() - t0
+        )
+    finally:
+        part.unlink(missing_ok=True)
+
+    if len(rows):
+        base = file_signature(local)
+        _append_csv(local, rows)
+        if not append_dataset_rows(config, NEWS_FILE, rows, base_signature=base):
+            print("Serving database is not current, news will be reingested")
+        write_generation(config.data_dir, load_tickers(config).to_symbols())
+        published = _epoch_seconds(rows[NewsFields.TIME_PUBLISHED.value])
+        newest = max(newest or 0.0, float(np.nanmax(published)))
+    _write_cursor(
+        config,
+        NewsCursor(
+            time_published=int(newest) if newest is not None else None,
+            etag=etag,
+            last_modified=last_modified,
+        ),
+    )
+    return NewsPollResult(
+        ok=True, new_items=len(rows), bytes=size, duration_s=time.perf_counter() - t0
+    )
+
+
+def poll_news(config: AppConfig) -> NewsPollResult | None:
+    """Merge news items newer than the local copy; None if a fetch is running."""
+    with fetch_lock(config) as acquired:
+        if not acquired:
+            print("Another fetch is running, skipping")
+            return None
+        started_at = time.time()
+        result = _poll(config)
+
+    if result.not_modified:
+        print("News unchanged at the source")
+    elif result.ok:
+        print(f"Merged {result.new_items} new news items")
+    else:
+        print(f"News poll failed: {result.error}")
+    try:
+        append_run_history(
+            config,
+            FetchResult(
+                ok=result.ok,
+                errors=[result.error] if result.error else [],
+                file_stats=[
+                    FileFetchStats(
+                        file_name=NEWS_FILE.value,
+                        ok=result.ok,
+                        bytes=result.bytes,
+                        duration_s=result.duration_s,
+                        error=result.error,
+                        mode="poll",
+                        rows=result.new_items,
+                    )
+                ],
+                started_at=started_at,
+                duration_s=result.duration_s,
+            ),
+        )
+    except OSError as e:
+        print(f"Could not record fetch history: {e}")
+    return result
+
+
+if __name__ == "__main__":
+    poll_news(AppConfig())
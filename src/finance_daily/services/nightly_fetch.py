@@ -1,12 +1,56 @@
-from dataclasses import dataclass, field
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+import fcntl
+import io
+import json
+import os
 from pathlib import Path
-import shutil
+import time
+import urllib.error
 import urllib.request
+from typing import Collection, Iterator
+import uuid
 from urllib.parse import urljoin
+
+import pandas as pd
+
 from finance_daily.config import AppConfig
-from finance_daily.constants import DatasetName, DAILY_RAW_T
+from finance_daily.constants import (
+    DatasetName,
+    DAILY_RAW_REQUIRED_FIELDS,
+    DAILY_RAW_T,
+    DATASET_REQUIRED_FIELDS,
+    FETCH_HISTORY_F,
+    FETCH_LOCK_F,
+    DailyRawFields,
+    FetchMode,
+)
+from finance_daily.csv_stream import CsvValidationError, validate_csv
+from finance_daily.generation import write_generation
+from finance_daily.price_panel import AppendedRows, read_close_rows
+from finance_daily.services.prewarm import prewarm_database, prewarm_store
 from finance_daily.utils import load_tickers
 
+# retries per file after the first attempt, with exponential backoff
+MAX_RETRIES = 2
+RETRY_BACKOFF_S = 1.0
+_CHUNK_BYTES = 64 * 1024
+# a delta fetch re-requests the last local row to check the remote still has it
+DELTA_MAX_ROW_BYTES = 64 * 1024
+
+
+@dataclass
+class FileFetchStats:
+    file_name: str
+    ok: bool
+    bytes: int = 0
+    ttfb_s: float | None = None
+    duration_s: float = 0.0
+    retries: int = 0
+    error: str | None = None
+    mode: str = FetchMode.FULL.value
+    rows: int | None = None  # rows of a validated full download
+
 
 @dataclass
 class FetchResult:
@@ -14,76 +58,348 @@ class FetchResult:
     written_files: dict[DatasetName, Path] = field(default_factory=dict)
     written_series_files: dict[str, Path] = field(default_factory=dict)
     errors: list[str] = field(default_factory=list)
+    file_stats: list[FileFetchStats] = field(default_factory=list)
+    # symbol -> rows appended by a delta fetch (not set for full downloads)
+    appended_series_rows: dict[str, AppendedRows] = field(default_factory=dict)
+    started_at: float = 0.0
+    duration_s: float = 0.0
 
 
-def _download_to_path(url: str, output_path: Path) -> None:
-    """Stream-download a URL to disk without parsing it into pandas."""
+def _download_to_path(url: str, output_path: Path) -> tuple[int, float]:
+    """Stream-download a URL to disk without parsing it into pandas.
+
+    Returns (bytes written, seconds until the first body byte arrived).
+    """
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+    ttfb = None
+    written = 0
     with urllib.request.urlopen(url, timeout=30) as resp:  # nosec - url is configured
+        expected = resp.headers.get("Content-Length")
         with output_path.open("wb") as f:
-            shutil.copyfileobj(resp, f)
+            while chunk := resp.read(_CHUNK_BYTES):
+                if ttfb is None:
+                    ttfb = time.perf_counter() - t0
+                f.write(chunk)
+                written += len(chunk)
+    # a connection dropped mid-body ends the chunked reads early, not with an
+    # error, and a cut at a row boundary would still validate
+    if expected is not None and written != int(expected):
+        raise OSError(f"short read: {written} of {expected} bytes")
+    return written, ttfb if ttfb is not None else time.perf_counter() - t0
+
+
+def _fetch_file(
+    url: str, output_path: Path, required: tuple[str, ...] = ()
+) -> FileFetchStats:
+    """Download with retries, recording size, latency and attempts.
+
+    The download goes to a side file that replaces `output_path` only once
+    it has been validated (chunk by chunk) and has the `required` columns,
+    so a bad response never clobbers the last good copy.
+    """
+    stats = FileFetchStats(file_name=output_path.name, ok=False)
+    part = output_path.with_name(output_path.name + ".part")
+    t0 = time.perf_counter()
+    try:
+        for attempt in range(MAX_RETRIES + 1):
+            stats.retries = attempt
+            try:
+                stats.bytes, stats.ttfb_s = _download_to_path(url, part)
+                stats.ok = True
+                stats.error = None
+                break
+            except Exception as e:
+                stats.error = str(e)
+                if isinstance(e, urllib.error.HTTPError) and e.code < 500:
+                    break  # missing file or bad request: retrying won't help
+                if attempt < MAX_RETRIES:
+                    time.sleep(RETRY_BACKOFF_S * 2**attempt)
+        if stats.ok:
+            try:
+                stats.rows = validate_csv(part, required).rows
+                os.replace(part, output_path)
+            except CsvValidationError as e:
+                stats.ok = False
+                stats.error = f"invalid CSV: {e}"
+    finally:
+        part.unlink(missing_ok=True)
+    stats.duration_s = time.perf_counter() - t0
+    return stats
 
 
-def fetch_and_store(config: AppConfig) -> FetchResult:
+@dataclass(frozen=True)
+class LocalTail:
+    size: int
+    header: bytes
+    last_row: bytes  # the last line, newline included
+    last_date: str | None  # None when the file has no rows yet
+
+
+class _DeltaMismatch(Exception):
+    """The remote file is not the local file plus appended rows."""
+
+
+def read_local_tail(path: Path) -> LocalTail | None:
+    """Size, header and last row of a local series CSV, or None if it cannot
+    be extended (missing, empty, not newline-terminated, no date column)."""
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return None
+    with path.open("rb") as f:
+        header = f.readline()
+        f.seek(max(0, size - DELTA_MAX_ROW_BYTES))
+        tail = f.read()
+    if not header.endswith(b"\n") or not tail.endswith(b"\n"):
+        return None
+    row_start = tail.rfind(b"\n", 0, len(tail) - 1) + 1
+    if row_start == 0 and size > len(tail):
+        return None  # last row longer than the window
+    last_row = tail[row_start:]
+
+    columns = header.decode("utf-8").rstrip("\r\n").split(",")
+    if DailyRawFields.DATE.value not in columns:
+        return None
+    last_date = None
+    if size > len(header):
+        fields = last_row.decode("utf-8").rstrip("\r\n").split(",")
+        last_date = fields[columns.index(DailyRawFields.DATE.value)]
+    return LocalTail(size=size, header=header, last_row=last_row, last_date=last_date)
+
+
+def _download_delta(
+    url: str, output_path: Path, tail: LocalTail
+) -> tuple[int, float, AppendedRows | None]:
+    """Append the rows the remote has past `tail` to `output_path`.
+
+    Requests from the start of the local last row and requires the response
+    to begin with that exact row. Returns (bytes transferred, ttfb, appended
+    rows or None when nothing is new); raises `_DeltaMismatch` when only a
+    full download can be trusted.
+    """
+    offset = tail.size - len(tail.last_row)
+    req = urllib.request.Request(url, headers={"Range": f"bytes={offset}-"})
+    t0 = time.perf_counter()
+    try:
+        resp = urllib.request.urlopen(req, timeout=30)  # nosec - url is configured
+    except urllib.error.HTTPError as e:
+        if e.code == 416:
+            raise _DeltaMismatch("remote file is shorter than the local copy")
+        raise
+    with resp:
+        ttfb = time.perf_counter() - t0
+        content_range = resp.headers.get("Content-Range", "")
+        if resp.status != 206 or not content_range.startswith(f"bytes {offset}-"):
+            raise _DeltaMismatch("server did not honour the Range request")
+        body = resp.read()
+
+    if not body.startswith(tail.last_row):
+        raise _DeltaMismatch("local last row differs from the remote")
+    new = body[len(tail.last_row) :]
+    if not new:
+        return len(body), ttfb, None
+    if not new.endswith(b"\n"):
+        raise _DeltaMismatch("remote ends in a partial row")
+
+    read = read_close_rows(io.BytesIO(tail.header + new))
+    if read is None:
+        raise _DeltaMismatch("appended rows have no date/close columns")
+    dates, close = read
+    last_date = pd.Timestamp(tail.last_date) if tail.last_date else None
+    if last_date is not None and len(dates) and dates[0] <= last_date.to_datetime64():
+        raise _DeltaMismatch("appended rows are not newer than the local tail")
+
+    with output_path.open("ab") as f:
+        f.write(new)
+    return (
+        len(body),
+        ttfb,
+        AppendedRows(base_size=tail.size, dates=dates, close=close),
+    )
+
+
+def _fetch_series_file(
+    url: str, output_path: Path, mode: FetchMode
+) -> tuple[FileFetchStats, AppendedRows | None]:
+    """Delta-fetch a series file when possible, else download it in full."""
+    tail = read_local_tail(output_path) if mode is FetchMode.DELTA else None
+    if tail is not None:
+        stats = FileFetchStats(
+            file_name=output_path.name, ok=False, mode=FetchMode.DELTA.value
+        )
+        t0 = time.perf_counter()
+        try:
+            stats.bytes, stats.ttfb_s, appended = _download_delta(
+                url, output_path, tail
+            )
+            stats.ok = True
+            stats.duration_s = time.perf_counter() - t0
+            return stats, appended
+        except _DeltaMismatch as e:
+            print(f"{output_path.name}: {e}, downloading in full")
+        except Exception as e:
+            print(f"{output_path.name}: delta fetch failed ({e}), downloading in full")
+    return _fetch_file(url, output_path, DAILY_RAW_REQUIRED_FIELDS), None
+
+
+def append_run_history(config: AppConfig, result: FetchResult) -> Path:
+    """Append one JSON line describing this run to DATA_DIR/fetch_history.jsonl."""
+    total_bytes = sum(s.bytes for s in result.file_stats)
+    record = {
+        "run_id": uuid.uuid4().hex,
+        "started_at": result.started_at,
+        "duration_s": result.duration_s,
+        "ok": result.ok,
+        "files": len(result.file_stats),
+        "failed_files": sum(not s.ok for s in result.file_stats),
+        "bytes": total_bytes,
+        "retries": sum(s.retries for s in result.file_stats),
+        "throughput_bps": total_bytes / result.duration_s if result.duration_s else 0.0,
+        "file_stats": [asdict(s) for s in result.file_stats],
+    }
+    path = config.data_dir / FETCH_HISTORY_F
+    with path.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    return path
+
+
+@contextmanager
+def fetch_lock(config: AppConfig) -> Iterator[bool]:
+    """Hold DATA_DIR/.fetch.lock for the block; yields False if another
+    fetch (cron, the scheduler, a second scheduler) already holds it."""
+    config.data_dir.mkdir(parents=True, exist_ok=True)
+    with (config.data_dir / FETCH_LOCK_F).open("a") as f:
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def fetch_and_store(
+    config: AppConfig,
+    datasets: Collection[DatasetName] | None = None,
+    *,
+    series: bool = True,
+) -> FetchResult:
     """
     Fetch datasets from config.data_src and write them into config.data_dir.
 
-    Returns a FetchResult so the UI can show what happened.
+    `datasets` limits the fixed datasets fetched (all when None); `series`
+    False skips the ticker series. Returns a FetchResult so the UI can show
+    what happened.
     """
     config.data_dir.mkdir(parents=True, exist_ok=True)
+    started_at = time.time()
+    t0 = time.perf_counter()
 
     errors: list[str] = []
     written_files: dict[DatasetName, Path] = {}
     written_series_files: dict[str, Path] = {}
+    file_stats: list[FileFetchStats] = []
+    appended_series_rows: dict[str, AppendedRows] = {}
 
     base = str(config.data_src).rstrip("/") + "/"
 
     # --- Fixed datasets (known filenames) ---
     for name in DatasetName:
+        if datasets is not None and name not in datasets:
+            continue
         # DatasetName values already include the ".csv" extension
         file_name = name.value
         csv_url = urljoin(base, file_name)
-        try:
-            print(f"Fetching {file_name} from {csv_url}")
-            output_path = config.data_dir / file_name
-            _download_to_path(csv_url, output_path)
+        print(f"Fetching {file_name} from {csv_url}")
+        output_path = config.data_dir / file_name
+        stats = _fetch_file(csv_url, output_path, DATASET_REQUIRED_FIELDS.get(name, ()))
+        file_stats.append(stats)
+        if stats.ok:
             print(f"Successfully wrote {file_name}")
             written_files[name] = output_path
-
-        except Exception as e:
-            errors.append(f"{file_name}: {e}")
+        else:
+            errors.append(f"{file_name}: {stats.error}")
 
     # --- Dynamic datasets (ticker raw series) ---
-    symbols = load_tickers(config).to_symbols()
+    symbols = load_tickers(config).to_symbols() if series else []
     for sym in symbols:
         file_name = DAILY_RAW_T.format(symbol=sym)
         csv_url = urljoin(base, file_name)
-        try:
-            print(f"Fetching {file_name} from {csv_url}")
-            output_path = config.data_dir / file_name
-            _download_to_path(csv_url, output_path)
+        print(f"Fetching {file_name} from {csv_url}")
+        output_path = config.data_dir / file_name
+        stats, appended = _fetch_series_file(csv_url, output_path, config.fetch_mode)
+        file_stats.append(stats)
+        if appended is not None:
+            appended_series_rows[sym] = appended
+        if stats.ok:
             print(f"Successfully wrote {file_name}")
             written_series_files[sym] = output_path
-        except Exception as e:
-            errors.append(f"{file_name}: {e}")
+        else:
+            errors.append(f"{file_name}: {stats.error}")
 
     ok = len(errors) == 0
-    return FetchResult(
+    result = FetchResult(
         ok=ok,
         written_files=written_files,
         written_series_files=written_series_files,
         errors=errors,
+        file_stats=file_stats,
+        appended_series_rows=appended_series_rows,
+        started_at=started_at,
+        duration_s=time.perf_counter() - t0,
     )
+    try:
+        append_run_history(config, result)
+    except OSError as e:
+        print(f"Could not record fetch history: {e}")
+    if written_files or written_series_files:
+        # readers key their caches on this; see `finance_daily.generation`
+        write_generation(config.data_dir, load_tickers(config).to_symbols())
+    return result
 
 
-def nightly_fetch() -> None:
-    config = AppConfig()
-    result = fetch_and_store(config)
+def run_fetch(
+    config: AppConfig,
+    datasets: Collection[DatasetName] | None = None,
+    *,
+    series: bool = True,
+) -> FetchResult | None:
+    """`fetch_and_store` under the fetch lock, then refresh the shared store
+    and serving database. None if another fetch is running."""
+    with fetch_lock(config) as acquired:
+        if not acquired:
+            print("Another fetch is running, skipping")
+            return None
+        return _fetch_and_prewarm(config, datasets, series)
+
+
+def _fetch_and_prewarm(
+    config: AppConfig, datasets: Collection[DatasetName] | None, series: bool
+) -> FetchResult:
+    result = fetch_and_store(config, datasets, series=series)
+    total_mb = sum(s.bytes for s in result.file_stats) / 1e6
+    print(
+        f"{len(result.file_stats)} files, {total_mb:.1f} MB in {result.duration_s:.1f}s"
+    )
+    if result.written_files or result.written_series_files:
+        # parse the new files once here instead of in the first app request
+        rebuilt = prewarm_store(config, appended=result.appended_series_rows)
+        print(f"Shared store {'rebuilt' if rebuilt else 'already fresh'}")
+        reloaded = prewarm_database(config)
+        print(f"Ingested {len(reloaded)} files into the serving database")
     if result.ok:
         print("Data fetched successfully")
     else:
         print("Data fetched with errors")
         print(result.errors)
+    return result
+
+
+def nightly_fetch() -> None:
+    run_fetch(AppConfig())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,158 @@
+"""Populate data caches before the first visitor pays for them.
+
+Two layers are warmed:
+
+- the shared store (`finance_daily.shared_store`) and the serving database
+  (`finance_daily.serving_db`): parsed data on disk, shared by every app
+  process. Updated after the nightly fetch and before `prod` starts the app
+  (`python -m` this module).
+- the Streamlit caches of one app process: every cached loader is called
+  with the exact arguments the pages use, so their cache keys match, and the
+  Details page's default figure is built. Other figures depend on the
+  session's choices and are left to the pages. Started once per process in a
+  background thread from `app.py`.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+import streamlit as st
+
+from finance_daily.config import AppConfig
+from finance_daily.constants import DatasetName, ETLMetaFields
+from finance_daily.price_panel import AppendedRows
+from finance_daily.serving_db import ingest_database
+from finance_daily.shared_store import build_shared_store, store_is_stale
+from finance_daily.utils import load_dataset, load_tickers
+
+
+def prewarm_store(
+    config: AppConfig,
+    *,
+    force: bool = False,
+    appended: dict[str, AppendedRows] | None = None,
+) -> bool:
+    """Rebuild the shared store if any source changed; True if it was rebuilt.
+
+    `appended` are the rows a delta fetch added, see `build_shared_store`.
+    """
+    symbols = load_tickers(config).to_symbols()
+    if not force and not store_is_stale(config.data_dir, symbols):
+        return False
+    build_shared_store(config, symbols, appended)
+    return True
+
+
+def prewarm_database(config: AppConfig) -> list[str]:
+    """Ingest changed source files into the serving database."""
+    return ingest_database(config, load_tickers(config).to_symbols())
+
+
+def _overview_steps(config: AppConfig) -> dict[str, Callable[[], object]]:
+    from finance_daily.components.news_feed import load_news_items
+    from finance_daily.components.snapshot_table import load_snapshot_view
+
+    etl_columns = (
+        ETLMetaFields.OVERALL_SUCCESS.value,
+        ETLMetaFields.LAST_ETL_TIMESTAMP.value,
+    )
+    return {
+        "etl_meta": lambda: [
+            load_dataset(ds, config=config, columns=etl_columns)
+            for ds in (DatasetName.DIM_META_GROUP1, DatasetName.DIM_META_GROUP2)
+        ],
+        "snapshot": lambda: load_snapshot_view(config),
+        "news_items": lambda: [
+            load_news_items(config, limit=5),  # overview
+            load_news_items(config),  # sentiment
+        ],
+    }
+
+
+def _series_steps(config: AppConfig) -> dict[str, Callable[[], object]]:
+    from finance_daily.components.ticker_series_chart import (
+        TickerSeriesSpec,
+        default_all_tickers_figure,
+        load_close_series,
+    )
+    from finance_daily.fundamentals_engine import load_fundamentals
+    from finance_daily.returns_engine import load_group_indices
+
+    data_dir = config.data_dir
+    symbols = load_tickers(config).to_symbols()
+
+    def all_tickers_default() -> None:
+        # the page's first render; also fills the common range and the
+        # normalized frame it is built from
+        default_all_tickers_figure(
+            data_dir=data_dir, symbols=symbols, spec=TickerSeriesSpec()
+        )
+
+    def single_ticker_defaults() -> None:
+        for sym in symbols:
+            load_close_series(data_dir, sym)
+
+    return {
+        "series_all_tickers": all_tickers_default,
+        "group_indices": lambda: load_group_indices(data_dir, load_tickers(config)),
+        "series_single_tickers": single_ticker_defaults,
+        "fundamentals": lambda: load_fundamentals(config),
+    }
+
+
+def prewarm_caches(config: AppConfig) -> dict[str, float]:
+    """Call every page loader once in this process; step -> seconds.
+
+    A failing step is reported and skipped so one missing dataset does not
+    leave the rest cold.
+    """
+    timings: dict[str, float] = {}
+    steps = {**_overview_steps(config), **_series_steps(config)}
+    for name, step in steps.items():
+        t0 = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            print(f"prewarm {name} failed: {e}")
+            continue
+        timings[name] = time.perf_counter() - t0
+    return timings
+
+
+@st.cache_resource(show_spinner=False)
+def start_background_prewarm(config: AppConfig) -> threading.Thread:
+    """Warm this process's caches in a daemon thread, once per process."""
+
+    def run() -> None:
+        t0 = time.perf_counter()
+        timings = prewarm_caches(config)
+        print(
+            f"prewarmed {len(timings)} loaders in {time.perf_counter() - t0:.2f}s"
+        )
+
+    thread = threading.Thread(target=run, name="finance-daily-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+def main() -> None:
+    config = AppConfig()
+    t0 = time.perf_counter()
+    rebuilt = prewarm_store(config)
+    print(
+        f"shared store {'rebuilt' if rebuilt else 'already fresh'} "
+        f"in {time.perf_counter() - t0:.2f}s"
+    )
+    t0 = time.perf_counter()
+    reloaded = prewarm_database(config)
+    print(
+        f"serving database: {len(reloaded)} files ingested "
+        f"in {time.perf_counter() - t0:.2f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+"""Production mode: N Streamlit workers behind a local TCP load balancer.
+
+Each worker is a separate `streamlit run` process (its own interpreter and
+GIL) listening on 127.0.0.1. The balancer accepts browser connections on the
+public port and pipes them to a worker chosen by client address, so a
+session's websocket and its HTTP requests land on the same worker. Behind a
+reverse proxy (`TRUSTED_PROXIES`) the client address comes from the
+proxy's X-Forwarded-For header; connections with no client address known
+are spread round-robin.
+
+Parsed datasets and the price panel live in the memory-mapped shared store
+(`finance_daily.shared_store`), built here before the workers start and
+rebuilt whenever the source files change, so adding workers does not add a
+private copy of every DataFrame per process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import itertools
+import os
+import signal
+import subprocess
+import sys
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from finance_daily.config import AppConfig
+from finance_daily.services.prewarm import prewarm_store
+
+APP_SCRIPT = Path(__file__).resolve().parent.parent / "app.py"
+HEALTH_PATH = "/_stcore/health"
+HEALTH_INTERVAL_S = 5.0
+STORE_CHECK_INTERVAL_S = 60.0
+_PIPE_CHUNK = 64 * 1024
+# how long a new connection may take to send its request head
+_HEAD_TIMEOUT_S = 10.0
+
+_Network = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+
+@dataclass
+class Worker:
+    index: int
+    port: int
+    proc: subprocess.Popen | None = None
+    healthy: bool = False
+
+
+def _spawn(worker: Worker, env: dict[str, str]) -> None:
+    worker.proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "streamlit",
+            "run",
+            str(APP_SCRIPT),
+            "--server.port",
+            str(worker.port),
+            "--server.address",
+            "127.0.0.1",
+            "--server.headless",
+            "true",
+        ],
+        env=env,
+    )
+    worker.healthy = False
+
+
+async def _check_health(worker: Worker) -> bool:
+    try:
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection("127.0.0.1", worker.port), timeout=2.0
+        )
+    except (OSError, asyncio.TimeoutError):
+        return False
+    try:
+        writer.write(
+            f"GET {HEALTH_PATH} HTTP/1.1\r\nHost: localhost\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1")
+        )
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout=2.0)
+        return b" 200 " in status_line
+    except (OSError, asyncio.TimeoutError):
+        return False
+    finally:
+        writer.close()
+
+
+def _parse_networks(spec: str) -> list[_Network]:
+    return [
+        ipaddress.ip_network(part.strip(), strict=False)
+        for part in spec.split(",")
+        if part.strip()
+    ]
+
+
+def _in_networks(host: str, networks: list[_Network]) -> bool:
+    try:
+        addr = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(addr in net for net in networks)
+
+
+def _forwarded_for(head: bytes) -> list[str]:
+    """Addresses in the X-Forwarded-For headers of a request head, in order."""
+    addrs: list[str] = []
+    for line in head.split(b"\r\n")[1:]:
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"x-forwarded-for":
+            addrs += [
+                a.strip() for a in value.decode("latin-1").split(",") if a.strip()
+            ]
+    return addrs
+
+
+async def _read_head(reader: asyncio.StreamReader) -> bytes:
+    """The request line and headers, consumed from `reader` (b"" if the client
+    sent none in time or they are too long to buffer)."""
+    try:
+        return await asyncio.wait_for(
+            reader.readuntil(b"\r\n\r\n"), timeout=_HEAD_TIMEOUT_S
+        )
+    except asyncio.IncompleteReadError as e:
+        return e.partial
+    except (asyncio.LimitOverrunError, asyncio.TimeoutError, ConnectionError):
+        return b""
+
+
+class Cluster:
+    def __init__(self, config: AppConfig, n_workers: int, public_port: int):
+        self.config = config
+        self.public_port = public_port
+        self.workers = [
+            Worker(index=i, port=public_port + 1 + i) for i in range(n_workers)
+        ]
+        self.env = os.environ.copy()
+        self.trusted_proxies = _parse_networks(config.trusted_proxies)
+        self._round_robin = itertools.count()
+
+    def client_address(self, peer_host: str, head: bytes) -> str | None:
+        """The address the connection is on behalf of, None if unknown.
+
+        A trusted proxy's own address says nothing about the client: the
+        client is the right-most X-Forwarded-For entry not added by a trusted
+        proxy (entries further left are client-supplied and can be forged).
+        """
+        if not _in_networks(peer_host, self.trusted_proxies):
+            return peer_host or None
+        for addr in reversed(_forwarded_for(head)):
+            if not _in_networks(addr, self.trusted_proxies):
+                return addr
+        return None
+
+    def pick(self, client_host: str | None) -> Worker | None:
+        healthy = [w for w in self.workers if w.healthy]
+        if not healthy:
+            return None
+        if client_host is None:
+            return healthy[next(self._round_robin) % len(healthy)]
+        return healthy[zlib.crc32(client_host.encode()) % len(healthy)]
+
+    async def supervise(self) -> None:
+        loop = asyncio.get_running_loop()
+        since_store_check = 0.0
+        while True:
+            for w in self.workers:
+                if w.proc is None or w.proc.poll() is not None:
+                    print(f"worker {w.index} is down, (re)starting on :{w.port}")
+                    _spawn(w, self.env)
+                w.healthy = await _check_health(w)
+
+            since_store_check += HEALTH_INTERVAL_S
+            if since_store_check >= STORE_CHECK_INTERVAL_S:
+                since_store_check = 0.0
+                await loop.run_in_executor(None, self.refresh_store)
+            await asyncio.sleep(HEALTH_INTERVAL_S)
+
+    def refresh_store(self) -> None:
+        if prewarm_store(self.config):
+            print("source data changed, rebuilt shared store")
+
+    async def handle_client(
+        self, client_reader: asyncio.StreamReader, client_writer: asyncio.StreamWriter
+    ) -> None:
+        peer = client_writer.get_extra_info("peername")
+        head = await _read_head(client_reader)
+        worker = self.pick(self.client_address(peer[0] if peer else "", head))
+        if worker is None:
+            client_writer.write(
+                b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n"
+                b"Connection: close\r\n\r\n"
+            )
+            await client_writer.drain()
+            client_writer.close()
+            return
+        try:
+            up_reader, up_writer = await asyncio.open_connection(
+                "127.0.0.1", worker.port
+            )
+        except OSError:
+            worker.healthy = False
+            client_writer.close()
+            return
+        up_writer.write(head)
+        try:
+            await asyncio.gather(
+                _pipe(client_reader, up_writer), _pipe(up_reader, client_writer)
+            )
+        finally:
+            # only once both directions are done: a client that half-closes
+            # after its request still gets the response
+            client_writer.close()
+            up_writer.close()
+
+    def stop_workers(self) -> None:
+        for w in self.workers:
+            if w.proc is not None and w.proc.poll() is None:
+                w.proc.terminate()
+        for w in self.workers:
+            if w.proc is not None:
+                try:
+                    w.proc.wait(timeout=10)
+                except subprocess.TimeoutExpired:
+                    w.proc.kill()
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Copy `reader` to `writer` until EOF, then pass the EOF on (half-close);
+    a broken connection closes `writer` so the other direction ends too."""
+    try:
+        while chunk := await reader.read(_PIPE_CHUNK):
+            writer.write(chunk)
+            await writer.drain()
+        if writer.can_write_eof():
+            writer.write_eof()
+        else:
+            writer.close()
+    except ConnectionError:
+        writer.close()
+
+
+async def _serve(cluster: Cluster) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    server = await asyncio.start_server(
+        cluster.handle_client, "0.0.0.0", cluster.public_port
+    )
+    supervisor = asyncio.create_task(cluster.supervise())
+    print(
+        f"balancing :{cluster.public_port} across {len(cluster.workers)} workers "
+        f"(:{cluster.workers[0].port}-:{cluster.workers[-1].port})"
+    )
+    async with server:
+        await stop.wait()
+    supervisor.cancel()
+
+
+def run_cluster(config: AppConfig) -> None:
+    print("building shared store")
+    prewarm_store(config, force=True)
+
+    cluster = Cluster(config, config.app_workers, config.app_port)
+    try:
+        asyncio.run(_serve(cluster))
+    finally:
+        cluster.stop_workers()
+
+
+if __name__ == "__main__":
+    run_cluster(AppConfig())
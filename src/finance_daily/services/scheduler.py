@@ -0,0 +1,270 @@
+"""Long-running fetch scheduler (`poetry run scheduler`).
+
+Jobs come from CONFIG_DIR/schedule.yaml (`DEFAULT_SCHEDULE` when it is
+missing). Each job fetches a subset of the datasets, either at fixed times of
+day or every N minutes, so news can refresh intraday while prices and
+fundamentals are fetched nightly. A job's `action` is `fetch` (`run_fetch`)
+or `poll_news` (`poll_news`, merging only new news items). Both run in this
+process: interpreter, imports and the ticker registry stay loaded between
+runs, and the shared store and serving database are refreshed right after
+each fetch. Both hold DATA_DIR/.fetch.lock, so a scheduled fetch never
+overlaps a one-off `nightly_fetch` or a second scheduler. A job that raises is
+logged, recorded in fetch_history.jsonl and retried with exponential backoff;
+the other jobs keep their cadence.
+
+The last run of every job is kept in DATA_DIR/scheduler_state.json. A job
+whose slot passed while the scheduler was down runs once on start-up (not
+once per missed slot), then continues on its cadence. Every slot is delayed
+by a random jitter so several deployments don't hit the source together.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, time as Time, timedelta, timezone
+import json
+import os
+import random
+import signal
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import yaml
+
+from finance_daily.config import AppConfig
+from finance_daily.constants import SCHEDULE_F, SCHEDULER_STATE_F, DatasetName
+from finance_daily.services.news_poller import poll_news
+from finance_daily.services.nightly_fetch import (
+    FetchResult,
+    append_run_history,
+    run_fetch,
+)
+
+# wake at least this often, so clock jumps and stop requests are noticed
+MAX_SLEEP_S = 60.0
+# retry delay when another process holds the fetch lock
+LOCK_RETRY_S = 60.0
+# retry delay after a job raised, doubled per consecutive failure up to the cap
+FAILURE_RETRY_S = 60.0
+MAX_FAILURE_RETRY_S = 3600.0
+
+DEFAULT_SCHEDULE: dict[str, Any] = {
+    "timezone": "UTC",
+    "jitter_s": 120,
+    "jobs": [
+        {"name": "prices", "at": ["22:30"], "datasets": "all"},
+        {"name": "news", "every_minutes": 10, "action": "poll_news"},
+    ],
+}
+
+
+JOB_ACTIONS = ("fetch", "poll_news")
+
+
+@dataclass(frozen=True)
+class FetchJob:
+    name: str
+    datasets: tuple[DatasetName, ...] | None  # None: every fixed dataset
+    series: bool = True  # also fetch the ticker series
+    at: tuple[Time, ...] = ()  # daily slots, in the schedule's timezone
+    every: timedelta | None = None
+    action: str = "fetch"  # one of JOB_ACTIONS
+
+    def next_slot(self, last_run: datetime | None, tz: ZoneInfo) -> datetime:
+        """The first slot after `last_run`; a job that never ran is due now."""
+        if last_run is None:
+            return datetime.fromtimestamp(0, tz=timezone.utc)
+        if self.every is not None:
+            return last_run + self.every
+        day = last_run.astimezone(tz).date()
+        for d in (day, day + timedelta(days=1)):
+            for t in self.at:
+                slot = datetime.combine(d, t, tzinfo=tz)
+                if slot > last_run:
+                    return slot
+        raise AssertionError("unreachable: a job has at least one daily slot")
+
+
+@dataclass(frozen=True)
+class Schedule:
+    jobs: tuple[FetchJob, ...]
+    tz: ZoneInfo = field(default_factory=lambda: ZoneInfo("UTC"))
+    jitter_s: float = 0.0
+
+
+def _parse_job(raw: dict[str, Any]) -> FetchJob:
+    name = str(raw["name"])
+    datasets = raw.get("datasets", "all")
+    at = tuple(sorted(Time.fromisoformat(str(t)) for t in raw.get("at", ())))
+    every = raw.get("every_minutes")
+    if bool(at) == (every is not None):
+        raise ValueError(f"job {name!r}: set exactly one of `at` or `every_minutes`")
+    action = str(raw.get("action", "fetch"))
+    if action not in JOB_ACTIONS:
+        raise ValueError(f"job {name!r}: `action` must be one of {JOB_ACTIONS}")
+    return FetchJob(
+        name=name,
+        datasets=None if datasets == "all" else tuple(DatasetName(d) for d in datasets),
+        series=bool(raw.get("series", True)),
+        at=at,
+        every=timedelta(minutes=float(every)) if every is not None else None,
+        action=action,
+    )
+
+
+def load_schedule(config: AppConfig) -> Schedule:
+    path = config.config_dir / SCHEDULE_F
+    raw = DEFAULT_SCHEDULE
+    if path.exists():
+        with path.open("r", encoding="utf-8") as f:
+            raw = yaml.safe_load(f) or {}
+    jobs = tuple(_parse_job(j) for j in raw.get("jobs", ()))
+    if len({j.name for j in jobs}) != len(jobs):
+        raise ValueError(f"{path.name}: job names must be unique")
+    return Schedule(
+        jobs=jobs,
+        tz=ZoneInfo(str(raw.get("timezone", "UTC"))),
+        jitter_s=float(raw.get("jitter_s", 0)),
+    )
+
+
+def _read_state(path: Path) -> dict[str, datetime]:
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+    return {
+        name: datetime.fromtimestamp(ts, tz=timezone.utc) for name, ts in raw.items()
+    }
+
+
+def _write_state(path: Path, state: dict[str, datetime]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(
+        json.dumps({name: t.timestamp() for name, t in state.items()}),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+
+
+class Scheduler:
+    def __init__(self, config: AppConfig, schedule: Schedule) -> None:
+        self.config = config
+        self.schedule = schedule
+        self.state_path = config.data_dir / SCHEDULER_STATE_F
+        self.stop = threading.Event()
+        # job name -> (slot, slot + jitter); redrawn whenever the slot moves
+        self._due: dict[str, tuple[datetime, datetime]] = {}
+        self._retry_at: dict[str, datetime] = {}
+        # job name -> consecutive runs that raised
+        self._failures: dict[str, int] = {}
+
+    def _due_at(self, job: FetchJob, last_run: datetime | None) -> datetime:
+        slot = job.next_slot(last_run, self.schedule.tz)
+        cached = self._due.get(job.name)
+        if cached is None or cached[0] != slot:
+            jitter = timedelta(seconds=random.uniform(0, self.schedule.jitter_s))
+            cached = (slot, slot + jitter)
+            self._due[job.name] = cached
+        due = cached[1]
+        retry = self._retry_at.get(job.name)
+        return max(due, retry) if retry is not None else due
+
+    def run_due(self, now: datetime) -> datetime:
+        """Run every job that is due; returns when the next one is."""
+        # re-read so a run by another scheduler instance counts here too
+        state = _read_state(self.state_path)
+        for job in self.schedule.jobs:
+            if self.stop.is_set():
+                break
+            if self._due_at(job, state.get(job.name)) > now:
+                continue
+            print(f"[{now:%Y-%m-%d %H:%M:%S}] running job {job.name!r}")
+            started = datetime.now(timezone.utc)
+            try:
+                result = self._run_job(job)
+            except Exception as e:
+                self._job_failed(job, started, e)
+                now = datetime.now(timezone.utc)
+                continue
+            self._failures.pop(job.name, None)
+            if result is None:
+                self._retry_at[job.name] = started + timedelta(seconds=LOCK_RETRY_S)
+                continue
+            self._retry_at.pop(job.name, None)
+            # a failed fetch waits for the next slot too, rather than hammering
+            # the source; the errors are in fetch_history.jsonl
+            state = _read_state(self.state_path)
+            state[job.name] = started
+            _write_state(self.state_path, state)
+            now = datetime.now(timezone.utc)
+        return min(self._due_at(j, state.get(j.name)) for j in self.schedule.jobs)
+
+    def _run_job(self, job: FetchJob):
+        if job.action == "poll_news":
+            return poll_news(self.config)
+        return run_fetch(self.config, job.datasets, series=job.series)
+
+    def _job_failed(self, job: FetchJob, started: datetime, error: Exception) -> None:
+        failures = self._failures.get(job.name, 0) + 1
+        self._failures[job.name] = failures
+        delay = min(FAILURE_RETRY_S * 2 ** (failures - 1), MAX_FAILURE_RETRY_S)
+        self._retry_at[job.name] = started + timedelta(seconds=delay)
+        print(
+            f"Job {job.name!r} failed ({failures} in a row), retrying in {delay:.0f}s"
+        )
+        traceback.print_exc()
+        try:
+            append_run_history(
+                self.config,
+                FetchResult(
+                    ok=False,
+                    errors=[f"job {job.name!r} raised {error!r}"],
+                    started_at=started.timestamp(),
+                    duration_s=time.time() - started.timestamp(),
+                ),
+            )
+        except OSError as e:
+            print(f"Could not record fetch history: {e}")
+
+    def run_forever(self) -> None:
+        if not self.schedule.jobs:
+            print("No jobs scheduled")
+            return
+        state = _read_state(self.state_path)
+        now = datetime.now(timezone.utc)
+        for job in self.schedule.jobs:
+            next_due = self._due_at(job, state.get(job.name))
+            when = (
+                "now (catching up)"
+                if next_due <= now
+                else f"{next_due.astimezone(self.schedule.tz):%Y-%m-%d %H:%M:%S %Z}"
+            )
+            print(f"Job {job.name!r}: next run {when}")
+        while not self.stop.is_set():
+            next_due = self.run_due(datetime.now(timezone.utc))
+            wait = (next_due - datetime.now(timezone.utc)).total_seconds()
+            self.stop.wait(min(max(wait, 0.0), MAX_SLEEP_S))
+        print("Scheduler stopped")
+
+
+def main() -> None:
+    config = AppConfig()
+    scheduler = Scheduler(config, load_schedule(config))
+
+    def _stop(signum, _frame):
+        # a fetch in progress finishes first; nothing new starts
+        print(f"Received signal {signum}, stopping after the current job")
+        scheduler.stop.set()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    main()
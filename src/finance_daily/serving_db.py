@@ -0,0 +1,537 @@
+"""SQLite serving copy of the datasets, indexed by symbol and date.
+
+`ingest_database` (run after the nightly fetch) loads every `DatasetName`
+table and the per-ticker close series into DATA_DIR/serving.sqlite. Dataset
+tables get two hidden, indexed columns: `_sym` (the upper-cased symbol field)
+and `_ts` (the date field as UTC epoch seconds), so symbol and date filters,
+ordering and paging are index lookups instead of pandas scans. Rows appended
+to a source CSV (the intraday news poll) are inserted with
+`append_dataset_rows` instead of reloading the table.
+
+`query_dataset`, `count_rows` and `date_bounds` are the read API. A table is
+only queried while its source CSV still has the signature recorded when it
+was ingested; otherwise the same query is answered through `load_dataset`
+and pandas, so pages never depend on which path served them.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date as Date, datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from finance_daily.config import AppConfig
+from finance_daily.constants import (
+    DAILY_RAW_T,
+    DATASET_DATE_FIELDS,
+    DATASET_SYMBOL_FIELDS,
+    SERVING_DB_F,
+    DailyRawFields,
+    DatasetName,
+)
+from finance_daily.csv_stream import iter_csv_chunks, scan_csv
+from finance_daily.generation import dataset_id
+from finance_daily.price_panel import read_close_rows
+from finance_daily.shared_store import file_signature
+from finance_daily.tracing import record_miss, traced
+from finance_daily.utils import load_dataset, load_tickers
+
+SYMBOL_KEY = "_sym"
+TS_KEY = "_ts"
+SOURCES_TABLE = "_sources"
+DAILY_RAW_TABLE = "daily_raw"
+_DAY_S = 86_400
+
+
+def database_path(data_dir: Path) -> Path:
+    return data_dir / SERVING_DB_F
+
+
+def table_name(dsname: DatasetName) -> str:
+    return Path(dsname.value).stem
+
+
+def _epoch_seconds(values: pd.Series) -> pd.Series:
+    parsed = pd.to_datetime(values, errors="coerce", utc=True)
+    seconds = (parsed - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)
+    return seconds.astype("Int64")
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _day_start(d: Date) -> int:
+    return int(datetime(d.year, d.month, d.day, tzinfo=timezone.utc).timestamp())
+
+
+# --- ingestion ---
+
+
+def _forget(conn: sqlite3.Connection, file_name: str) -> None:
+    # readers fall back to the CSV from here until the reload is recorded
+    with conn:
+        conn.execute(f"DELETE FROM {SOURCES_TABLE} WHERE file_name = ?", (file_name,))
+
+
+def _remember(
+    conn: sqlite3.Connection, file_name: str, signature: list[int]
+) -> None:
+    with conn:
+        conn.execute(
+            f"INSERT OR REPLACE INTO {SOURCES_TABLE} VALUES (?, ?, ?)",
+            (file_name, *signature),
+        )
+
+
+def _add_keys(chunk: pd.DataFrame, dsname: DatasetName) -> pd.DataFrame:
+    symbol_col = DATASET_SYMBOL_FIELDS.get(dsname)
+    date_col = DATASET_DATE_FIELDS.get(dsname)
+    if symbol_col in chunk.columns:
+        chunk[SYMBOL_KEY] = chunk[symbol_col].astype(str).str.strip().str.upper()
+    if date_col in chunk.columns:
+        chunk[TS_KEY] = _epoch_seconds(chunk[date_col])
+    return chunk
+
+
+def _ingest_dataset(conn: sqlite3.Connection, path: Path, dsname: DatasetName) -> None:
+    table = table_name(dsname)
+    symbol_col = DATASET_SYMBOL_FIELDS.get(dsname)
+    date_col = DATASET_DATE_FIELDS.get(dsname)
+    summary = scan_csv(path)
+
+    # dropping the table drops its indexes; chunks are then appended so only
+    # one chunk is in memory at a time
+    with conn:
+        conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+    for chunk in iter_csv_chunks(path, summary):
+        _add_keys(chunk, dsname).to_sql(table, conn, if_exists="append", index=False)
+    with conn:
+        for key, col in ((SYMBOL_KEY, symbol_col), (TS_KEY, date_col)):
+            if col in summary.columns:
+                conn.execute(f'CREATE INDEX "ix_{table}{key}" ON "{table}" ("{key}")')
+
+
+def _ingest_series(conn: sqlite3.Connection, path: Path, symbol: str) -> None:
+    read = read_close_rows(path)
+    with conn:
+        conn.execute(f"DELETE FROM {DAILY_RAW_TABLE} WHERE symbol = ?", (symbol,))
+        if read is None:
+            return
+        dates, close = read
+        index = pd.DatetimeIndex(dates)
+        conn.executemany(
+            f"INSERT INTO {DAILY_RAW_TABLE} VALUES (?, ?, ?, ?)",
+            zip(
+                [symbol] * len(index),
+                index.strftime("%Y-%m-%d"),
+                close.tolist(),
+                (index.asi8 // 10**9).tolist(),
+            ),
+        )
+
+
+def ingest_database(config: AppConfig, symbols: list[str] | None = None) -> list[str]:
+    """Bring the serving database up to date; returns the reloaded file names.
+
+    Only sources whose (mtime, size) changed since their last ingest are
+    reloaded. The database is in WAL mode, so app processes keep reading
+    while it is updated.
+    """
+    if symbols is None:
+        symbols = load_tickers(config).to_symbols()
+
+    conn = sqlite3.connect(database_path(config.data_dir))
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        with conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {SOURCES_TABLE} "
+                "(file_name TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER)"
+            )
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {DAILY_RAW_TABLE} "
+                f"(symbol TEXT, date TEXT, close REAL, {TS_KEY} INTEGER)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_{DAILY_RAW_TABLE}_symbol_ts "
+                f"ON {DAILY_RAW_TABLE} (symbol, {TS_KEY})"
+            )
+        recorded = {
+            name: [mtime_ns, size]
+            for name, mtime_ns, size in conn.execute(
+                f"SELECT file_name, mtime_ns, size FROM {SOURCES_TABLE}"
+            )
+        }
+
+        sources = {dsname.value: dsname for dsname in DatasetName}
+        sources |= {DAILY_RAW_T.format(symbol=sym): sym for sym in symbols}
+        reloaded = []
+        for file_name, source in sources.items():
+            path = config.data_dir / file_name
+            signature = file_signature(path)
+            if signature is None or recorded.get(file_name) == signature:
+                continue
+            _forget(conn, file_name)
+            if isinstance(source, DatasetName):
+                _ingest_dataset(conn, path, source)
+            else:
+                _ingest_series(conn, path, source)
+            _remember(conn, file_name, signature)
+            reloaded.append(file_name)
+
+        # tickers dropped from tickers.yaml
+        dropped = [n for n in recorded if n not in sources]
+        for file_name in dropped:
+            _forget(conn, file_name)
+        if dropped:
+            placeholders = ",".join("?" * len(symbols))
+            with conn:
+                conn.execute(
+                    f"DELETE FROM {DAILY_RAW_TABLE} "
+                    f"WHERE symbol NOT IN ({placeholders})",
+                    symbols,
+                )
+
+        if reloaded:
+            with conn:
+                conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return reloaded
+
+
+def append_dataset_rows(
+    config: AppConfig,
+    dsname: DatasetName,
+    rows: pd.DataFrame,
+    *,
+    base_signature: list[int] | None,
+) -> bool:
+    """Insert rows just appended to a dataset's CSV; False if not applied.
+
+    Applied only when the table was ingested from the CSV as it was before
+    the append (`base_signature`), and then recorded against the CSV's new
+    signature, so an append costs O(rows) instead of a full reload. Otherwise
+    the next `ingest_database` reloads the file as usual.
+    """
+    path = database_path(config.data_dir)
+    if base_signature is None or not path.exists():
+        return False
+    conn = sqlite3.connect(path)
+    try:
+        table = table_name(dsname)
+        try:
+            recorded = conn.execute(
+                f"SELECT mtime_ns, size FROM {SOURCES_TABLE} WHERE file_name = ?",
+                (dsname.value,),
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return False
+        columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+        if recorded is None or list(recorded) != base_signature or not columns:
+            return False
+        visible = [c for c in columns if c not in (SYMBOL_KEY, TS_KEY)]
+        rows = _add_keys(rows.reindex(columns=visible), dsname)
+        signature = file_signature(config.data_dir / dsname.value)
+        with conn:
+            rows.to_sql(table, conn, if_exists="append", index=False)
+            conn.execute(
+                f"INSERT OR REPLACE INTO {SOURCES_TABLE} VALUES (?, ?, ?)",
+                (dsname.value, *signature),
+            )
+        return True
+    finally:
+        conn.close()
+
+
+def database_is_stale(config: AppConfig, symbols: list[str]) -> bool:
+    """True when any source file is missing from, or newer than, the database."""
+    conn = _connection(config.data_dir)
+    if conn is None:
+        return True
+    names = [ds.value for ds in DatasetName]
+    names += [DAILY_RAW_T.format(symbol=s) for s in symbols]
+    return any(
+        file_signature(config.data_dir / n) is not None
+        and not _is_fresh(conn, config.data_dir, n)
+        for n in names
+    )
+
+
+# --- queries ---
+
+
+@dataclass(frozen=True)
+class DatasetQuery:
+    """Projection, row filters, ordering and paging for `query_dataset`.
+
+    Filters mean the same as in `load_dataset`: `symbols` matches the
+    dataset's symbol field case-insensitively and `date_range` is inclusive,
+    with `end` covering the whole day. Rows with a missing `order_by` value
+    sort last.
+    """
+
+    columns: tuple[str, ...] | None = None
+    symbols: tuple[str, ...] | None = None
+    date_range: tuple[Date | None, Date | None] | None = None
+    order_by: str | None = None
+    descending: bool = False
+    limit: int | None = None
+    offset: int = 0
+
+
+_local = threading.local()
+
+
+def _connection(data_dir: Path) -> sqlite3.Connection | None:
+    """This thread's read connection to the serving database, if it exists."""
+    path = database_path(data_dir)
+    conns: dict[Path, sqlite3.Connection] = getattr(_local, "conns", None) or {}
+    _local.conns = conns
+    conn = conns.get(path)
+    if conn is None:
+        if not path.exists():
+            return None
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA query_only=ON")
+        conns[path] = conn
+    return conn
+
+
+def _is_fresh(conn: sqlite3.Connection, data_dir: Path, file_name: str) -> bool:
+    try:
+        row = conn.execute(
+            f"SELECT mtime_ns, size FROM {SOURCES_TABLE} WHERE file_name = ?",
+            (file_name,),
+        ).fetchone()
+    except sqlite3.OperationalError:
+        return False
+    return row is not None and list(row) == file_signature(data_dir / file_name)
+
+
+def _fresh_table(
+    config: AppConfig, dsname: DatasetName
+) -> tuple[sqlite3.Connection, str, list[str]] | None:
+    """(connection, table, column names) when the table can serve queries."""
+    conn = _connection(config.data_dir)
+    if conn is None or not _is_fresh(conn, config.data_dir, dsname.value):
+        return None
+    table = table_name(dsname)
+    columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+    return (conn, table, columns) if columns else None
+
+
+def _where(query: DatasetQuery, columns: list[str]) -> tuple[str, list]:
+    clauses: list[str] = []
+    params: list = []
+    if query.symbols is not None and SYMBOL_KEY in columns:
+        symbols = sorted({s.upper() for s in query.symbols})
+        if symbols:
+            clauses.append(f"{SYMBOL_KEY} IN ({','.join('?' * len(symbols))})")
+            params += symbols
+        else:
+            clauses.append("0")
+    if query.date_range is not None and TS_KEY in columns:
+        start, end = query.date_range
+        if start is not None:
+            clauses.append(f"{TS_KEY} >= ?")
+            params.append(_day_start(start))
+        if end is not None:
+            clauses.append(f"{TS_KEY} < ?")
+            params.append(_day_start(end) + _DAY_S)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+
+def _query_sqlite(
+    config: AppConfig, dsname: DatasetName, query: DatasetQuery
+) -> pd.DataFrame | None:
+    fresh = _fresh_table(config, dsname)
+    if fresh is None:
+        return None
+    conn, table, table_columns = fresh
+    visible = [c for c in table_columns if c not in (SYMBOL_KEY, TS_KEY)]
+    wanted = set(query.columns) if query.columns is not None else None
+    select = [c for c in visible if wanted is None or c in wanted]
+    if not select:
+        return pd.DataFrame()
+
+    where, params = _where(query, table_columns)
+    sql = f'SELECT {", ".join(_quote(c) for c in select)} FROM "{table}"{where}'
+    if query.order_by in visible:
+        key = query.order_by
+        if key == DATASET_DATE_FIELDS.get(dsname) and TS_KEY in table_columns:
+            key = TS_KEY  # indexed, and orders by instant rather than text
+        direction = "DESC" if query.descending else "ASC"
+        sql += f' ORDER BY "{key}" IS NULL, "{key}" {direction}, rowid'
+    if query.limit is not None or query.offset:
+        sql += " LIMIT ? OFFSET ?"
+        params += [query.limit if query.limit is not None else -1, query.offset]
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def _query_pandas(
+    config: AppConfig, dsname: DatasetName, query: DatasetQuery
+) -> pd.DataFrame | None:
+    columns = query.columns
+    if columns is not None and query.order_by is not None:
+        columns = (*columns, query.order_by)
+    df = load_dataset(
+        dsname,
+        config=config,
+        columns=columns,
+        date_range=query.date_range,
+        symbols=query.symbols,
+    )
+    if df is None:
+        return None
+    if query.order_by in df.columns:
+        key = None
+        if query.order_by == DATASET_DATE_FIELDS.get(dsname):
+            key = lambda s: pd.to_datetime(s, errors="coerce", utc=True)
+        df = df.sort_values(
+            query.order_by,
+            ascending=not query.descending,
+            na_position="last",
+            kind="stable",
+            key=key,
+        )
+    stop = query.offset + query.limit if query.limit is not None else None
+    df = df.iloc[query.offset : stop]
+    if query.columns is not None:
+        df = df.loc[:, [c for c in df.columns if c in query.columns]]
+    return df.reset_index(drop=True)
+
+
+def read_dataset(
+    dsname: DatasetName, *, config: AppConfig, query: DatasetQuery = DatasetQuery()
+) -> pd.DataFrame | None:
+    """Uncached `query_dataset`, for callers that keep their own derived copy."""
+    df = _query_sqlite(config, dsname, query)
+    return df if df is not None else _query_pandas(config, dsname, query)
+
+
+# the cached readers take the dataset's ID (`finance_daily.generation.dataset_id`),
+# which only keys the cache
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _query_dataset(
+    dsname: DatasetName, config: AppConfig, query: DatasetQuery, generation: str
+) -> pd.DataFrame | None:
+    record_miss("query_dataset")
+    return read_dataset(dsname, config=config, query=query)
+
+
+@traced("query_dataset", cached=True)
+def query_dataset(
+    dsname: DatasetName, *, config: AppConfig, query: DatasetQuery = DatasetQuery()
+) -> pd.DataFrame | None:
+    """Rows of a dataset matching `query`; None if there is no local file."""
+    return _query_dataset(dsname, config, query, dataset_id(config.data_dir, dsname))
+
+
+def count_rows(
+    dsname: DatasetName, *, config: AppConfig, query: DatasetQuery = DatasetQuery()
+) -> int:
+    """Rows matching `query`'s filters, ignoring its ordering and paging."""
+    return _count_rows(dsname, config, query, dataset_id(config.data_dir, dsname))
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _count_rows(
+    dsname: DatasetName, config: AppConfig, query: DatasetQuery, generation: str
+) -> int:
+    fresh = _fresh_table(config, dsname)
+    if fresh is not None:
+        conn, table, table_columns = fresh
+        where, params = _where(query, table_columns)
+        return conn.execute(f'SELECT COUNT(*) FROM "{table}"{where}', params).fetchone()[0]
+    df = _query_pandas(
+        config, dsname, DatasetQuery(symbols=query.symbols, date_range=query.date_range)
+    )
+    return 0 if df is None else len(df)
+
+
+def date_bounds(dsname: DatasetName, *, config: AppConfig) -> tuple[Date, Date] | None:
+    """(earliest, latest) day of the dataset's date field, None if unknown."""
+    return _date_bounds(dsname, config, dataset_id(config.data_dir, dsname))
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _date_bounds(
+    dsname: DatasetName, config: AppConfig, generation: str
+) -> tuple[Date, Date] | None:
+    date_col = DATASET_DATE_FIELDS.get(dsname)
+    if date_col is None:
+        return None
+    fresh = _fresh_table(config, dsname)
+    if fresh is not None:
+        conn, table, table_columns = fresh
+        if TS_KEY in table_columns:
+            lo, hi = conn.execute(
+                f'SELECT MIN({TS_KEY}), MAX({TS_KEY}) FROM "{table}"'
+            ).fetchone()
+            if lo is None:
+                return None
+            to_day = lambda s: datetime.fromtimestamp(s, tz=timezone.utc).date()
+            return to_day(lo), to_day(hi)
+    df = load_dataset(dsname, config=config, columns=[date_col])
+    if df is None or date_col not in df.columns:
+        return None
+    parsed = pd.to_datetime(df[date_col], errors="coerce", utc=True).dropna()
+    if parsed.empty:
+        return None
+    return parsed.min().date(), parsed.max().date()
+
+
+def query_series(
+    config: AppConfig,
+    symbols: list[str],
+    date_range: tuple[Date | None, Date | None] | None = None,
+) -> pd.DataFrame:
+    """(symbol, date, close) rows for several tickers, ordered by symbol, date."""
+    conn = _connection(config.data_dir)
+    file_names = {s.upper(): DAILY_RAW_T.format(symbol=s.upper()) for s in symbols}
+    if conn is not None and all(
+        _is_fresh(conn, config.data_dir, f) for f in file_names.values()
+    ):
+        query = DatasetQuery(date_range=date_range)
+        where, params = _where(query, [TS_KEY])
+        placeholders = ",".join("?" * len(file_names))
+        where += (" AND " if where else " WHERE ") + f"symbol IN ({placeholders})"
+        df = pd.read_sql_query(
+            f"SELECT symbol, date, close FROM {DAILY_RAW_TABLE}{where} "
+            f"ORDER BY symbol, {TS_KEY}",
+            conn,
+            params=[*params, *file_names],
+        )
+        df["date"] = pd.to_datetime(df["date"])
+        return df
+
+    frames = []
+    for sym, file_name in sorted(file_names.items()):
+        path = config.data_dir / file_name
+        read = read_close_rows(path) if path.exists() else None
+        if read is None:
+            continue
+        dates, close = read
+        frame = pd.DataFrame(
+            {"symbol": sym, "date": pd.DatetimeIndex(dates), "close": close}
+        )
+        if date_range is not None:
+            start, end = date_range
+            if start is not None:
+                frame = frame[frame["date"] >= pd.Timestamp(start)]
+            if end is not None:
+                frame = frame[frame["date"] < pd.Timestamp(end) + pd.Timedelta(days=1)]
+        frames.append(frame)
+    columns = ["symbol", DailyRawFields.DATE.value, DailyRawFields.CLOSE.value]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True).loc[:, columns]
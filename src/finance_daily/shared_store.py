@@ -0,0 +1,328 @@
+"""Memory-mapped copies of the parsed datasets, shared by all app workers.
+
+The store is built once (by the production supervisor, and again whenever the
+data changes) and every worker process maps the same files, so the OS page
+cache holds a single copy instead of one private DataFrame per worker:
+
+    <root>/gen-<ns>/<dataset>.arrow   Arrow IPC file per `DatasetName`
+    <root>/gen-<ns>/panel_close.npy   `PricePanel.close`
+    <root>/gen-<ns>/panel_dates.npy   `PricePanel.dates`
+    <root>/gen-<ns>/group_index.npy   group index levels on the panel dates
+    <root>/gen-<ns>/manifest.json     source file signatures, panel symbols
+    <root>/current -> gen-<ns>        swapped atomically after each build
+
+Readers only use an entry while its source CSV still has the (mtime, size)
+recorded in the manifest; otherwise callers fall back to parsing the CSV.
+Files whose source did not change are hard links into the previous generation.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from finance_daily.config import AppConfig
+from finance_daily.constants import DAILY_RAW_T, DatasetName
+from finance_daily.csv_stream import csv_to_arrow
+from finance_daily.group_index import (
+    GroupIndexDef,
+    compute_levels,
+    extend_levels,
+    group_index_defs,
+    levels_frame,
+)
+from finance_daily.price_panel import AppendedRows, PricePanel, build_price_panel
+
+SHARED_STORE_DIR = ".shared_store"
+MANIFEST_F = "manifest.json"
+CURRENT_LINK = "current"
+PANEL_CLOSE_F = "panel_close.npy"
+PANEL_DATES_F = "panel_dates.npy"
+GROUP_INDEX_F = "group_index.npy"
+# older generations kept so readers that still map them are not surprised
+KEEP_GENERATIONS = 2
+
+
+def store_root(data_dir: Path) -> Path:
+    # memory-mapped files are shared through the OS page cache, so a regular
+    # directory next to the data works; mount it as tmpfs to skip the disk
+    return data_dir / SHARED_STORE_DIR
+
+
+def file_signature(path: Path) -> list[int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _arrow_file(gen_dir: Path, dsname: DatasetName) -> Path:
+    return gen_dir / f"{dsname.value}.arrow"
+
+
+def _swap_current(root: Path, gen_dir: Path) -> None:
+    tmp = root / f".{CURRENT_LINK}.{os.getpid()}"
+    if tmp.is_symlink():
+        tmp.unlink()
+    os.symlink(gen_dir.name, tmp)
+    os.replace(tmp, root / CURRENT_LINK)
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    # generations are immutable, so an unchanged file can be shared by both
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _prune(root: Path) -> None:
+    generations = sorted(p for p in root.glob("gen-*") if p.is_dir())
+    for old in generations[:-KEEP_GENERATIONS]:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def build_shared_store(
+    config: AppConfig,
+    symbols: list[str] | None = None,
+    appended: dict[str, AppendedRows] | None = None,
+) -> Path:
+    """Write a new store generation and make it current.
+
+    Datasets whose source is unchanged since the current generation are
+    linked rather than re-parsed. `appended` (from a delta fetch) lets the
+    price panel and group indices be extended in place of re-reading every
+    series file.
+    """
+    from finance_daily.utils import load_tickers
+
+    tickers = load_tickers(config)
+    previous = current_generation(config.data_dir)
+    prev_sources = previous.manifest.get("sources", {}) if previous else {}
+    root = store_root(config.data_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    gen_dir = root / f"gen-{time.time_ns()}"
+    gen_dir.mkdir()
+
+    sources: dict[str, list[int] | None] = {}
+    for dsname in DatasetName:
+        src = config.data_dir / dsname.value
+        # signature first: if the file changes while we read it, the entry
+        # simply won't match and readers fall back to the CSV
+        signature = file_signature(src)
+        if signature is None:
+            continue
+        target = _arrow_file(gen_dir, dsname)
+        if previous is not None and prev_sources.get(dsname.value) == signature:
+            _link_or_copy(_arrow_file(previous.path, dsname), target)
+        else:
+            # streamed in chunks: memory stays flat however large the file
+            csv_to_arrow(src, target)
+        sources[dsname.value] = signature
+
+    if symbols is None:
+        symbols = tickers.to_symbols()
+    for sym in symbols:
+        file_name = DAILY_RAW_T.format(symbol=sym)
+        sources[file_name] = file_signature(config.data_dir / file_name)
+    panel = _write_panel(config, gen_dir, symbols, previous, sources, appended or {})
+    defs = group_index_defs(tickers)
+    _write_group_index(gen_dir, panel, defs, previous)
+
+    manifest = {
+        "created_at": time.time(),
+        "sources": sources,
+        "symbols": list(symbols),
+        "group_indices": [d.to_json() for d in defs],
+    }
+    (gen_dir / MANIFEST_F).write_text(json.dumps(manifest), encoding="utf-8")
+    _swap_current(root, gen_dir)
+    _prune(root)
+    return gen_dir
+
+
+def _write_panel(
+    config: AppConfig,
+    gen_dir: Path,
+    symbols: list[str],
+    previous: StoreGeneration | None,
+    sources: dict[str, list[int] | None],
+    appended: dict[str, AppendedRows],
+) -> PricePanel:
+    reusable = previous is not None and list(
+        previous.manifest.get("symbols", [])
+    ) == list(symbols)
+    changed = []
+    if reusable:
+        prev_sources = previous.manifest.get("sources", {})
+        for sym in symbols:
+            file_name = DAILY_RAW_T.format(symbol=sym)
+            before, now = prev_sources.get(file_name), sources.get(file_name)
+            if before == now:
+                continue
+            changed.append(sym)
+            # only rows appended to exactly the file the panel was built from
+            rows = appended.get(sym)
+            if rows is None or before is None or before[1] != rows.base_size:
+                reusable = False
+                break
+
+    if reusable and not changed:
+        _link_or_copy(previous.path / PANEL_CLOSE_F, gen_dir / PANEL_CLOSE_F)
+        _link_or_copy(previous.path / PANEL_DATES_F, gen_dir / PANEL_DATES_F)
+        return previous.panel()
+    if reusable:
+        panel = previous.panel().with_appended({s: appended[s] for s in changed})
+    else:
+        panel = build_price_panel(config.data_dir, symbols)
+    np.save(gen_dir / PANEL_CLOSE_F, panel.close)
+    np.save(gen_dir / PANEL_DATES_F, panel.dates)
+    return panel
+
+
+def _write_group_index(
+    gen_dir: Path,
+    panel: PricePanel,
+    defs: list[GroupIndexDef],
+    previous: StoreGeneration | None,
+) -> None:
+    prev_levels = None
+    if previous is not None and previous.manifest.get("group_indices") == [
+        d.to_json() for d in defs
+    ]:
+        prev_levels = previous.group_levels()
+    if prev_levels is None:
+        levels = compute_levels(panel, defs)
+    elif panel is previous.panel():
+        _link_or_copy(previous.path / GROUP_INDEX_F, gen_dir / GROUP_INDEX_F)
+        return
+    else:
+        levels = extend_levels(prev_levels, previous.panel(), panel, defs)
+    np.save(gen_dir / GROUP_INDEX_F, levels)
+
+
+@dataclass
+class StoreGeneration:
+    path: Path
+    manifest: dict
+    _panel: PricePanel | None = field(default=None, repr=False)
+
+    def is_fresh(self, data_dir: Path, file_name: str) -> bool:
+        recorded = self.manifest.get("sources", {}).get(file_name)
+        return recorded is not None and recorded == file_signature(data_dir / file_name)
+
+    def panel(self) -> PricePanel:
+        if self._panel is None:
+            self._panel = PricePanel(
+                dates=np.load(self.path / PANEL_DATES_F, mmap_mode="r"),
+                symbols=tuple(self.manifest.get("symbols", [])),
+                close=np.load(self.path / PANEL_CLOSE_F, mmap_mode="r"),
+            )
+        return self._panel
+
+    def group_levels(self) -> np.ndarray | None:
+        path = self.path / GROUP_INDEX_F
+        return np.load(path, mmap_mode="r") if path.exists() else None
+
+
+_generations: dict[Path, StoreGeneration] = {}
+_generations_lock = threading.Lock()
+
+
+def current_generation(data_dir: Path) -> StoreGeneration | None:
+    """The generation `current` points at, or None when no store was built."""
+    root = store_root(data_dir)
+    try:
+        target = os.readlink(root / CURRENT_LINK)
+    except OSError:
+        return None
+
+    with _generations_lock:
+        gen = _generations.get(root)
+        if gen is not None and gen.path.name == target:
+            return gen
+        try:
+            manifest = json.loads((root / target / MANIFEST_F).read_text("utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        gen = StoreGeneration(path=root / target, manifest=manifest)
+        _generations[root] = gen
+        return gen
+
+
+def store_is_stale(data_dir: Path, symbols: list[str]) -> bool:
+    """True when no store exists or any source file changed since the build."""
+    gen = current_generation(data_dir)
+    if gen is None or list(gen.manifest.get("symbols", [])) != list(symbols):
+        return True
+    recorded = gen.manifest.get("sources", {})
+    names = [ds.value for ds in DatasetName]
+    names += [DAILY_RAW_T.format(symbol=s) for s in symbols]
+    return any(recorded.get(n) != file_signature(data_dir / n) for n in names)
+
+
+def read_shared_dataset(
+    data_dir: Path,
+    dsname: DatasetName,
+    columns: tuple[str, ...] | None = None,
+) -> pd.DataFrame | None:
+    """Dataset from the shared store, or None if absent or stale.
+
+    Numeric columns stay backed by the shared memory map (`split_blocks`
+    avoids the copy that block consolidation would make).
+    """
+    gen = current_generation(data_dir)
+    if gen is None or not gen.is_fresh(data_dir, dsname.value):
+        return None
+    path = _arrow_file(gen.path, dsname)
+    if not path.exists():
+        return None
+
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    if columns is not None:
+        table = table.select([c for c in table.column_names if c in columns])
+    return table.to_pandas(split_blocks=True)
+
+
+def shared_price_panel(data_dir: Path, symbols: list[str]) -> PricePanel | None:
+    """The shared panel, if it covers `symbols` and none of their files changed."""
+    gen = current_generation(data_dir)
+    if gen is None or not set(symbols) <= set(gen.manifest.get("symbols", [])):
+        return None
+    for sym in symbols:
+        if not gen.is_fresh(data_dir, DAILY_RAW_T.format(symbol=sym)):
+            return None
+    return gen.panel()
+
+
+def shared_group_indices(
+    data_dir: Path, defs: list[GroupIndexDef]
+) -> pd.DataFrame | None:
+    """Group index levels from the store, if built for `defs` on fresh data."""
+    gen = current_generation(data_dir)
+    if gen is None or gen.manifest.get("group_indices") != [d.to_json() for d in defs]:
+        return None
+    panel = shared_price_panel(data_dir, list(gen.manifest.get("symbols", [])))
+    levels = gen.group_levels()
+    if panel is None or levels is None:
+        return None
+    return levels_frame(panel.dates, defs, levels)
+
+
+def shared_close_frame(data_dir: Path, symbol: str) -> pd.DataFrame | None:
+    """One ticker's (date, close) rows from the shared panel, if fresh."""
+    gen = current_generation(data_dir)
+    if gen is None or not gen.is_fresh(data_dir, DAILY_RAW_T.format(symbol=symbol)):
+        return None
+    return gen.panel().close_frame(symbol)
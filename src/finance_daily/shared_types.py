@@ -1,5 +1,5 @@
-from dataclasses import dataclass
-from typing import Dict, List
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Tuple
 
 
 @dataclass(slots=True)
@@ -7,23 +7,62 @@ class Ticker:
     symbol: str
     name: str | None
     currency: str = "USD"
+    # optional weight in its group's custom-weight index (tickers.yaml `weight:`)
+    weight: float | None = None
 
 
 @dataclass
 class ETLTickers:
+    """Tickers grouped as in tickers.yaml, with lookups precomputed.
+
+    Instances are shared between sessions by `utils.load_tickers`; treat
+    `tickers_dict` as read-only.
+    """
+
     tickers_dict: Dict[str, List[Ticker]]
+    _tickers: Tuple[Ticker, ...] = field(init=False, repr=False, compare=False)
+    _symbols: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _symbol_set: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    _by_symbol: Dict[str, Ticker] = field(init=False, repr=False, compare=False)
+    _group_symbols: Dict[str, Tuple[str, ...]] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._tickers = tuple(
+            ticker for group in self.tickers_dict.values() for ticker in group
+        )
+        self._symbols = tuple(ticker.symbol for ticker in self._tickers)
+        self._symbol_set = frozenset(self._symbols)
+        # first occurrence wins when a symbol is listed in several groups
+        self._by_symbol = {}
+        for ticker in self._tickers:
+            self._by_symbol.setdefault(ticker.symbol, ticker)
+        self._group_symbols = {
+            group_name: tuple(ticker.symbol for ticker in group)
+            for group_name, group in self.tickers_dict.items()
+        }
 
     def to_list(self) -> List[Ticker]:
-        return [ticker for group in self.tickers_dict.values() for ticker in group]
+        return list(self._tickers)
 
     def to_symbols(self) -> List[str]:
-        return [ticker.symbol for ticker in self.to_list()]
+        return list(self._symbols)
+
+    def to_symbol_set(self) -> FrozenSet[str]:
+        return self._symbol_set
+
+    def group_names(self) -> List[str]:
+        return list(self._group_symbols)
 
     def get_group(self, group_name: str) -> List[Ticker]:
         return self.tickers_dict.get(group_name, [])
 
     def get_group_symbols(self, group_name: str) -> List[str]:
-        return [ticker.symbol for ticker in self.get_group(group_name)]
+        return list(self._group_symbols.get(group_name, ()))
+
+    def get_ticker(self, symbol: str) -> Ticker | None:
+        return self._by_symbol.get(symbol)
 
     def has_symbol(self, symbol: str) -> bool:
-        return any(ticker.symbol == symbol for ticker in self.to_list())
+        return symbol in self._symbol_set
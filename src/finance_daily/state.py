@@ -3,54 +3,57 @@ import streamlit as st
 from finance_daily.context import AppContext
 from finance_daily.config import AppConfig
 from finance_daily.constants import DatasetName, ETLMetaFields
+from finance_daily.generation import generation_id
 from finance_daily.utils import load_dataset
-import pandas as pd
 
 _CTX_KEY = "app_ctx"
 _CONFIG_KEY = "config"
 
 
 def get_app_ctx() -> AppContext:
+    """This session's context, rebuilt whenever the data generation changes
+    (the ID the last fetch recorded, or a newer one for files changed since)."""
     ctx = st.session_state.get(_CTX_KEY)
-    if ctx is None:
+    if ctx is None or ctx.generation != generation_id(get_app_config().data_dir):
         ctx = update_app_ctx()
     return ctx
 
 
 def update_app_ctx() -> AppContext:
-
-    last_etl_timestamp = _load_etl_meta(get_app_config())
+    config = get_app_config()
+    generation = generation_id(config.data_dir)
+    last_etl_timestamp = _load_etl_meta(config)
     ctx = AppContext(
         lastest_data_date=last_etl_timestamp,
         # later tries to fetch the metadata to understand if the data is up to date
         last_fetch_ok=True,
         last_fetch_error=None,
+        generation=generation,
     )
     st.session_state[_CTX_KEY] = ctx
     return ctx
 
 
 def refresh_everything():
-    # 1) Clear Streamlit caches (only if you use @st.cache_data / @st.cache_resource)
-    try:
-        st.cache_data.clear()
-    except Exception:
-        pass
-    try:
-        st.cache_resource.clear()
-    except Exception:
-        pass
-
-    # 2) Clear your session_state context so it will be rebuilt
+    # caches are keyed by the version of their inputs, so new data is picked up
+    # without clearing them; only this session's context is rebuilt
     st.session_state.pop(_CTX_KEY, None)
-
-    # 3) Force rerun so UI immediately reflects new data
     st.rerun()
 
 
+_ETL_META_COLUMNS = (
+    ETLMetaFields.OVERALL_SUCCESS.value,
+    ETLMetaFields.LAST_ETL_TIMESTAMP.value,
+)
+
+
 def _load_etl_meta(config: AppConfig) -> datetime:
-    group1_df = load_dataset(DatasetName.DIM_META_GROUP1, config=config)
-    group2_df = load_dataset(DatasetName.DIM_META_GROUP2, config=config)
+    group1_df = load_dataset(
+        DatasetName.DIM_META_GROUP1, config=config, columns=_ETL_META_COLUMNS
+    )
+    group2_df = load_dataset(
+        DatasetName.DIM_META_GROUP2, config=config, columns=_ETL_META_COLUMNS
+    )
     if (
         group1_df[ETLMetaFields.OVERALL_SUCCESS.value].iloc[0] == 1
         and group2_df[ETLMetaFields.OVERALL_SUCCESS.value].iloc[0] == 1
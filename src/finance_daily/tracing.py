@@ -0,0 +1,190 @@
+"""Lightweight timing spans and counters for the page hot paths.
+
+Streamlit runs each session's script in its own thread, so the per-rerun
+buffers are thread-local: `begin_rerun()` resets them at the top of the app
+(and of each fragment-only rerun) and the debug panel reads them at the end.
+Threads that never call it (the API executor, the scheduler, the prewarm
+thread) record nothing per rerun, so nothing accumulates there. Process-wide
+totals are kept for every thread, for the JSONL / Prometheus-text exporter.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+
+F = TypeVar("F", bound=Callable)
+
+
+@dataclass(slots=True)
+class SpanRecord:
+    name: str
+    started_at: float
+    duration_s: float
+    depth: int
+
+
+class _RerunBuffer(threading.local):
+    def __init__(self) -> None:
+        self.spans: list[SpanRecord] = []
+        self.counters: Counter[str] = Counter()
+        self.depth = 0
+        # set by `begin_rerun()`; other threads only feed the process totals
+        self.active = False
+
+
+_buffer = _RerunBuffer()
+_totals_lock = threading.Lock()
+# span name -> [count, total seconds]
+_span_totals: dict[str, list[float]] = {}
+_counter_totals: Counter[str] = Counter()
+# names registered with `traced(..., cached=True)`
+_cached_names: set[str] = set()
+
+
+def begin_rerun() -> None:
+    """Start a fresh per-rerun buffer for the current script thread."""
+    _buffer.spans = []
+    _buffer.counters = Counter()
+    _buffer.depth = 0
+    _buffer.active = True
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as `name`; nested spans are recorded with depth."""
+    depth = _buffer.depth
+    _buffer.depth = depth + 1
+    started_at = time.time()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - t0
+        _buffer.depth = depth
+        if _buffer.active:
+            _buffer.spans.append(SpanRecord(name, started_at, duration, depth))
+        with _totals_lock:
+            totals = _span_totals.setdefault(name, [0, 0.0])
+            totals[0] += 1
+            totals[1] += duration
+
+
+def count(name: str, n: int = 1) -> None:
+    if _buffer.active:
+        _buffer.counters[name] += n
+    with _totals_lock:
+        _counter_totals[name] += n
+
+
+def record_miss(name: str) -> None:
+    """Call from inside a cached function body: it only runs on a cache miss."""
+    count(f"{name}.misses")
+
+
+def register_cache(name: str) -> None:
+    """Report `<name>.calls` / `<name>.misses` as a cache without timing spans,
+    for lookups too frequent and cheap for `traced`."""
+    _cached_names.add(name)
+
+
+def traced(name: str, *, cached: bool = False) -> Callable[[F], F]:
+    """Decorator: time each call as span `name` and count it as `<name>.calls`.
+
+    For cache hit ratios apply it with `cached=True` outside `st.cache_data`
+    and call `record_miss` in the body; the cached function's `clear()` stays
+    reachable.
+    """
+    if cached:
+        _cached_names.add(name)
+
+    def deco(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            count(f"{name}.calls")
+            with span(name):
+                return fn(*args, **kwargs)
+
+        if hasattr(fn, "clear"):
+            wrapper.clear = fn.clear
+        return wrapper  # type: ignore[return-value]
+
+    return deco
+
+
+def rerun_spans() -> list[SpanRecord]:
+    """Spans recorded since the last `begin_rerun()`, in start order."""
+    return sorted(_buffer.spans, key=lambda s: s.started_at)
+
+
+def rerun_counters() -> dict[str, int]:
+    return dict(_buffer.counters)
+
+
+def cache_hit_ratios(counters: dict[str, int]) -> dict[str, tuple[int, int, float]]:
+    """Map cache name -> (calls, misses, hit_ratio) from `.calls`/`.misses` counters."""
+    out = {}
+    for key, calls in counters.items():
+        if not key.endswith(".calls") or calls == 0:
+            continue
+        name = key.removesuffix(".calls")
+        if name not in _cached_names:
+            continue
+        misses = counters.get(f"{name}.misses", 0)
+        out[name] = (calls, misses, 1.0 - misses / calls)
+    return out
+
+
+def process_totals() -> tuple[dict[str, tuple[int, float]], dict[str, int]]:
+    """Process-wide (span name -> (count, total seconds), counters)."""
+    with _totals_lock:
+        spans = {name: (int(c), s) for name, (c, s) in _span_totals.items()}
+        counters = dict(_counter_totals)
+    return spans, counters
+
+
+def _prometheus_text() -> str:
+    spans, counters = process_totals()
+    lines = [
+        "# HELP finance_daily_span_seconds Time spent in instrumented spans.",
+        "# TYPE finance_daily_span_seconds summary",
+    ]
+    for name, (n, total) in sorted(spans.items()):
+        lines.append(f'finance_daily_span_seconds_count{{span="{name}"}} {n}')
+        lines.append(f'finance_daily_span_seconds_sum{{span="{name}"}} {total:.6f}')
+    lines += [
+        "# HELP finance_daily_events_total Instrumented event counters.",
+        "# TYPE finance_daily_events_total counter",
+    ]
+    for name, n in sorted(counters.items()):
+        lines.append(f'finance_daily_events_total{{name="{name}"}} {n}')
+    return "\n".join(lines) + "\n"
+
+
+def export(path: Path) -> None:
+    """Write telemetry to `path`.
+
+    A `.prom` path is rewritten with the process-wide totals in Prometheus text
+    format (for a node-exporter textfile collector); any other path gets this
+    rerun's spans appended as JSON lines.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == ".prom":
+        tmp = path.with_suffix(f".prom.{os.getpid()}.tmp")
+        tmp.write_text(_prometheus_text(), encoding="utf-8")
+        tmp.replace(path)
+        return
+
+    pid = os.getpid()
+    thread = threading.get_ident()
+    with path.open("a", encoding="utf-8") as f:
+        for rec in rerun_spans():
+            f.write(json.dumps({**asdict(rec), "pid": pid, "thread": thread}) + "\n")
@@ -1,32 +1,280 @@
 import streamlit as st
+import threading
+from datetime import date as Date
 from pathlib import Path
+from typing import Iterable
 import yaml
 import pandas as pd
 from finance_daily.config import AppConfig
+from finance_daily.generation import dataset_id
 from finance_daily.shared_types import ETLTickers, Ticker
-from finance_daily.constants import TICKERS_F, DatasetName
+from finance_daily.shared_store import current_generation, read_shared_dataset
+from finance_daily.tracing import record_miss, traced
+from finance_daily.constants import (
+    TICKERS_F,
+    DATASET_DATE_FIELDS,
+    DATASET_SYMBOL_FIELDS,
+    DatasetName,
+)
+
+# rows parsed per chunk when row filters are applied while reading
+CSV_CHUNK_ROWS = 200_000
+
+# libyaml's loader is several times faster when PyYAML was built against it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# process-wide ticker registry: path -> ((mtime_ns, size), tickers)
+_TICKERS_CACHE: dict[Path, tuple[tuple[int, int], ETLTickers]] = {}
+_TICKERS_LOCK = threading.Lock()
+
+
+def _date_mask(
+    values: pd.Series, start: Date | None, end: Date | None
+) -> pd.Series:
+    """Inclusive date-range mask; `end` covers the whole day."""
+    parsed = pd.to_datetime(values, errors="coerce", utc=True)
+    mask = parsed.notna()
+    if start is not None:
+        mask &= parsed >= pd.Timestamp(start).tz_localize("UTC")
+    if end is not None:
+        mask &= parsed < pd.Timestamp(end).tz_localize("UTC") + pd.Timedelta(days=1)
+    return mask
+
+
+def _row_mask(
+    df: pd.DataFrame,
+    *,
+    date_col: str | None,
+    date_range: tuple[Date | None, Date | None] | None,
+    symbol_col: str | None,
+    symbol_set: set[str] | None,
+) -> pd.Series:
+    mask = pd.Series(True, index=df.index)
+    if date_col is not None and date_range is not None and date_col in df.columns:
+        mask &= _date_mask(df[date_col], *date_range)
+    if symbol_set is not None and symbol_col in df.columns:
+        mask &= df[symbol_col].astype(str).str.strip().str.upper().isin(symbol_set)
+    return mask
+
+
+def filter_frame(
+    df: pd.DataFrame,
+    *,
+    columns: Iterable[str] | None = None,
+    date_col: str | None = None,
+    date_range: tuple[Date | None, Date | None] | None = None,
+    symbol_col: str | None = None,
+    symbols: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    """Apply the same projection and row filters as `read_table` to a frame."""
+    if date_range is not None and all(bound is None for bound in date_range):
+        date_range = None
+    symbol_set = {s.upper() for s in symbols} if symbols is not None else None
+    if date_range is not None or symbol_set is not None:
+        mask = _row_mask(
+            df,
+            date_col=date_col,
+            date_range=date_range,
+            symbol_col=symbol_col,
+            symbol_set=symbol_set,
+        )
+        df = df[mask].reset_index(drop=True)
+    if columns is not None:
+        wanted = set(columns)
+        df = df.loc[:, [c for c in df.columns if c in wanted]]
+    return df
+
+
+@traced("read_table")
+def read_table(
+    path: Path,
+    *,
+    columns: Iterable[str] | None = None,
+    date_col: str | None = None,
+    date_range: tuple[Date | None, Date | None] | None = None,
+    symbol_col: str | None = None,
+    symbols: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    """Read a CSV keeping only the requested columns and matching rows.
+
+    Columns are projected through `usecols` so unused columns are never
+    parsed. Row filters are applied chunk by chunk, so non-matching rows are
+    dropped before the result is assembled.
+    """
+    filter_dates = (
+        date_col is not None
+        and date_range is not None
+        and any(bound is not None for bound in date_range)
+    )
+    symbol_set = (
+        {s.upper() for s in symbols}
+        if symbol_col is not None and symbols is not None
+        else None
+    )
+
+    wanted = set(columns) if columns is not None else None
+    usecols = None
+    if wanted is not None:
+        # filter columns must be parsed even when the caller doesn't want them
+        read_cols = set(wanted)
+        if filter_dates:
+            read_cols.add(date_col)
+        if symbol_set is not None:
+            read_cols.add(symbol_col)
+        # a callable (unlike a list) tolerates columns missing from the file
+        usecols = read_cols.__contains__
+
+    if not filter_dates and symbol_set is None:
+        return pd.read_csv(path, usecols=usecols)
+
+    chunks: list[pd.DataFrame] = []
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=CSV_CHUNK_ROWS):
+        mask = _row_mask(
+            chunk,
+            date_col=date_col,
+            date_range=date_range if filter_dates else None,
+            symbol_col=symbol_col,
+            symbol_set=symbol_set,
+        )
+        chunks.append(chunk[mask])
+
+    df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    if wanted is not None:
+        df = df.loc[:, [c for c in df.columns if c in wanted]]
+    return df
+
+
+@traced("load_dataset", cached=True)
+def load_dataset(
+    dsname: DatasetName,
+    *,
+    config: AppConfig,
+    columns: Iterable[str] | None = None,
+    date_range: tuple[Date | None, Date | None] | None = None,
+    symbols: Iterable[str] | None = None,
+) -> pd.DataFrame | None:
+    """Load a dataset from `config.data_dir`, optionally projected and filtered.
+
+    `columns` limits which columns are parsed, `date_range` is an inclusive
+    (start, end) filter on the dataset's date field and `symbols` keeps only
+    rows whose symbol field is in the set. Each projection is cached separately,
+    per data generation.
+
+    When the shared store holds a fresh copy of the dataset (multi-worker
+    deployments, see `shared_store`) the result is a projection of the one
+    memory-mapped frame kept per store generation, not a private copy; with
+    Copy-on-Write, callers modifying it get their own copy.
+    """
+    columns = tuple(sorted(set(columns))) if columns is not None else None
+    date_range = tuple(date_range) if date_range is not None else None
+    symbols = (
+        tuple(sorted({s.upper() for s in symbols})) if symbols is not None else None
+    )
+    gen = current_generation(config.data_dir)
+    if gen is not None and gen.is_fresh(config.data_dir, dsname.value):
+        shared = _shared_dataset(config.data_dir, dsname, gen.path.name)
+        if shared is not None:
+            # a new frame over the same buffers, so writes copy rather than
+            # reach the cached one
+            return filter_frame(
+                shared.copy(deep=False),
+                **_dataset_filters(dsname, columns, date_range, symbols),
+            )
+    return _load_dataset(
+        dsname,
+        config=config,
+        generation=dataset_id(config.data_dir, dsname),
+        columns=columns,
+        date_range=date_range,
+        symbols=symbols,
+    )
+
+
+def _dataset_filters(
+    dsname: DatasetName,
+    columns: tuple[str, ...] | None,
+    date_range: tuple[Date | None, Date | None] | None,
+    symbols: tuple[str, ...] | None,
+) -> dict:
+    return dict(
+        columns=columns,
+        date_col=DATASET_DATE_FIELDS.get(dsname),
+        date_range=date_range,
+        symbol_col=DATASET_SYMBOL_FIELDS.get(dsname),
+        symbols=symbols,
+    )
+
+
+# `st.cache_resource` hands out the object itself; `st.cache_data` would pickle
+# the mapped frame into every entry and unpickle a private copy on every hit
+@st.cache_resource(show_spinner=False, max_entries=2 * len(DatasetName))
+def _shared_dataset(
+    data_dir: Path, dsname: DatasetName, store_generation: str
+) -> pd.DataFrame | None:
+    # `store_generation` only keys the cache, a new build maps the new files
+    record_miss("load_dataset")
+    return read_shared_dataset(data_dir, dsname)
 
 
 @st.cache_data(ttl=300)
-def load_dataset(dsname: DatasetName, *, config: AppConfig) -> pd.DataFrame | None:
+def _load_dataset(
+    dsname: DatasetName,
+    *,
+    config: AppConfig,
+    generation: str,
+    columns: tuple[str, ...] | None,
+    date_range: tuple[Date | None, Date | None] | None,
+    symbols: tuple[str, ...] | None,
+) -> pd.DataFrame | None:
+    record_miss("load_dataset")
     file_path = config.data_dir / dsname.value
     if not file_path.exists():
         return None
-    return pd.read_csv(file_path)
+    return read_table(
+        file_path, **_dataset_filters(dsname, columns, date_range, symbols)
+    )
 
 
 def load_yaml(path: Path):
     with path.open("r", encoding="utf-8") as f:
-        config = yaml.safe_load(f) or {}
+        config = yaml.load(f, Loader=_YAML_LOADER) or {}
     return config
 
 
-def load_tickers(config: AppConfig) -> ETLTickers:
-    tickers_raw = load_yaml(config.config_dir / TICKERS_F)
+def _parse_tickers(tickers_raw: dict) -> ETLTickers:
     tickers_dict = {}
     for group_name, group_tickers in tickers_raw.items():
         tickers_dict[group_name] = [
-            Ticker(symbol=ticker["symbol"].strip().upper(), name=ticker["name"])
+            Ticker(
+                symbol=ticker["symbol"].strip().upper(),
+                name=ticker["name"],
+                weight=(
+                    float(ticker["weight"]) if ticker.get("weight") is not None else None
+                ),
+            )
             for ticker in group_tickers
         ]
     return ETLTickers(tickers_dict=tickers_dict)
+
+
+def load_tickers(config: AppConfig) -> ETLTickers:
+    """Return the ticker registry, re-parsing tickers.yaml only when it changes.
+
+    The registry is shared process-wide (all sessions and the fetcher), keyed on
+    the file's mtime and size.
+    """
+    path = config.config_dir / TICKERS_F
+    stat = path.stat()
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    cached = _TICKERS_CACHE.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    with _TICKERS_LOCK:
+        cached = _TICKERS_CACHE.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        tickers = _parse_tickers(load_yaml(path))
+        _TICKERS_CACHE[path] = (version, tickers)
+    return tickers
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from finance_daily.csv_stream import (
+    CsvValidationError,
+    csv_to_arrow,
+    scan_csv,
+    validate_csv,
+)
+from finance_daily.scripts.bench import memory_check
+from finance_daily.scripts.synthetic import news_frame
+
+
+def test_scan_settles_dtypes_across_chunks(tmp_path):
+    path = tmp_path / "mixed.csv"
+    path.write_text("a,b,c\n1,1,x\n2,2,y\n,3,z\n4,four,w\n")
+
+    summary = scan_csv(path, chunk_rows=2)
+
+    assert summary.rows == 4
+    assert summary.columns == ("a", "b", "c")
+    # a gap in the second chunk makes the int column float, text makes str
+    assert summary.dtypes["a"] == "float64"
+    assert summary.dtypes["b"] == "str"
+
+
+def test_validate_csv_reports_missing_columns(tmp_path):
+    path = tmp_path / "news.csv"
+    path.write_text("title,url\nt,u\n")
+
+    with pytest.raises(CsvValidationError, match="missing columns"):
+        validate_csv(path, required=["title", "sentiment_score"])
+
+
+def test_csv_to_arrow_matches_whole_file_read(tmp_path):
+    src, target = tmp_path / "news.csv", tmp_path / "news.arrow"
+    news_frame(250, rng=np.random.default_rng(0)).to_csv(src, index=False)
+
+    rows = csv_to_arrow(src, target, chunk_rows=64)
+
+    converted = pa.ipc.open_file(pa.memory_map(str(target))).read_all().to_pandas()
+    expected = pd.read_csv(src)
+    assert rows == len(expected) == 250
+    pd.testing.assert_frame_equal(converted, expected, check_dtype=False)
+
+
+@pytest.mark.slow
+def test_conversion_memory_does_not_grow_with_file_size():
+    # measured in a fresh process, see `memory_check`
+    check = memory_check(0.5, ceiling_mb=256, timeout_s=900)
+
+    assert check["rows"] > 0
+    assert check["ok"], f"RSS grew {check['growth_mb']:.0f} MB converting 0.5 GB"
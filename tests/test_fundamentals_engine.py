@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance_daily.constants import FundamentalsFields as F, FundamentalsMetric as M
+from finance_daily.fundamentals_engine import (
+    QOQ_DAYS,
+    _lagged,
+    _trailing_sum,
+    build_fundamentals_table,
+)
+from finance_daily.price_panel import PricePanel
+
+# quarter ends; AAA skips 2023-09-30 (a reporting gap), BBB starts after
+AAA_PERIODS = ["2023-03-31", "2023-06-30", "2023-12-31", "2024-03-31", "2024-06-30"]
+BBB_PERIODS = ["2023-06-30", "2023-09-30", "2023-12-31", "2024-03-31"]
+
+
+def _grouped(*periods: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """Concatenated periods and each row's symbol start, like the table's."""
+    dates = np.concatenate([np.array(p, dtype="datetime64[ns]") for p in periods])
+    lengths = [len(p) for p in periods]
+    starts = np.cumsum([0, *lengths[:-1]])
+    return dates, np.repeat(starts, lengths)
+
+
+def test_trailing_sum_needs_four_consecutive_quarters_of_one_symbol():
+    periods, group_start = _grouped(AAA_PERIODS, BBB_PERIODS)
+    eps = np.array([1.0, 1.0, 1.0, 1.0, 1.0, 2.0, 2.0, 2.0, 2.0])
+
+    ttm = _trailing_sum(eps, periods, group_start, 4)
+
+    # AAA's four latest rows span the gap (over TTM_MAX_SPAN_DAYS); BBB's
+    # first window would reach back into AAA's rows
+    assert np.isnan(ttm[:5]).all()
+    assert np.isnan(ttm[5:8]).all()
+    assert ttm[8] == 8.0
+
+
+def test_trailing_sum_with_a_missing_value_is_nan():
+    periods, group_start = _grouped(BBB_PERIODS)
+    eps = np.array([1.0, np.nan, 1.0, 1.0])
+
+    assert np.isnan(_trailing_sum(eps, periods, group_start, 4)).all()
+
+
+def test_lagged_respects_reporting_gaps_and_symbol_boundaries():
+    periods, group_start = _grouped(AAA_PERIODS, BBB_PERIODS)
+    values = np.arange(9, dtype=np.float64)
+
+    prev = _lagged(values, periods, group_start, 1, QOQ_DAYS)
+
+    # row 2 follows a six-month gap, row 5 is BBB's first
+    expected = [np.nan, 0.0, np.nan, 2.0, 3.0, np.nan, 5.0, 6.0, 7.0]
+    np.testing.assert_array_equal(prev, expected)
+
+
+def _raw(rows: list[tuple]) -> pd.DataFrame:
+    return pd.DataFrame(
+        rows,
+        columns=[
+            F.SYMBOL.value,
+            F.FISCAL_DATE_ENDING.value,
+            F.TOTAL_REVENUE.value,
+            F.EPS.value,
+            F.TOTAL_SHAREHOLDER_EQUITY.value,
+            F.SHARES_OUTSTANDING.value,
+        ],
+    )
+
+
+def test_later_duplicate_of_a_symbol_period_wins():
+    df = _raw(
+        [
+            ("AAA", "2024-03-31", 100.0, 1.0, 50.0, 10.0),
+            (" aaa ", "2024-03-31", 120.0, 1.2, 60.0, 10.0),  # restated
+            ("AAA", "not a date", 1.0, 1.0, 1.0, 1.0),
+            (None, "2024-03-31", 1.0, 1.0, 1.0, 1.0),
+        ]
+    )
+
+    table = build_fundamentals_table(df)
+
+    assert table.symbols == ("AAA",)
+    frame = table.symbol_frame("AAA")
+    assert len(frame) == 1
+    assert frame[F.TOTAL_REVENUE.value].iloc[0] == 120.0
+    assert frame[M.BOOK_VALUE_PER_SHARE.value].iloc[0] == 6.0
+
+
+def test_repeated_index_labels_do_not_mix_rows():
+    df = pd.concat(
+        [
+            _raw([("AAA", "2024-03-31", 100.0, 1.0, 50.0, 10.0)]),
+            _raw([("BBB", "2024-03-31", 200.0, 2.0, 80.0, 10.0)]),
+        ]
+    )
+
+    table = build_fundamentals_table(df)
+
+    assert table.latest(["AAA", "BBB"])[F.TOTAL_REVENUE.value].tolist() == [
+        100.0,
+        200.0,
+    ]
+
+
+def test_negative_bases_give_nan_ratios():
+    df = _raw(
+        [
+            ("AAA", "2023-06-30", -50.0, -1.0, -20.0, 10.0),
+            ("AAA", "2023-09-30", 100.0, 0.5, -10.0, 10.0),
+            ("AAA", "2023-12-31", 110.0, 0.1, 30.0, 10.0),
+            ("AAA", "2024-03-31", 121.0, 0.2, 40.0, 10.0),
+        ]
+    )
+    panel = PricePanel(
+        dates=np.array(["2023-06-30", "2024-03-28"], dtype="datetime64[ns]"),
+        symbols=("AAA",),
+        close=np.array([[8.0], [20.0]]),
+    )
+
+    frame = build_fundamentals_table(df, panel.close_frame).symbol_frame("AAA")
+
+    qoq = frame[M.REVENUE_QOQ.value].to_numpy()
+    # growth from a negative revenue is not meaningful
+    assert np.isnan(qoq[:2]).all()
+    assert qoq[2:] == pytest.approx([0.1, 0.1])
+    # trailing EPS of -0.2 is a loss: no P/E; negative book: no P/B
+    assert frame[M.EPS_TTM.value].iloc[-1] == pytest.approx(-0.2)
+    assert np.isnan(frame[M.PE_TTM.value].iloc[-1])
+    assert np.isnan(frame[M.PRICE_TO_BOOK.value].iloc[:2]).all()
+    # the close on or before the period end (2024-03-31 was a weekend)
+    assert frame[M.PERIOD_CLOSE.value].iloc[-1] == 20.0
+    assert frame[M.PRICE_TO_BOOK.value].iloc[-1] == pytest.approx(20.0 / 4.0)
@@ -0,0 +1,76 @@
+import numpy as np
+
+from finance_daily.memory import LruCache, cache_usage, deep_size, session_usage
+
+
+def _array(n: int) -> np.ndarray:
+    return np.zeros(n, dtype=np.uint8)
+
+
+def test_evicts_least_recently_used_beyond_max_entries():
+    cache = LruCache("test_entries", max_entries=2, max_bytes=2**30)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get_or_compute("a", lambda: -1) == 1  # "a" is now the newest
+
+    cache.put("c", 3)
+
+    assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+    assert cache.get_or_compute("c", lambda: -1) == 3
+    usage = cache.usage()
+    assert usage.entries == 2
+    assert usage.evictions == 2  # "b", then "a" to make room for "b" again
+
+
+def test_evicts_until_under_max_bytes():
+    size = deep_size(_array(1000))
+    cache = LruCache("test_bytes", max_entries=100, max_bytes=int(size * 2.5))
+    for key in "abc":
+        cache.put(key, _array(1000))
+
+    usage = cache.usage()
+    assert usage.entries == 2
+    assert usage.bytes == 2 * size <= usage.max_bytes
+    assert cache.get_or_compute("a", lambda: None) is None  # evicted first
+
+
+def test_value_larger_than_max_bytes_is_returned_but_not_kept():
+    cache = LruCache("test_oversized", max_entries=10, max_bytes=100)
+    value = cache.get_or_compute("big", lambda: _array(10_000))
+
+    assert len(value) == 10_000
+    assert cache.usage().entries == 0
+
+
+def test_resize_evicts_immediately():
+    cache = LruCache("test_resize", max_entries=10, max_bytes=2**30)
+    for i in range(5):
+        cache.put(i, i)
+
+    cache.resize(max_entries=2, max_bytes=2**30)
+
+    assert cache.usage().entries == 2
+    assert cache.get_or_compute(4, lambda: -1) == 4
+
+
+def test_cache_usage_survives_missing_streamlit_internals(monkeypatch):
+    from streamlit.runtime.caching import cache_data_api
+
+    monkeypatch.delattr(cache_data_api, "_data_caches")
+
+    assert all(u.kind == "lru" for u in cache_usage())
+
+
+def _no_runtime():
+    raise RuntimeError("Runtime hasn't been created!")
+
+
+def test_session_usage_falls_back_to_the_current_session(monkeypatch):
+    from streamlit import runtime
+
+    monkeypatch.setattr(runtime, "exists", lambda: True)
+    monkeypatch.setattr(runtime, "get_instance", _no_runtime)
+
+    assert len(session_usage()) == 1
+    monkeypatch.setattr(runtime, "get_instance", lambda: object())
+    assert len(session_usage()) == 1
@@ -0,0 +1,172 @@
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+import numpy as np
+import pytest
+
+from finance_daily.constants import FetchMode
+from finance_daily.scripts.mock_source import MockSourceSpec, serve_mock_source
+from finance_daily.services import nightly_fetch
+from finance_daily.services.nightly_fetch import _fetch_series_file, read_local_tail
+
+HEADER = b"date,close\n"
+ROWS = [b"2024-01-02,10.0\n", b"2024-01-03,10.5\n", b"2024-01-04,11.0\n"]
+NEW_ROWS = [b"2024-01-05,11.5\n", b"2024-01-08,12.0\n"]
+FILE_NAME = "fact_all_daily_raw_AAA.csv"
+
+
+@pytest.fixture(autouse=True)
+def no_retry_sleep(monkeypatch):
+    monkeypatch.setattr(nightly_fetch, "RETRY_BACKOFF_S", 0.0)
+
+
+@pytest.fixture
+def dirs(tmp_path):
+    remote, local = tmp_path / "remote", tmp_path / "local"
+    remote.mkdir()
+    local.mkdir()
+    return remote, local
+
+
+def _write(path, *parts: bytes) -> bytes:
+    content = b"".join(parts)
+    path.write_bytes(content)
+    return content
+
+
+def test_tail_of_newline_terminated_file(tmp_path):
+    path = tmp_path / FILE_NAME
+    content = _write(path, HEADER, *ROWS)
+
+    tail = read_local_tail(path)
+
+    assert tail.size == len(content)
+    assert tail.header == HEADER
+    assert tail.last_row == ROWS[-1]
+    assert tail.last_date == "2024-01-04"
+    # the delta request starts exactly at the last row
+    assert content[tail.size - len(tail.last_row) :] == ROWS[-1]
+
+
+def test_tail_without_trailing_newline_cannot_be_extended(tmp_path):
+    path = tmp_path / FILE_NAME
+    _write(path, HEADER, *ROWS, b"2024-01-05,11.5")
+
+    assert read_local_tail(path) is None
+
+
+def test_tail_of_header_only_file(tmp_path):
+    path = tmp_path / FILE_NAME
+    _write(path, HEADER)
+
+    tail = read_local_tail(path)
+
+    assert tail.last_row == HEADER
+    assert tail.last_date is None
+
+
+def test_tail_of_missing_file_or_file_without_dates(tmp_path):
+    assert read_local_tail(tmp_path / FILE_NAME) is None
+    path = tmp_path / FILE_NAME
+    _write(path, b"day,close\n", b"1,2\n")
+    assert read_local_tail(path) is None
+
+
+def test_delta_appends_only_new_rows(dirs):
+    remote, local = dirs
+    remote_content = _write(remote / FILE_NAME, HEADER, *ROWS, *NEW_ROWS)
+    _write(local / FILE_NAME, HEADER, *ROWS)
+
+    with serve_mock_source(remote) as url:
+        stats, appended = _fetch_series_file(
+            url + FILE_NAME, local / FILE_NAME, FetchMode.DELTA
+        )
+
+    assert stats.ok and stats.mode == FetchMode.DELTA.value
+    assert stats.bytes == len(ROWS[-1]) + sum(map(len, NEW_ROWS))
+    assert (local / FILE_NAME).read_bytes() == remote_content
+    assert appended.base_size == len(HEADER) + sum(map(len, ROWS))
+    np.testing.assert_array_equal(
+        appended.dates, np.array(["2024-01-05", "2024-01-08"], dtype="datetime64[ns]")
+    )
+    np.testing.assert_array_equal(appended.close, [11.5, 12.0])
+
+
+def test_delta_with_nothing_new_leaves_the_file(dirs):
+    remote, local = dirs
+    _write(remote / FILE_NAME, HEADER, *ROWS)
+    local_content = _write(local / FILE_NAME, HEADER, *ROWS)
+
+    with serve_mock_source(remote) as url:
+        stats, appended = _fetch_series_file(
+            url + FILE_NAME, local / FILE_NAME, FetchMode.DELTA
+        )
+
+    assert stats.ok and stats.mode == FetchMode.DELTA.value
+    assert appended is None
+    assert (local / FILE_NAME).read_bytes() == local_content
+
+
+@pytest.mark.parametrize(
+    "remote_parts",
+    [
+        # the remote revised the local last row
+        [HEADER, *ROWS[:-1], b"2024-01-04,11.1\n", *NEW_ROWS],
+        # the remote is shorter than the local copy: 416
+        [HEADER, *ROWS[:-1]],
+        # the remote ends in a partial row
+        [HEADER, *ROWS, b"2024-01-05,1"],
+    ],
+    ids=["overlap-mismatch", "range-not-satisfiable", "partial-row"],
+)
+def test_delta_mismatch_falls_back_to_full_download(dirs, remote_parts):
+    remote, local = dirs
+    remote_content = _write(remote / FILE_NAME, *remote_parts)
+    _write(local / FILE_NAME, HEADER, *ROWS)
+
+    with serve_mock_source(remote) as url:
+        stats, appended = _fetch_series_file(
+            url + FILE_NAME, local / FILE_NAME, FetchMode.DELTA
+        )
+
+    assert stats.ok and stats.mode == FetchMode.FULL.value
+    assert appended is None
+    assert (local / FILE_NAME).read_bytes() == remote_content
+
+
+def test_server_ignoring_range_falls_back_to_full_download(dirs):
+    remote, local = dirs
+    remote_content = _write(remote / FILE_NAME, HEADER, *ROWS, *NEW_ROWS)
+    _write(local / FILE_NAME, HEADER, *ROWS)
+    # the stdlib handler answers every GET with 200 and the whole file
+    server = ThreadingHTTPServer(
+        ("127.0.0.1", 0), partial(SimpleHTTPRequestHandler, directory=str(remote))
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/{FILE_NAME}"
+        stats, appended = _fetch_series_file(url, local / FILE_NAME, FetchMode.DELTA)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert stats.ok and stats.mode == FetchMode.FULL.value
+    assert appended is None
+    assert (local / FILE_NAME).read_bytes() == remote_content
+
+
+def test_short_response_never_corrupts_the_local_copy(dirs):
+    remote, local = dirs
+    _write(remote / FILE_NAME, HEADER, *ROWS, *NEW_ROWS * 200)
+    local_content = _write(local / FILE_NAME, HEADER, *ROWS)
+
+    # every body is cut off halfway, the delta and the full download alike
+    with serve_mock_source(remote, MockSourceSpec(truncate_rate=1.0)) as url:
+        stats, appended = _fetch_series_file(
+            url + FILE_NAME, local / FILE_NAME, FetchMode.DELTA
+        )
+
+    assert not stats.ok
+    assert appended is None
+    assert (local / FILE_NAME).read_bytes() == local_content
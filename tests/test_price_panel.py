@@ -0,0 +1,78 @@
+import io
+
+import numpy as np
+import pytest
+
+from finance_daily.constants import DAILY_RAW_T
+from finance_daily.price_panel import AppendedRows, build_price_panel, read_close_rows
+
+HEADER = "date,close\n"
+
+
+def _rows(pairs: list[tuple[str, float]]) -> str:
+    return "".join(f"{d},{c}\n" for d, c in pairs)
+
+
+def _append(data_dir, symbol: str, pairs: list[tuple[str, float]]) -> AppendedRows:
+    # what a delta fetch does: append to the file, parse only the new rows
+    path = data_dir / DAILY_RAW_T.format(symbol=symbol)
+    base_size = path.stat().st_size
+    new = _rows(pairs)
+    with path.open("a") as f:
+        f.write(new)
+    dates, close = read_close_rows(io.BytesIO((HEADER + new).encode()))
+    return AppendedRows(base_size=base_size, dates=dates, close=close)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    series = {
+        "AAA": [("2024-01-02", 10.0), ("2024-01-03", 11.0), ("2024-01-04", 12.0)],
+        # lags behind: its appended rows fall inside the panel's dates
+        "BBB": [("2024-01-02", 20.0), ("2024-01-03", 21.0)],
+        # trades on a day the others don't
+        "CCC": [("2024-01-03", 30.0), ("2024-01-06", 31.0)],
+    }
+    for sym, pairs in series.items():
+        (tmp_path / DAILY_RAW_T.format(symbol=sym)).write_text(HEADER + _rows(pairs))
+    return tmp_path
+
+
+def test_with_appended_matches_a_full_rebuild(data_dir):
+    symbols = ["AAA", "BBB", "CCC", "MISSING"]
+    panel = build_price_panel(data_dir, symbols)
+    # shared panels are read-only memory maps
+    panel.close.setflags(write=False)
+    before = panel.close.copy()
+
+    appended = {
+        "AAA": _append(data_dir, "AAA", [("2024-01-05", 13.0), ("2024-01-08", 14.0)]),
+        "BBB": _append(data_dir, "BBB", [("2024-01-04", 22.0), ("2024-01-05", 23.0)]),
+        # rows for a symbol outside the panel are ignored
+        "ZZZ": AppendedRows(
+            base_size=0,
+            dates=np.array(["2024-01-09"], dtype="datetime64[ns]"),
+            close=np.array([1.0]),
+        ),
+    }
+    updated = panel.with_appended(appended)
+    rebuilt = build_price_panel(data_dir, symbols)
+
+    assert updated.symbols == rebuilt.symbols
+    np.testing.assert_array_equal(updated.dates, rebuilt.dates)
+    np.testing.assert_array_equal(updated.close, rebuilt.close)
+    np.testing.assert_array_equal(panel.close, before)
+
+
+def test_with_appended_nothing_new_keeps_the_panel(data_dir):
+    panel = build_price_panel(data_dir, ["AAA", "BBB"])
+    empty = AppendedRows(
+        base_size=0,
+        dates=np.array([], dtype="datetime64[ns]"),
+        close=np.array([], dtype="float64"),
+    )
+
+    updated = panel.with_appended({"AAA": empty})
+
+    np.testing.assert_array_equal(updated.dates, panel.dates)
+    np.testing.assert_array_equal(updated.close, panel.close)
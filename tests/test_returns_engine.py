@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from finance_daily import returns_engine
+from finance_daily.constants import DAILY_RAW_T
+from finance_daily.returns_engine import (
+    MIN_OBSERVATIONS,
+    ReturnsMatrix,
+    correlation_block,
+    load_returns,
+    pairwise_block,
+)
+
+SYMBOLS = ("AAA", "BBB", "CCC", "LATE", "GAPPY", "SHORT")
+
+
+@pytest.fixture
+def returns() -> ReturnsMatrix:
+    rng = np.random.default_rng(7)
+    n_days = 300
+    market = rng.normal(0, 0.01, n_days)
+    betas = (1.0, 0.5, 1.5, 1.2, 0.8, 1.0)
+    values = np.column_stack([b * market + rng.normal(0, 0.01, n_days) for b in betas])
+    values[rng.random(n_days) < 0.05, 0] = np.nan  # scattered gaps
+    values[:220, 3] = np.nan  # listed late
+    values[rng.random(n_days) < 0.4, 4] = np.nan  # mostly gaps
+    values[: n_days - MIN_OBSERVATIONS + 5, 5] = np.nan  # too short to count
+    return ReturnsMatrix(
+        dates=np.arange(n_days).astype("datetime64[D]").astype("datetime64[ns]"),
+        symbols=SYMBOLS,
+        values=values,
+    )
+
+
+def test_cov_and_corr_match_pandas_pairwise(returns):
+    frame = pd.DataFrame(returns.values, columns=list(returns.symbols))
+
+    block = pairwise_block(returns)
+
+    np.testing.assert_allclose(
+        block.cov, frame.cov(min_periods=MIN_OBSERVATIONS).to_numpy(), rtol=1e-9
+    )
+    np.testing.assert_allclose(
+        block.corr, frame.corr(min_periods=MIN_OBSERVATIONS).to_numpy(), rtol=1e-9
+    )
+    np.testing.assert_array_equal(
+        block.n_obs, frame.notna().astype(int).T @ frame.notna().astype(int)
+    )
+
+
+def test_pairs_with_too_few_observations_are_nan(returns):
+    block = pairwise_block(returns)
+
+    short = SYMBOLS.index("SHORT")
+    assert np.isnan(block.corr[short]).all()
+    assert np.isnan(block.cov[:, short]).all()
+    assert not np.isnan(block.corr[0, 1])
+
+
+@pytest.mark.parametrize("benchmark", ["AAA", "LATE"])
+def test_betas_match_pairwise_regression(returns, benchmark):
+    frame = pd.DataFrame(returns.values, columns=list(returns.symbols))
+
+    betas = pairwise_block(returns).betas(benchmark)
+
+    for sym in SYMBOLS:
+        if sym == benchmark:
+            continue
+        pair = frame[[sym, benchmark]].dropna()
+        if len(pair) < MIN_OBSERVATIONS:
+            assert np.isnan(betas[sym])
+            continue
+        expected = pair[sym].cov(pair[benchmark]) / pair[benchmark].var()
+        assert betas[sym] == pytest.approx(expected, rel=1e-9)
+    assert betas[benchmark] == pytest.approx(1.0)
+
+
+def test_groups_are_sliced_from_one_universe_matrix(tmp_path, monkeypatch):
+    rng = np.random.default_rng(3)
+    dates = pd.bdate_range("2024-01-01", periods=120).strftime("%Y-%m-%d")
+    universe = ("AAA", "BBB", "CCC")
+    for sym in universe:
+        close = 100 * np.cumprod(1 + rng.normal(0, 0.01, len(dates)))
+        pd.DataFrame({"date": dates, "close": close}).to_csv(
+            tmp_path / DAILY_RAW_T.format(symbol=sym), index=False
+        )
+    builds = []
+    build = returns_engine.build_price_panel
+    monkeypatch.setattr(
+        returns_engine,
+        "build_price_panel",
+        lambda data_dir, symbols: builds.append(symbols) or build(data_dir, symbols),
+    )
+    generation = returns_engine.series_id(tmp_path, universe)
+
+    blocks = {
+        group: correlation_block(
+            data_dir=tmp_path,
+            universe=universe,
+            symbols=group,
+            window=None,
+            generation=generation,
+        )
+        for group in [("AAA", "BBB"), ("CCC", "AAA"), universe]
+    }
+
+    assert builds == [list(universe)]
+    whole = load_returns(tmp_path, universe)
+    for group, block in blocks.items():
+        assert block.symbols == group
+        np.testing.assert_array_equal(
+            block.corr, pairwise_block(whole.select(group, None)).corr
+        )
@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta, timezone
+import json
+
+import pytest
+
+from finance_daily.config import AppConfig
+from finance_daily.constants import FETCH_HISTORY_F
+from finance_daily.services import scheduler as scheduler_mod
+from finance_daily.services.scheduler import (
+    FAILURE_RETRY_S,
+    MAX_FAILURE_RETRY_S,
+    FetchJob,
+    Schedule,
+    Scheduler,
+)
+
+
+@pytest.fixture
+def config(tmp_path):
+    return AppConfig(data_dir=tmp_path, config_dir=tmp_path)
+
+
+def _scheduler(config: AppConfig) -> Scheduler:
+    jobs = (
+        FetchJob(name="prices", datasets=None, every=timedelta(hours=24)),
+        FetchJob(
+            name="news",
+            datasets=None,
+            every=timedelta(minutes=10),
+            action="poll_news",
+        ),
+    )
+    return Scheduler(config, Schedule(jobs=jobs))
+
+
+def test_failing_job_backs_off_without_stopping_the_others(config, monkeypatch):
+    polls = []
+
+    def poll(cfg):
+        polls.append(cfg)
+        return object()  # None would mean the fetch lock was held
+
+    def broken_fetch(*_args, **_kwargs):
+        raise RuntimeError("source down")
+
+    monkeypatch.setattr(scheduler_mod, "run_fetch", broken_fetch)
+    monkeypatch.setattr(scheduler_mod, "poll_news", poll)
+    sched = _scheduler(config)
+
+    sched.run_due(datetime.now(timezone.utc))
+
+    # the news job still ran and is recorded; prices waits for its retry
+    assert len(polls) == 1
+    state = json.loads((config.data_dir / "scheduler_state.json").read_text())
+    assert set(state) == {"news"}
+    delays = [(sched._retry_at["prices"] - datetime.now(timezone.utc)).total_seconds()]
+    for _ in range(3):
+        sched.run_due(sched._retry_at["prices"])
+        delays.append(
+            (sched._retry_at["prices"] - datetime.now(timezone.utc)).total_seconds()
+        )
+    assert sched._failures["prices"] == 4
+    assert delays[0] == pytest.approx(FAILURE_RETRY_S, abs=5)
+    assert delays[-1] == pytest.approx(8 * FAILURE_RETRY_S, abs=5)
+
+    history = (config.data_dir / FETCH_HISTORY_F).read_text().splitlines()
+    assert len(history) == 4
+    assert not json.loads(history[0])["ok"]
+
+
+def test_backoff_is_capped_and_reset_by_a_success(config, monkeypatch):
+    outcomes = [RuntimeError("boom")] * 12 + [object()]
+
+    def flaky_fetch(*_args, **_kwargs):
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    monkeypatch.setattr(scheduler_mod, "run_fetch", flaky_fetch)
+    monkeypatch.setattr(scheduler_mod, "poll_news", lambda cfg: object())
+    sched = _scheduler(config)
+
+    for _ in range(12):
+        sched.run_due(datetime.now(timezone.utc) + timedelta(days=1))
+    wait = sched._retry_at["prices"] - datetime.now(timezone.utc)
+    assert wait.total_seconds() == pytest.approx(MAX_FAILURE_RETRY_S, abs=5)
+
+    sched.run_due(sched._retry_at["prices"])
+    assert "prices" not in sched._failures
+    assert "prices" not in sched._retry_at